@@ -0,0 +1,116 @@
+# benchmarks/bench_codec.py
+"""
+Compare RPC dispatch through Socket.IO packets with and without the raw-JSON fast path.
+
+Usage:
+    python benchmarks/bench_codec.py --sizes 100 1000 10000
+
+Each run decodes one ``rpc_call`` packet whose argument is a model with ``size``
+nested lines, dispatches it, and encodes the response packet, which echoes the
+argument back. ``peak KiB`` is the tracemalloc peak during one call.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import List, Optional
+
+from pydantic import BaseModel
+from socketio import packet
+
+from typsio.codec import JSONCodec, OrjsonCodec, make_packet_class
+from typsio.rpc import RPCDispatcher, RPCRegistry
+
+
+class Line(BaseModel):
+    sku: str
+    quantity: int
+    price: float
+    tags: List[str]
+    note: Optional[str] = None
+
+
+class Order(BaseModel):
+    id: int
+    customer: str
+    lines: List[Line]
+
+
+registry = RPCRegistry()
+
+
+@registry.register
+def submit_order(order: Order) -> Order:
+    return order
+
+
+def make_packet(size: int) -> str:
+    order = {
+        "id": 1,
+        "customer": "bench",
+        "lines": [
+            {"sku": f"SKU-{i:06d}", "quantity": i % 7, "price": i * 0.25, "tags": ["a", "b", "c"], "note": None}
+            for i in range(size)
+        ],
+    }
+    envelope = {"call_id": "bench-1", "function_name": "submit_order", "args": [order]}
+    return "2" + json.dumps(["rpc_call", envelope], separators=(',', ':'))
+
+
+async def round_trip(packet_class, dispatcher: RPCDispatcher, encoded: str, raw: bool) -> str:
+    pkt = packet_class(encoded_packet=encoded)
+    event, data = pkt.data
+    response = await (dispatcher.handle_raw("sid", data) if raw else dispatcher.handle("sid", data))
+    return packet_class(packet.EVENT, data=["rpc_call_response", response]).encode()
+
+
+def measure(packet_class, dispatcher: RPCDispatcher, encoded: str, raw: bool, repeat: int):
+    loop = asyncio.new_event_loop()
+    try:
+        output = loop.run_until_complete(round_trip(packet_class, dispatcher, encoded, raw))
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            loop.run_until_complete(round_trip(packet_class, dispatcher, encoded, raw))
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        loop.run_until_complete(round_trip(packet_class, dispatcher, encoded, raw))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        loop.close()
+    return best, peak, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    modes = [("dicts (stdlib)", packet.Packet, RPCDispatcher(registry), False)]
+    codecs = [JSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        pass
+    for codec in codecs:
+        modes.append((f"raw ({codec.name})", make_packet_class(packet.Packet, codec, "rpc_call"), RPCDispatcher(registry, codec=codec), True))
+
+    print(f"{'lines':>8} {'mode':<16} {'ms':>9} {'peak KiB':>10}")
+    for size in args.sizes:
+        encoded = make_packet(size)
+        expected = None
+        for name, packet_class, dispatcher, raw in modes:
+            seconds, peak, output = measure(packet_class, dispatcher, encoded, raw, args.repeat)
+            result = json.loads(output[1:])
+            if expected is None:
+                expected = result
+            assert result == expected, f"{name} produced a different response"
+            print(f"{size:>8} {name:<16} {seconds * 1000:>9.2f} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_gen.py
+"""
+End-to-end benchmark of typsio-gen on synthetic registries.
+
+Runs ``generate_types`` with a ``GenerationProfile`` on registries of the given
+sizes and writes the per-stage timings and memory usage as JSON, so generator
+performance can be tracked as the API grows.
+
+Usage:
+    python benchmarks/bench_gen.py --models 500 1000 2000 --depth 8 --union-width 3 -o bench_results.json
+
+If json-schema-to-typescript is not installed, the ``json2ts`` and later stages
+are skipped and the run is marked with ``"emitted": false``.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from pathlib import Path
+
+from typsio.gen import GenerationProfile, generate_types
+
+from synthetic import write_registry
+
+
+def run_once(model_count: int, args: argparse.Namespace) -> dict:
+    params = {
+        "models": model_count,
+        "fields": args.fields,
+        "refs": args.refs,
+        "depth": args.depth,
+        "union_width": args.union_width,
+        "functions": model_count if args.functions is None else args.functions,
+        "static": args.static,
+    }
+    profile = GenerationProfile(trace_memory=not args.no_memory)
+    emitted = True
+    with tempfile.TemporaryDirectory() as tmp:
+        module_name = f"typsio_bench_registry_{model_count}"
+        source = write_registry(
+            Path(tmp) / f"{module_name}.py",
+            model_count,
+            fields=args.fields,
+            refs=args.refs,
+            depth=args.depth,
+            union_width=args.union_width,
+            function_count=args.functions,
+        )
+        try:
+            generate_types(
+                source_file=str(source),
+                registry_name="registry",
+                output=str(Path(tmp) / "api-types.ts"),
+                static=args.static,
+                profile=profile,
+            )
+        except RuntimeError as e:
+            if "json-schema-to-typescript not found" not in str(e):
+                raise
+            emitted = False
+        finally:
+            sys.modules.pop(module_name, None)
+
+    return {
+        "params": params,
+        "emitted": emitted,
+        "total_seconds": profile.total_seconds,
+        "stages": [
+            {
+                "name": s.name,
+                "seconds": s.seconds,
+                "allocated_bytes": s.allocated_bytes,
+                "peak_bytes": s.peak_bytes,
+            }
+            for s in profile.stages
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark typsio-gen on synthetic registries.")
+    parser.add_argument("--models", type=int, nargs="+", default=[250, 500, 1000], help="Model counts to benchmark.")
+    parser.add_argument("--fields", type=int, default=4, help="Scalar fields per model.")
+    parser.add_argument("--refs", type=int, default=2, help="References to earlier models per model.")
+    parser.add_argument("--depth", type=int, default=8, help="Length of each chain of nested models.")
+    parser.add_argument("--union-width", type=int, default=2, help="Members of each model's union field.")
+    parser.add_argument("--functions", type=int, default=None, help="Registered functions (defaults to the model count).")
+    parser.add_argument("--static", action="store_true", help="Use the static extraction mode.")
+    parser.add_argument("--no-memory", action="store_true", help="Do not trace memory (faster, timings only).")
+    parser.add_argument("--output", "-o", default="bench_results.json", help="Path of the JSON results file.")
+    args = parser.parse_args()
+
+    results = []
+    for model_count in args.models:
+        result = run_once(model_count, args)
+        results.append(result)
+        print(f"models={model_count:<6} total={result['total_seconds']:.3f}s", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
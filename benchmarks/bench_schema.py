@@ -0,0 +1,52 @@
+# benchmarks/bench_schema.py
+"""
+Measure how schema building in typsio-gen scales with the number of models.
+
+Usage:
+    python benchmarks/bench_schema.py --sizes 250 500 1000 2000 4000
+
+``build_combined_schema`` should scale near-linearly: time per model stays
+roughly constant as the registry grows.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from typsio.gen import build_combined_schema, format_rpc_method, generate_ts_interface, import_source_file
+
+from synthetic import write_registry
+
+
+def bench(model_count: int, fields: int, refs: int, depth: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        module_name = f"typsio_bench_registry_{model_count}"
+        path = write_registry(Path(tmp) / f"{module_name}.py", model_count, fields=fields, refs=refs, depth=depth)
+        registry = import_source_file(path, module_name).registry
+
+    start = time.perf_counter()
+    build_combined_schema(registry.models)
+    generate_ts_interface("RPCMethods", registry.functions, format_rpc_method)
+    elapsed = time.perf_counter() - start
+
+    del sys.modules[module_name]
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000, 4000])
+    parser.add_argument("--fields", type=int, default=4, help="Scalar fields per model.")
+    parser.add_argument("--refs", type=int, default=2, help="References to earlier models per model.")
+    parser.add_argument("--depth", type=int, default=8, help="Length of each chain of nested models.")
+    args = parser.parse_args()
+
+    print(f"{'models':>8} {'seconds':>10} {'us/model':>10}")
+    for size in args.sizes:
+        elapsed = bench(size, args.fields, args.refs, args.depth)
+        print(f"{size:>8} {elapsed:>10.3f} {elapsed / size * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/synthetic.py
+"""
+Synthetic registry generator for typsio benchmarks.
+
+Writes a Python source file containing ``model_count`` pydantic models and an
+``RPCRegistry`` named ``registry``. Models are arranged in chains of ``depth``
+models; each model references up to ``refs`` earlier models of its own chain, so
+models share nested definitions the way they do in a real API. With
+``union_width`` > 0, each model also gets a union field over the heads of up to
+``union_width`` earlier chains.
+"""
+from pathlib import Path
+from typing import List, Optional, Union
+
+
+def render_registry(
+    model_count: int,
+    fields: int = 4,
+    refs: int = 2,
+    depth: int = 8,
+    union_width: int = 0,
+    function_count: Optional[int] = None,
+) -> str:
+    lines: List[str] = [
+        "from typing import List, Optional, Union",
+        "from pydantic import BaseModel",
+        "from typsio import RPCRegistry",
+        "",
+        "registry = RPCRegistry()",
+        "",
+    ]
+    for i in range(model_count):
+        lines.append(f"class Model{i}(BaseModel):")
+        for f in range(fields):
+            lines.append(f"    field{f}: {'int' if f % 2 == 0 else 'str'}")
+        # 引用同一条链上更早定义的模型：Model{i-1}, Model{i-2}, ...
+        targets = [i - k for k in range(1, min(refs, i % depth) + 1)]
+        for t in targets:
+            lines.append(f"    ref{t}: Optional[Model{t}] = None")
+            lines.append(f"    refs{t}: List[Model{t}] = []")
+        # 联合类型只引用更早链的链头（链头没有嵌套引用），避免引用闭包无限增长
+        chain = i // depth
+        heads = [f"Model{c * depth}" for c in range(chain - 1, max(chain - 1 - union_width, -1), -1)]
+        if heads:
+            lines.append(f"    variant: Union[{', '.join(heads)}, None] = None")
+        lines.append("")
+
+    for k in range(model_count if function_count is None else function_count):
+        model = f"Model{k % model_count}"
+        lines.append("@registry.register")
+        lines.append(f"def call{k}(model_id: int, payload: {model}) -> Optional[{model}]:")
+        lines.append("    ...")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_registry(path: Union[str, Path], model_count: int, **kwargs) -> Path:
+    path = Path(path)
+    path.write_text(render_registry(model_count, **kwargs), encoding="utf-8")
+    return path
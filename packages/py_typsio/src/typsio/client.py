@@ -0,0 +1,394 @@
+# packages/py_typsio/src/typsio/client.py
+"""
+Asyncio Python client for typsio registries, the counterpart of ``createTypsioClient``.
+
+    registry = ...  # the same RPCRegistry the server uses
+    async with TypsioClient(registry, SocketIOTransport("http://localhost:8000")) as client:
+        user = await client.remote.get_user(1)          # validated into the return annotation
+        users = await asyncio.gather(*(client.remote.get_user(i) for i in range(100)))
+
+Calls are pipelined over one connection: every call gets a unique ``call_id`` and
+a future that is resolved when its response arrives, so any number of calls can be
+in flight at once. Calls issued in the same event loop iteration are coalesced into
+one batch envelope when the server supports it. ``TypsioClientPool`` spreads calls
+over several connections, routing each call to the least-loaded one.
+
+``call(..., include=[...])`` asks the server to send only the selected fields of
+the result (see ``typsio.projection``).
+
+Cursor functions (``register_cursor``) return a ``RemoteCursor`` holding the first
+page; further pages are fetched from the server-side cursor:
+
+    cursor = await client.remote.list_users(team_id)
+    async for user in cursor:          # fetches the remaining pages as it goes
+        ...
+"""
+import asyncio
+import itertools
+import uuid
+from inspect import signature
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, get_type_hints
+
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
+
+from .cursor import cursor_item_type
+from .rpc import RPCRegistry
+from .transport import RPCTransport
+
+
+class RPCError(Exception):
+    """Raised when the server answers a call with an error."""
+
+
+class RPCTimeoutError(RPCError, TimeoutError):
+    """Raised when a call does not receive a response in time."""
+
+
+def _return_adapter(func: Callable, cursor: bool = False) -> Optional[TypeAdapter]:
+    """
+    Build a TypeAdapter for the return annotation of ``func``, or None if it is unannotated.
+    For cursor functions the adapter validates the items of one page.
+    """
+    try:
+        annotation = get_type_hints(func).get('return', signature(func).return_annotation)
+    except Exception:
+        # 无法解析的前向引用时退回到原始注解
+        annotation = signature(func).return_annotation
+    if cursor and annotation is not signature(func).empty:
+        annotation = List[cursor_item_type(annotation)]
+    if annotation is signature(func).empty or annotation is Any:
+        return None
+    try:
+        return TypeAdapter(annotation)
+    except Exception:
+        return None
+
+
+class _RemoteProxy:
+    """Attribute access proxy: ``proxy.fn(*args)`` calls the remote function ``fn``."""
+    def __init__(self, client: "TypsioClient | TypsioClientPool", timeout: Optional[float]):
+        self._client = client
+        self._timeout = timeout
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith('_') or name not in self._client.registry.functions:
+            raise AttributeError(f"RPC function '{name}' is not registered.")
+
+        async def call(*args: Any) -> Any:
+            return await self._client.call(name, *args, timeout=self._timeout)
+
+        call.__name__ = name
+        return call
+
+    def __dir__(self) -> List[str]:
+        return sorted(self._client.registry.functions)
+
+
+class RemoteCursor:
+    """
+    A page of a cursor function's result and the handle to fetch more.
+
+    :ivar items: Items of the current page.
+    :ivar offset: Position of the first item of the current page.
+    :ivar total: Total number of items for snapshot cursors, None for live iterators.
+    :ivar has_more: Whether items follow the current page.
+    """
+    def __init__(self, client: "TypsioClient", function_name: str, page: Dict[str, Any], projection: Optional[Dict[str, Any]]):
+        self._client = client
+        self.function_name = function_name
+        self._projection = projection
+        self.id: Optional[str] = None
+        self.items: List[Any] = []
+        self.offset = 0
+        self.total: Optional[int] = None
+        self.has_more = False
+        self._apply(page)
+
+    def _apply(self, page: Dict[str, Any]) -> None:
+        self.id = page.get("cursor")
+        self.items = self._client._validate_page(self.function_name, page.get("items") or [], self._projection is not None)
+        self.offset = page.get("offset", 0)
+        self.total = page.get("total")
+        self.has_more = bool(page.get("has_more"))
+
+    async def _fetch(self, request: Dict[str, Any], timeout: Optional[float]) -> Any:
+        if self.id is None:
+            raise RPCError(f"Cursor of '{self.function_name}' is closed.")
+        envelope: Dict[str, Any] = {"function_name": self.function_name, "cursor": {"id": self.id, **request}}
+        if self._projection is not None:
+            envelope["projection"] = self._projection
+        return (await self._client._request(envelope, timeout)).get("result")
+
+    async def next(self, limit: Optional[int] = None, *, timeout: Optional[float] = None) -> List[Any]:
+        """Fetch the page after the current one and return its items (empty when there are no more)."""
+        if not self.has_more:
+            return []
+        self._apply(await self._fetch({} if limit is None else {"limit": limit}, timeout))
+        return self.items
+
+    async def seek(self, offset: int, limit: Optional[int] = None, *, timeout: Optional[float] = None) -> List[Any]:
+        """Fetch the page starting at ``offset``. Cursors over live iterators can only seek forward."""
+        request: Dict[str, Any] = {"offset": offset}
+        if limit is not None:
+            request["limit"] = limit
+        self._apply(await self._fetch(request, timeout))
+        return self.items
+
+    async def close(self, *, timeout: Optional[float] = None) -> None:
+        """Release the server-side cursor. Closing an exhausted cursor does nothing."""
+        if self.id is not None:
+            await self._fetch({"close": True}, timeout)
+            self.id = None
+        self.has_more = False
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        """Iterate over the items from the current page to the end, fetching pages as needed."""
+        while True:
+            for item in self.items:
+                yield item
+            if not self.has_more:
+                return
+            await self.next()
+
+
+class TypsioClient:
+    """
+    One connection to a typsio server.
+
+    :param registry: The registry the server exposes; used to type the proxy
+        and to validate results back into their annotated types.
+    :param transport: How to reach the server, see ``typsio.transport``.
+    :param timeout: Default per-call timeout in seconds; ``None`` waits forever.
+    :param batch: Coalesce calls issued in the same loop iteration into one
+        batch envelope, if the server supports it.
+    """
+    def __init__(self, registry: RPCRegistry, transport: RPCTransport, *, timeout: Optional[float] = 10.0, batch: bool = True):
+        self.registry = registry
+        self.transport = transport
+        self.timeout = timeout
+        self._batch_requested = batch
+        self._batch = False
+        self._client_id = uuid.uuid4().hex[:8]
+        self._call_counter = itertools.count()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._adapters: Dict[str, Optional[TypeAdapter]] = {}
+        self._page_adapters: Dict[str, Optional[TypeAdapter]] = {}
+        self._queue: List[Dict[str, Any]] = []
+        self._flush_scheduled = False
+        self._flush_tasks: "set[asyncio.Task]" = set()
+        # 由 connect()/close() 设置；连接是否可用还取决于传输层当前的状态
+        self._connected = False
+
+    @property
+    def remote(self) -> Any:
+        """Proxy calling remote functions with the default timeout."""
+        return _RemoteProxy(self, self.timeout)
+
+    def proxy(self, *, timeout: Optional[float] = None) -> Any:
+        """Proxy calling remote functions with the given timeout."""
+        return _RemoteProxy(self, timeout)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls waiting for a response."""
+        return len(self._pending)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected and self.transport.connected
+
+    async def connect(self) -> "TypsioClient":
+        await self.transport.connect(self._on_response, self._on_close)
+        self._connected = True
+        if self._batch_requested:
+            self._batch = bool((await self.transport.capabilities()).get("batch"))
+        return self
+
+    async def close(self) -> None:
+        self._connected = False
+        for task in list(self._flush_tasks):
+            task.cancel()
+        await self.transport.close()
+        self._reject_all("Transport closed. RPC call aborted.")
+
+    async def __aenter__(self) -> "TypsioClient":
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def call(
+        self,
+        function_name: str,
+        *args: Any,
+        timeout: Optional[float] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+    ) -> Any:
+        """
+        Call a remote function and return its result, validated into the
+        function's return annotation.
+
+        :param timeout: Overrides the client's default timeout for this call.
+        :param include: Dotted paths of the result fields to send, e.g. ``["id", "owner.name"]``.
+        :param exclude: Dotted paths of the result fields to leave out.
+            A projected result is returned as plain JSON data, not validated
+            into the return annotation, since required fields may be missing.
+        :return: The result, or a ``RemoteCursor`` for cursor functions.
+        :raises RPCError: if the server reports an error.
+        :raises RPCTimeoutError: if no response arrives in time.
+        """
+        envelope: Dict[str, Any] = {
+            "function_name": function_name,
+            "args": to_jsonable_python(list(args)) if self.transport.serializes else list(args),
+        }
+        projection = None
+        if include is not None or exclude is not None:
+            projection = envelope["projection"] = {
+                key: paths for key, paths in (("include", include), ("exclude", exclude)) if paths is not None
+            }
+        result = (await self._request(envelope, timeout)).get("result")
+        if function_name in self.registry.cursors:
+            return RemoteCursor(self, function_name, result, projection)
+        if projection is not None:
+            return result
+        return self._validate_result(function_name, result)
+
+    async def _request(self, envelope: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """Send a call envelope (without ``call_id``) and return the successful response."""
+        if not self.connected:
+            raise RPCError("Client is not connected.")
+        function_name = envelope["function_name"]
+        call_id = f"{self._client_id}-{next(self._call_counter)}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+
+        envelope = {"call_id": call_id, **envelope}
+        try:
+            try:
+                await self._send(envelope)
+            except Exception as e:
+                raise RPCError(f"Failed to send RPC call: {e}") from e
+            timeout = self.timeout if timeout is None else timeout
+            try:
+                response = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise RPCTimeoutError(f"RPC call '{function_name}' timed out after {timeout}s.") from None
+        finally:
+            self._pending.pop(call_id, None)
+
+        if response.get("error"):
+            raise RPCError(response["error"])
+        return response
+
+    def _validate_result(self, function_name: str, result: Any) -> Any:
+        if function_name not in self._adapters:
+            func = self.registry.functions.get(function_name)
+            self._adapters[function_name] = _return_adapter(func) if func else None
+        adapter = self._adapters[function_name]
+        if adapter is None:
+            return result
+        return adapter.validate_python(result)
+
+    def _validate_page(self, function_name: str, items: List[Any], projected: bool) -> List[Any]:
+        if projected:
+            return items
+        if function_name not in self._page_adapters:
+            func = self.registry.functions.get(function_name)
+            self._page_adapters[function_name] = _return_adapter(func, cursor=True) if func else None
+        adapter = self._page_adapters[function_name]
+        if adapter is None:
+            return items
+        return adapter.validate_python(items)
+
+    async def _send(self, envelope: Dict[str, Any]) -> None:
+        if not self._batch:
+            await self.transport.send(envelope)
+            return
+        # 同一事件循环迭代中发出的调用合并为一个批量信封
+        self._queue.append(envelope)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            # 任务在下一次循环迭代才开始执行，此前发出的调用都会进入同一批
+            task = asyncio.ensure_future(self._flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self) -> None:
+        queue, self._queue = self._queue, []
+        self._flush_scheduled = False
+        if not queue:
+            return
+        try:
+            if len(queue) == 1:
+                await self.transport.send(queue[0])
+            else:
+                await self.transport.send_batch(queue)
+        except Exception as e:
+            for envelope in queue:
+                future = self._pending.get(envelope["call_id"])
+                if future is not None and not future.done():
+                    future.set_exception(RPCError(f"Failed to send RPC call: {e}"))
+
+    def _on_response(self, response: Dict[str, Any]) -> None:
+        future = self._pending.get(response.get("call_id"))
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    def _on_close(self) -> None:
+        # 不清除 _connected：传输层重连后客户端即可继续使用
+        self._reject_all("Transport closed. RPC call aborted.")
+
+    def _reject_all(self, message: str) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RPCError(message))
+
+
+class TypsioClientPool:
+    """
+    A pool of ``TypsioClient`` connections; each call goes to the client
+    with the fewest calls in flight.
+
+    :param transport_factory: Creates a new transport for each connection.
+    :param size: Number of connections.
+    :param client_kwargs: Passed to every ``TypsioClient``.
+    """
+    def __init__(self, registry: RPCRegistry, transport_factory: Callable[[], RPCTransport], size: int = 4, **client_kwargs: Any):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.registry = registry
+        self.clients = [TypsioClient(registry, transport_factory(), **client_kwargs) for _ in range(size)]
+        self.timeout = self.clients[0].timeout
+
+    @property
+    def remote(self) -> Any:
+        return _RemoteProxy(self, self.timeout)
+
+    def proxy(self, *, timeout: Optional[float] = None) -> Any:
+        return _RemoteProxy(self, timeout)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(client.in_flight for client in self.clients)
+
+    async def connect(self) -> "TypsioClientPool":
+        await asyncio.gather(*(client.connect() for client in self.clients))
+        return self
+
+    async def close(self) -> None:
+        await asyncio.gather(*(client.close() for client in self.clients), return_exceptions=True)
+
+    async def __aenter__(self) -> "TypsioClientPool":
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _pick(self) -> TypsioClient:
+        candidates = [c for c in self.clients if c.connected] or self.clients
+        return min(candidates, key=lambda c: c.in_flight)
+
+    async def call(self, function_name: str, *args: Any, **kwargs: Any) -> Any:
+        return await self._pick().call(function_name, *args, **kwargs)
@@ -0,0 +1,117 @@
+# packages/py_typsio/src/typsio/codec.py
+"""
+JSON codecs and the raw-JSON fast path for Socket.IO packets.
+
+By default python-socketio ``json.loads`` every packet into Python dicts, and the
+dispatcher then walks those dicts again to validate pydantic arguments. With a
+codec installed through ``setup_rpc(..., codec=...)``, RPC call packets are kept
+as ``RawJSON`` text: the dispatcher validates the whole envelope, arguments
+included, in one ``TypeAdapter.validate_json`` pass, and responses are encoded
+once from the serialized result instead of being converted to dicts first.
+
+Any other packet is decoded and encoded with the codec as usual. An RPC call
+packet is assumed to carry a single argument, the call envelope; telling a
+second argument apart would take the full parse the fast path exists to avoid,
+so a packet with several arguments is detected when its text fails to validate
+and is then decoded normally (see ``_RPCHandler``).
+"""
+import json
+from typing import Any, Type
+
+from socketio import packet as sio_packet
+
+
+class RawJSON:
+    """A JSON document kept in its serialized form."""
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self) -> str:
+        preview = self.text if len(self.text) <= 60 else self.text[:57] + "..."
+        return f"RawJSON({preview!r})"
+
+
+class JSONCodec:
+    """JSON encoder/decoder used for packets. ``dumps`` must return ``str``."""
+    name = "json"
+
+    def loads(self, s: Any) -> Any:
+        return json.loads(s)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by ``orjson``. Requires the optional ``orjson`` package."""
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, s: Any) -> Any:
+        return self._orjson.loads(s)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._orjson.dumps(obj).decode('utf-8')
+
+
+def default_codec() -> JSONCodec:
+    """``OrjsonCodec`` if ``orjson`` is installed, otherwise the standard library codec."""
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return JSONCodec()
+
+
+class _PacketJSON:
+    """The ``json`` module seen by the packet class: a codec aware of ``RawJSON``."""
+    def __init__(self, codec: JSONCodec, rpc_event_name: str):
+        self.codec = codec
+        # 客户端（socket.io-client 的 JSON.stringify 与 python-socketio）编码时不含空白
+        self._rpc_prefix = json.dumps([rpc_event_name], separators=(',', ':'))[:-1] + ","
+        self._rpc_event_name = rpc_event_name
+
+    def loads(self, s: Any) -> Any:
+        # 调用信封与批量信封都是对象；其他形式的参数按普通方式解码
+        if isinstance(s, str) and s.startswith(self._rpc_prefix) and s.endswith("}]") \
+                and s[len(self._rpc_prefix):len(self._rpc_prefix) + 1] == "{":
+            return [self._rpc_event_name, RawJSON(s[len(self._rpc_prefix):-1])]
+        return self.codec.loads(s)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # 事件负载是 [event, *args]，预序列化的参数直接拼接
+        if isinstance(obj, list) and any(isinstance(item, RawJSON) for item in obj):
+            return "[" + ",".join(
+                item.text if isinstance(item, RawJSON) else self.codec.dumps(item) for item in obj
+            ) + "]"
+        return self.codec.dumps(obj)
+
+
+def make_packet_class(base: Type[sio_packet.Packet], codec: JSONCodec, rpc_event_name: str) -> Type[sio_packet.Packet]:
+    """Subclass a JSON packet class so that RPC call packets are decoded to ``RawJSON``."""
+    packet_json = _PacketJSON(codec, rpc_event_name)
+
+    class RawJSONPacket(base):
+        json = packet_json
+
+        def decode(self, encoded_packet):
+            attachment_count = super().decode(encoded_packet)
+            if attachment_count and isinstance(self.data, list):
+                # 含二进制附件的包需要还原占位符，退回到完整解码
+                self.data = [
+                    codec.loads(item.text) if isinstance(item, RawJSON) else item for item in self.data
+                ]
+            return attachment_count
+
+        @classmethod
+        def data_is_binary(cls, data):
+            if isinstance(data, RawJSON):
+                return False
+            return super().data_is_binary(data)
+
+    RawJSONPacket.__name__ = f"RawJSON{base.__name__}"
+    return RawJSONPacket
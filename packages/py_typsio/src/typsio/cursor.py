@@ -0,0 +1,284 @@
+# packages/py_typsio/src/typsio/cursor.py
+"""
+Server-side cursors for paginated results.
+
+A function registered with ``register_cursor`` returns an iterable (a list, a
+generator, an async generator, ...) instead of a fully materialized result:
+
+    @rpc.register_cursor(page_size=100)
+    async def list_users(team_id: int) -> AsyncIterator[User]:
+        async for row in db.stream(...):
+            yield User(...)
+
+Calling it answers with the first page and a cursor handle. The cursor stays in
+a per-session table on the server, so later pages are fetched by calling the
+cursor instead of re-running the query:
+
+    -> {"call_id": "c1", "function_name": "list_users", "args": [1]}
+    <- {"call_id": "c1", "result": {"items": [...], "cursor": "9f2c..", "offset": 0, "has_more": true, "total": null},
+        "error": null, "cursor": true}
+    -> {"call_id": "c2", "function_name": "list_users", "cursor": {"id": "9f2c..", "limit": 50}}
+    -> {"call_id": "c3", "function_name": "list_users", "cursor": {"id": "9f2c..", "offset": 400}}
+    -> {"call_id": "c4", "function_name": "list_users", "cursor": {"id": "9f2c..", "close": true}}
+
+A cursor holds either the live iterator or a materialized snapshot. A live
+cursor is forward-only (it can skip ahead but not seek back) and is closed once
+exhausted. A snapshot (``snapshot=True``, or whenever the function returns a list
+or tuple) supports seeking anywhere, reports ``total`` and stays open until it is
+closed or expires. A result that fits in the first page never gets a cursor.
+
+Each session keeps at most ``max_cursors_per_sid`` cursors, the least recently
+used one is closed to make room, and cursors idle for ``ttl`` seconds are closed.
+"""
+import asyncio
+import collections.abc
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+try:
+    from typing import get_args, get_origin
+except ImportError:
+    from typing_extensions import get_args, get_origin
+
+_ITERABLE_ORIGINS = (
+    list, tuple, set, frozenset,
+    collections.abc.Iterable, collections.abc.Iterator, collections.abc.Generator,
+    collections.abc.AsyncIterable, collections.abc.AsyncIterator, collections.abc.AsyncGenerator,
+    collections.abc.Sequence, collections.abc.Collection,
+)
+
+
+class CursorError(Exception):
+    """Raised when a cursor request is malformed or names an unknown or expired cursor."""
+
+
+@dataclass(frozen=True)
+class CursorOptions:
+    """
+    How a cursor function is paginated.
+
+    :param page_size: Items per page when the client does not ask for a limit.
+    :param max_page_size: Upper bound for the limit a client may ask for, and
+        for how far ahead of a live cursor's position an offset may point.
+    :param snapshot: Materialize the whole result when the cursor is opened,
+        so it can be seeked in both directions and reports ``total``.
+    """
+    page_size: int = 100
+    max_page_size: int = 1000
+    snapshot: bool = False
+
+
+def cursor_item_type(annotation: Any) -> Any:
+    """Item type of a cursor function's return annotation, e.g. ``User`` for ``AsyncIterator[User]``."""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in _ITERABLE_ORIGINS and args and args[0] is not Ellipsis:
+        return args[0]
+    return Any
+
+
+class _Cursor:
+    # 正在关闭的异步迭代器，保留引用以免任务在完成前被回收
+    _closing: Set[asyncio.Task] = set()
+
+    def __init__(self, function_name: str, iterator: Any = None, snapshot: Optional[List[Any]] = None):
+        self.function_name = function_name
+        self.snapshot = snapshot
+        self.position = 0
+        self.last_activity = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.closed = False
+        self._iterator = iterator
+        self._is_async = hasattr(iterator, "__anext__")
+        self._buffer: Deque[Any] = deque()
+        self._exhausted = iterator is None
+
+    async def _pull(self, count: int) -> None:
+        # 预读直到缓冲区中有 count 项，或迭代器耗尽
+        while len(self._buffer) < count and not self._exhausted:
+            try:
+                item = await self._iterator.__anext__() if self._is_async else next(self._iterator)
+            except (StopIteration, StopAsyncIteration):
+                self._exhausted = True
+                break
+            self._buffer.append(item)
+
+    async def read(self, offset: Optional[int], limit: int, max_skip: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Read one page starting at ``offset`` (the current position if None).
+
+        :param max_skip: How many items a live iterator may be advanced past
+            to reach ``offset``; ``None`` for no limit.
+        """
+        self.last_activity = time.monotonic()
+        if self.snapshot is not None:
+            start = self.position if offset is None else offset
+            items = self.snapshot[start:start + limit]
+            self.position = start + len(items)
+            return {"items": items, "cursor": None, "offset": start, "has_more": self.position < len(self.snapshot), "total": len(self.snapshot)}
+
+        if offset is not None and offset < self.position:
+            raise CursorError(f"Cursor over a live iterator cannot seek back from {self.position} to {offset}.")
+        if offset is not None and max_skip is not None and offset - self.position > max_skip:
+            # 跳过的项也要逐个从迭代器取出，不限制时一个请求即可让服务器空转
+            raise CursorError(f"Cursor over a live iterator cannot skip more than {max_skip} items (from {self.position} to {offset}).")
+        while offset is not None and self.position < offset:
+            await self._pull(1)
+            if not self._buffer:
+                break
+            self._buffer.popleft()
+            self.position += 1
+
+        start = self.position
+        # 多读一项以判断是否还有下一页
+        await self._pull(limit + 1)
+        items = [self._buffer.popleft() for _ in range(min(limit, len(self._buffer)))]
+        self.position += len(items)
+        return {"items": items, "cursor": None, "offset": start, "has_more": bool(self._buffer), "total": None}
+
+    def close(self) -> None:
+        self.closed = True
+        if self.lock.locked():
+            # 正在读取的游标在读取结束后关闭
+            return
+        iterator, self._iterator = self._iterator, None
+        self._buffer.clear()
+        self.snapshot = None
+        if iterator is None:
+            return
+        if hasattr(iterator, "aclose"):
+            try:
+                task = asyncio.get_running_loop().create_task(iterator.aclose())
+            except RuntimeError:
+                return
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif hasattr(iterator, "close"):
+            iterator.close()
+
+
+class CursorTable:
+    """
+    Open cursors per Socket.IO session.
+
+    :param ttl: Seconds without a fetch after which a cursor is closed.
+    :param max_cursors_per_sid: Maximum number of open cursors per session; the
+        least recently used one is closed when a new cursor needs room.
+    """
+    def __init__(self, *, ttl: float = 300.0, max_cursors_per_sid: int = 16):
+        if max_cursors_per_sid < 1:
+            raise ValueError("max_cursors_per_sid must be at least 1.")
+        self.ttl = ttl
+        self.max_cursors_per_sid = max_cursors_per_sid
+        # 按最近使用排序，最久未使用的在最前
+        self._cursors: "OrderedDict[Tuple[str, str], _Cursor]" = OrderedDict()
+        self._reaper: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    async def open(self, sid: str, function_name: str, result: Any, options: CursorOptions) -> Dict[str, Any]:
+        """
+        Turn the return value of a cursor function into its first page,
+        keeping a cursor for the rest.
+        """
+        self.sweep()
+        if isinstance(result, (list, tuple)):
+            cursor = _Cursor(function_name, snapshot=list(result))
+        elif hasattr(result, "__aiter__"):
+            iterator = result.__aiter__()
+            if options.snapshot:
+                cursor = _Cursor(function_name, snapshot=[item async for item in iterator])
+            else:
+                cursor = _Cursor(function_name, iterator)
+        elif hasattr(result, "__iter__") and not isinstance(result, (str, bytes, dict)):
+            cursor = _Cursor(function_name, snapshot=list(result)) if options.snapshot else _Cursor(function_name, iter(result))
+        else:
+            raise CursorError(f"Cursor function '{function_name}' must return an iterable, got {type(result).__name__}.")
+
+        try:
+            page = await cursor.read(None, options.page_size)
+        except BaseException:
+            cursor.close()
+            raise
+        if not page["has_more"]:
+            cursor.close()
+            return page
+
+        cursor_id = uuid.uuid4().hex
+        sid_cursors = [key for key in self._cursors if key[0] == sid]
+        if len(sid_cursors) >= self.max_cursors_per_sid:
+            self.close(*sid_cursors[0])
+        self._cursors[(sid, cursor_id)] = cursor
+        self._ensure_reaper()
+        page["cursor"] = cursor_id
+        return page
+
+    async def fetch(self, sid: str, function_name: str, request: Any, options: CursorOptions) -> Optional[Dict[str, Any]]:
+        """
+        Answer a cursor call ``{"id", "offset"?, "limit"?, "close"?}`` with the
+        next page, or None when the cursor was closed.
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("id"), str):
+            raise CursorError("Invalid cursor request: 'id' is required.")
+        offset, limit = request.get("offset"), request.get("limit", options.page_size)
+        if offset is not None and (not isinstance(offset, int) or isinstance(offset, bool) or offset < 0):
+            raise CursorError("Invalid cursor request: 'offset' must be a non-negative integer.")
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise CursorError("Invalid cursor request: 'limit' must be a positive integer.")
+        limit = min(limit, options.max_page_size)
+
+        self.sweep()
+        key = (sid, request["id"])
+        cursor = self._cursors.get(key)
+        if cursor is None or cursor.function_name != function_name:
+            raise CursorError(f"Cursor '{request['id']}' not found or expired.")
+        if request.get("close"):
+            self.close(*key)
+            return None
+
+        self._cursors.move_to_end(key)
+        async with cursor.lock:
+            page = await cursor.read(offset, limit, options.max_page_size)
+        if cursor.closed:
+            # 读取期间被淘汰
+            cursor.close()
+        elif not page["has_more"] and cursor.snapshot is None:
+            self.close(*key)
+        else:
+            page["cursor"] = request["id"]
+        return page
+
+    def close(self, sid: str, cursor_id: str) -> None:
+        cursor = self._cursors.pop((sid, cursor_id), None)
+        if cursor is not None:
+            cursor.close()
+
+    def discard_sid(self, sid: str) -> None:
+        """Close every cursor of a session, e.g. when it disconnects."""
+        for key in [key for key in self._cursors if key[0] == sid]:
+            self.close(*key)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Close cursors idle for longer than ``ttl``. Returns how many were closed."""
+        now = time.monotonic() if now is None else now
+        expired = [key for key, cursor in self._cursors.items() if now - cursor.last_activity > self.ttl]
+        for key in expired:
+            self.close(*key)
+        return len(expired)
+
+    def _ensure_reaper(self) -> None:
+        # 后台清理任务仅在存在打开的游标时运行，游标清空后自行退出
+        if self._reaper is None or self._reaper.done():
+            try:
+                self._reaper = asyncio.get_running_loop().create_task(self._reap())
+            except RuntimeError:
+                pass
+
+    async def _reap(self) -> None:
+        while self._cursors:
+            await asyncio.sleep(self.ttl / 2)
+            self.sweep()
@@ -1,17 +1,25 @@
 # generator/typsio_gen.py
 import json
+import os
 import subprocess
 import argparse
 import importlib.util
 import sys
 import tempfile
 import glob
+import time
+import tracemalloc
 import traceback
+from contextlib import contextmanager
 from pathlib import Path
-from inspect import signature
+from inspect import signature, Signature
+from types import ModuleType
 from pydantic import BaseModel
-from typing import Callable, Dict, Any, Type, Set, Union, Optional, List
-from dataclasses import dataclass
+from pydantic.json_schema import models_json_schema
+from typing import Callable, Dict, Any, Type, Set, Union, Optional, List, Iterable, Iterator, Tuple
+from dataclasses import dataclass, field
+
+from .cursor import cursor_item_type
 
 try:
     from typing import Literal
@@ -32,6 +40,8 @@ TYPE_MAP = {
 # 全局变量跟踪警告
 warnings_occurred = False
 strict_mode = False
+# get_ts_type 的缓存；其结果依赖 strict_mode，因此在每次生成开始时清空
+_ts_type_cache: Dict[Any, str] = {}
 
 
 # TODO: docstring 改用英文
@@ -87,6 +97,86 @@ class TypsioGenConfig:
     """
     是否启用严格模式。
     """
+    static: bool = False
+    """
+    是否启用静态提取模式：通过 ast 解析输入文件，而不是导入执行它们。
+    仅定义了模型的模块会被导入。
+    """
+    profile: bool = False
+    """
+    是否在生成结束后打印各阶段的耗时与内存分配。
+    """
+    split: bool = False
+    """
+    是否按 Python 模块拆分输出。启用时 output 为目录，其中包含每个模块一个文件，
+    以及重新导出全部类型的 index.ts。
+    """
+
+
+@dataclass
+class StageStats:
+    """Timing and memory usage of one generation stage."""
+    name: str
+    seconds: float
+    allocated_bytes: int = 0
+    """Net bytes allocated by Python during the stage (tracemalloc)."""
+    peak_bytes: int = 0
+    """Peak traced memory during the stage, relative to its start."""
+
+
+@dataclass
+class GenerationProfile:
+    """
+    Per-stage timing and memory breakdown of a ``generate_types`` run.
+
+    Pass an instance to ``generate_types(profile=...)``; stages are appended as they
+    finish, so a partially failed run still reports the stages that completed.
+    Memory is measured with ``tracemalloc`` and only covers Python allocations;
+    the ``json2ts`` subprocess is reported by time only. Tracing memory slows
+    Python code down, set ``trace_memory=False`` for pure timings.
+    """
+    trace_memory: bool = True
+    stages: List[StageStats] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            start_mem = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = StageStats(name, time.perf_counter() - start)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                stats.allocated_bytes = current - start_mem
+                stats.peak_bytes = max(peak - start_mem, 0)
+            self.stages.append(stats)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(s.seconds for s in self.stages)
+
+    def format(self) -> str:
+        lines = [f"{'stage':<20} {'time (ms)':>10} {'alloc (KiB)':>12} {'peak (KiB)':>12}"]
+        for s in self.stages:
+            lines.append(
+                f"{s.name:<20} {s.seconds * 1000:>10.1f} {s.allocated_bytes / 1024:>12.1f} {s.peak_bytes / 1024:>12.1f}"
+            )
+        lines.append(f"{'total':<20} {self.total_seconds * 1000:>10.1f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def _profile_stage(profile: Optional[GenerationProfile], name: str) -> Iterator[None]:
+    if profile is None:
+        yield
+    else:
+        with profile.stage(name):
+            yield
 
 
 def _load_config_from_py(config_path: Union[str, Path]) -> TypsioGenConfig:
@@ -143,8 +233,20 @@ def _load_config_from_py(config_path: Union[str, Path]) -> TypsioGenConfig:
 
 def get_ts_type(py_type: Any) -> str:
     """
-    获取 Python 类型对应的 TypeScript 类型
+    获取 Python 类型对应的 TypeScript 类型（按类型缓存，每次生成前清空）
     """
+    try:
+        return _ts_type_cache[py_type]
+    except KeyError:
+        pass
+    except TypeError:
+        # 不可哈希的类型（例如带有不可哈希元数据的 Annotated）不缓存
+        return _get_ts_type(py_type)
+    ts_type = _ts_type_cache[py_type] = _get_ts_type(py_type)
+    return ts_type
+
+
+def _get_ts_type(py_type: Any) -> str:
     # 基础类型
     if py_type in TYPE_MAP:
         return TYPE_MAP[py_type]
@@ -211,100 +313,193 @@ def generate_ts_interface(name: str, items: dict, formatter: Callable) -> str:
     return "\n".join(lines)
 
 
+class CursorSignature(Signature):
+    """以 `register_cursor` 注册的函数的签名：生成的方法返回 `Cursor<Item>`。"""
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, sig: Signature) -> "CursorSignature":
+        return cls(list(sig.parameters.values()), return_annotation=sig.return_annotation)
+
+
+# 游标函数返回的游标对象，由 typsio-client 在运行时创建
+CURSOR_INTERFACE = """/** Server-side cursor returned by methods registered with `register_cursor`. */
+export interface Cursor<T> extends AsyncIterable<T> {
+  /** Items of the current page. */
+  readonly items: T[];
+  /** Position of the first item of the current page. */
+  readonly offset: number;
+  /** Total number of items for snapshot cursors, null for live iterators. */
+  readonly total: number | null;
+  readonly hasMore: boolean;
+  /** Fetch the page after the current one. */
+  next(limit?: number): Promise<T[]>;
+  /** Fetch the page starting at `offset`; cursors over live iterators only seek forward. */
+  seek(offset: number, limit?: number): Promise<T[]>;
+  /** Release the server-side cursor. */
+  close(): Promise<void>;
+}"""
+
+
 def format_rpc_method(name, func) -> str:
-    sig = signature(func)
+    # 静态提取模式下直接提供 Signature，而非函数对象
+    sig = func if isinstance(func, Signature) else signature(func)
     params = ", ".join(
         [f"{p.name}: {get_ts_type(p.annotation)}" for p in sig.parameters.values()]
     )
-    ret_type = get_ts_type(sig.return_annotation)
+    if isinstance(sig, CursorSignature):
+        ret_type = f"Cursor<{get_ts_type(cursor_item_type(sig.return_annotation))}>"
+    else:
+        ret_type = get_ts_type(sig.return_annotation)
     return f"{name}({params}): Promise<{ret_type}>;"
 
 
+# RPC 方法的结果类型，客户端可以用 Pick 描述字段投影后的结果，例如 Pick<RPCResult<'get_user'>, 'id'>
+RPC_RESULT_TYPE = (
+    "/** Result type of an RPC method, e.g. `Pick<NonNullable<RPCResult<'get_user'>>, 'id' | 'name'>` for a projected call. */\n"
+    "export type RPCResult<M extends keyof RPCMethods> = Awaited<ReturnType<RPCMethods[M]>>;"
+)
+
+
 def format_event(name, model) -> str:
     return f"'{name}': (payload: {get_ts_type(model)}) => void;"
 
 
-def flatten_schema_definitions(schemas: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Flatten nested schema definitions to work with json-schema-to-typescript.
-    This function extracts all nested definitions and places them at the top level,
-    adjusting $ref paths accordingly and removing nested $defs.
-    """
-    # Collect all unique model definitions at the top level
-    flattened_defs = {}
-    
-    # First, collect all definitions (with processed refs)
-    for model_name, schema in schemas.items():
-        # Process the schema for refs and remove nested $defs
-        processed_schema = process_schema_refs_and_remove_nested_defs(schema)
-        
-        # Add the processed schema to our definitions
-        if model_name not in flattened_defs:
-            flattened_defs[model_name] = processed_schema
-        
-        # Extract any nested definitions and add them to our top-level definitions (also processed)
-        if '$defs' in schema:
-            for def_name, def_schema in schema['$defs'].items():
-                if def_name not in flattened_defs:
-                    flattened_defs[def_name] = process_schema_refs_and_remove_nested_defs(def_schema)
-    
-    # Process each schema again for the properties section
-    processed_schemas = {}
-    for model_name, schema in schemas.items():
-        # Process the schema for refs and remove nested $defs
-        processed_schemas[model_name] = process_schema_refs_and_remove_nested_defs(schema)
-    
-    return {
-        "title": "TypsioModels",
-        "type": "object",
-        "properties": processed_schemas,
-        "definitions": flattened_defs
-    }
+def generate_rpc_declarations(functions: dict, s2c_events: dict) -> str:
+    """生成 RPCMethods、RPCResult 与 ServerToClientEvents（以及存在游标函数时的 Cursor）声明。"""
+    blocks = []
+    if any(isinstance(func, CursorSignature) for func in functions.values()):
+        blocks.append(CURSOR_INTERFACE)
+    blocks.append(generate_ts_interface("RPCMethods", functions, format_rpc_method))
+    blocks.append(RPC_RESULT_TYPE)
+    if s2c_events:
+        blocks.append(generate_ts_interface("ServerToClientEvents", s2c_events, format_event))
+    return "\n\n".join(blocks)
+
 
-def process_schema_refs_and_remove_nested_defs(schema: Any) -> Any:
+# 这些关键字的值是 "名称 -> schema" 的映射，其键不是 schema 关键字（例如名为 title 的字段）
+_SCHEMA_MAP_KEYWORDS = ("properties", "patternProperties", "definitions")
+# 这些关键字的值是 JSON 数据而非 schema，无需遍历
+_DATA_KEYWORDS = ("default", "examples", "const", "enum")
+
+
+def normalize_schema(schema: Any) -> Any:
     """
-    Recursively process schema to:
-    1. Adjust $ref paths to point to top-level definitions.
-    2. Remove any nested $defs sections.
+    Normalize a pydantic JSON schema for json-schema-to-typescript in a single traversal:
+
+    1. Drop nested ``$defs`` sections (they are hoisted by ``build_combined_schema``).
+    2. Rewrite ``#/$defs/Name`` refs to ``#/definitions/Name``.
+    3. Remove ``title`` keys, except on objects that directly contain ``properties``
+       (i.e. model definitions), so json-schema-to-typescript does not create
+       aliases for simple types.
     """
     if isinstance(schema, dict):
+        keep_title = 'properties' in schema
         processed = {}
         for key, value in schema.items():
-            # Skip nested $defs
-            if key == '$defs':
+            if key == '$defs' or (key == 'title' and not keep_title):
                 continue
-            elif key == '$ref' and isinstance(value, str) and value.startswith('#/$defs/'):
-                # Convert #/$defs/Name to #/definitions/Name
-                def_name = value.split('/')[-1]
-                processed[key] = f"#/definitions/{def_name}"
+            if key == '$ref' and isinstance(value, str) and value.startswith('#/$defs/'):
+                processed[key] = f"#/definitions/{value.split('/')[-1]}"
+            elif key in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                processed[key] = {name: normalize_schema(sub) for name, sub in value.items()}
+            elif key in _DATA_KEYWORDS:
+                processed[key] = value
             else:
-                processed[key] = process_schema_refs_and_remove_nested_defs(value)
+                processed[key] = normalize_schema(value)
         return processed
     elif isinstance(schema, list):
-        return [process_schema_refs_and_remove_nested_defs(item) for item in schema]
+        return [normalize_schema(item) for item in schema]
     else:
         return schema
 
 
-def remove_unwanted_titles(schema: Any) -> Any:
+def build_combined_schema(
+    models: Iterable[Type[BaseModel]],
+    profile: Optional[GenerationProfile] = None,
+) -> Dict[str, Any]:
     """
-    Recursively removes 'title' keys from a schema, except for titles
-    on objects that directly contain a 'properties' key (i.e., model definitions).
-    This prevents json-schema-to-typescript from creating aliases for simple types.
+    Build the single root schema passed to json-schema-to-typescript.
+
+    All models share one JSON schema generator, so every definition is generated
+    and normalized exactly once no matter how many models reference it. Each model
+    is exposed under ``properties`` and ``definitions``; both point to the same
+    normalized object.
     """
-    if not isinstance(schema, dict):
-        return schema
+    models = sorted(models, key=lambda m: (m.__module__, m.__qualname__))
+    with _profile_stage(profile, "model_json_schema"):
+        ref_map, top_level = models_json_schema([(m, 'validation') for m in models])
+
+    with _profile_stage(profile, "normalize"):
+        definitions = {
+            def_name: normalize_schema(def_schema)
+            for def_name, def_schema in top_level.get('$defs', {}).items()
+        }
+    properties = {}
+    for (model, _mode), ref in ref_map.items():
+        def_name = ref['$ref'].split('/')[-1]
+        properties[def_name] = definitions[def_name]
+
+    return {
+        "title": "TypsioModels",
+        "type": "object",
+        "properties": properties,
+        "definitions": definitions,
+    }
+
+
+def module_name_for_path(source_path: Path, project_root: str) -> str:
+    """
+    Infer the dotted module name of a source file so that relative imports work.
+    """
+    try:
+        # e.g., /path/to/project/src/api/user.py -> src.api.user
+        return ".".join(source_path.relative_to(project_root).with_suffix("").parts)
+    except ValueError:
+        # 如果文件不在项目根目录下，回退到使用文件名
+        return source_path.stem
+
+
+def import_source_file(source_path: Path, module_name: str) -> ModuleType:
+    """
+    Import a source file by path under the given module name.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, source_path)
+    if not spec or not spec.loader:
+        raise ImportError(f"Could not import source file '{source_path}'")
+
+    module = importlib.util.module_from_spec(spec)
+
+    # 必须将模块添加到 sys.modules 中，否则相对导入会失败
+    sys.modules[module_name] = module
+
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
 
-    # Recurse first on all values
-    new_schema = {k: remove_unwanted_titles(v) for k, v in schema.items()}
 
-    # Now, check if the current object's title should be kept
-    if 'title' in new_schema:
-        # Keep title only if 'properties' is also a key at this level
-        if 'properties' not in new_schema:
-            del new_schema['title']
-            
-    return new_schema
+def _iter_imported_sources(
+    source_paths: List[Path],
+    project_root: str,
+    registry_name: str,
+    s2c_events_name: Optional[str],
+) -> Iterator[Tuple[Iterable[Any], Dict[str, Callable[..., Any]], Dict[str, Any]]]:
+    """
+    Import each source file and yield its registry models, functions and S2C events.
+    """
+    for source_path in source_paths:
+        module = import_source_file(source_path, module_name_for_path(source_path, project_root))
+
+        registry = getattr(module, registry_name)
+        s2c_events = getattr(module, s2c_events_name, {}) if s2c_events_name else {}
+        functions: Dict[str, Any] = dict(getattr(registry, 'functions', {}))
+        for name in getattr(registry, 'cursors', {}):
+            if name in functions:
+                functions[name] = CursorSignature.of(signature(functions[name]))
+        yield (
+            registry.models,
+            functions,
+            dict(getattr(s2c_events, 'items', lambda: [])()),
+        )
 
 
 def generate_types(
@@ -315,6 +510,9 @@ def generate_types(
     *,
     verbose: bool = False,
     strict: bool = False,
+    static: bool = False,
+    profile: Optional[GenerationProfile] = None,
+    split: bool = False,
 ) -> None:
     """
     Programmatic API to generate TypeScript types.
@@ -322,12 +520,48 @@ def generate_types(
     Supports multiple Python source files. Aggregates all models, RPC methods,
     and S2C events, then emits a single merged TypeScript file.
 
+    When ``static`` is True, source files are parsed with ``ast`` instead of
+    being imported; only the modules that define the referenced models are
+    imported. See ``typsio.gen_static`` for details.
+
+    When ``split`` is True, ``output`` is a directory that receives one file per
+    Python module plus an ``index.ts`` barrel; see ``typsio.gen_split``.
+
+    When a ``GenerationProfile`` is given, the time and memory spent in each
+    stage are recorded into it.
+
     Raises exceptions on errors; prints progress when verbose is True.
     """
+    stop_tracing = profile is not None and profile.trace_memory and not tracemalloc.is_tracing()
+    if stop_tracing:
+        tracemalloc.start()
+    try:
+        _generate_types(
+            source_file, registry_name, output, s2c_events_name,
+            verbose=verbose, strict=strict, static=static, profile=profile, split=split,
+        )
+    finally:
+        if stop_tracing:
+            tracemalloc.stop()
+
+
+def _generate_types(
+    source_file: Union[str, Path, List[Union[str, Path]]],
+    registry_name: str,
+    output: Union[str, Path],
+    s2c_events_name: Optional[str],
+    *,
+    verbose: bool,
+    strict: bool,
+    static: bool,
+    profile: Optional[GenerationProfile],
+    split: bool,
+) -> None:
     global strict_mode, warnings_occurred
 
     strict_mode = strict
     warnings_occurred = False
+    _ts_type_cache.clear()
 
     # 解析输入文件路径，支持 glob
     if not isinstance(source_file, list):
@@ -336,25 +570,34 @@ def generate_types(
         source_patterns = source_file
 
     source_paths: List[Path] = []
-    for pattern in source_patterns:
-        # NOTE: Path patterns are relative to the current working directory.
-        # `glob` will expand them. `recursive=True` allows for `**`.
-        matched_files = glob.glob(str(pattern), recursive=True)
-        for f_str in matched_files:
-            f_path = Path(f_str)
-            if f_path.is_file():
-                source_paths.append(f_path.resolve())
-
-    # Remove duplicates and sort for consistent order
-    if source_paths:
-        source_paths = sorted(list(set(source_paths)))
+    with _profile_stage(profile, "resolve globs"):
+        for pattern in source_patterns:
+            # NOTE: Path patterns are relative to the current working directory.
+            # `glob` will expand them. `recursive=True` allows for `**`.
+            matched_files = glob.glob(str(pattern), recursive=True)
+            for f_str in matched_files:
+                f_path = Path(f_str)
+                if f_path.is_file():
+                    source_paths.append(f_path.resolve())
+
+        # Remove duplicates and sort for consistent order
+        if source_paths:
+            source_paths = sorted(list(set(source_paths)))
 
     if not source_paths:
         patterns_str = ', '.join(map(str, source_patterns))
         raise FileNotFoundError(f"No source files found for given patterns: {patterns_str}")
 
     output_path = Path(output).resolve()
-    output_path.parent.mkdir(exist_ok=True)
+    if split:
+        # 拆分模式下 output 为目录；json2ts 先输出到临时文件，再拆分写入
+        output_path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_ts_path = tempfile.mkstemp(suffix=".ts")
+        os.close(fd)
+        emit_path = Path(tmp_ts_path)
+    else:
+        output_path.parent.mkdir(exist_ok=True)
+        emit_path = output_path
 
     if verbose:
         if len(source_paths) == 1:
@@ -368,10 +611,12 @@ def generate_types(
             print(f"🔔 Using S2C events: {s2c_events_name}")
         if strict:
             print("🔒 Strict mode enabled")
+        if static:
+            print("🔍 Static extraction mode enabled")
 
     # 聚合容器
     all_models: Set[Type[BaseModel]] = set()
-    all_functions: Dict[str, Callable[..., Any]] = {}
+    all_functions: Dict[str, Union[Callable[..., Any], Signature]] = {}
     all_s2c_events: Dict[str, Type[BaseModel]] = {}
 
     # 将当前工作目录（假定为项目根目录）加入 sys.path，以支持相对导入
@@ -380,48 +625,36 @@ def generate_types(
     sys.path.append(project_root)
 
     try:
-        # 导入各个模块，收集 registry 与事件
-        for source_path in source_paths:
-            # 为了让相对导入生效，需要根据文件路径推断出完整的模块名
-            try:
-                # e.g., /path/to/project/src/api/user.py -> src.api.user
-                module_name = ".".join(source_path.relative_to(project_root).with_suffix("").parts)
-            except ValueError:
-                # 如果文件不在项目根目录下，回退到使用文件名
-                module_name = source_path.stem
-
-            spec = importlib.util.spec_from_file_location(module_name, source_path)
-            if not spec or not spec.loader:
-                raise ImportError(f"Could not import source file '{source_path}'")
-            
-            module = importlib.util.module_from_spec(spec)
-            
-            # 必须将模块添加到 sys.modules 中，否则相对导入会失败
-            sys.modules[module_name] = module
-            
-            spec.loader.exec_module(module)  # type: ignore[attr-defined]
-
-            registry = getattr(module, registry_name)
-            s2c_events = getattr(module, s2c_events_name, {}) if s2c_events_name else {}
-
-            # 模型
-            for model in registry.models:
-                if isinstance(model, type) and issubclass(model, BaseModel):
-                    all_models.add(model)
-
-            # RPC 方法（名称冲突后者覆盖并给出警告）
-            for func_name, func in getattr(registry, 'functions', {}).items():
-                if func_name in all_functions and verbose:
-                    print(f"⚠️  Duplicate RPC method '{func_name}' found. Overriding previous definition.", file=sys.stderr)
-                all_functions[func_name] = func
-
-            # 事件（名称冲突后者覆盖并给出警告）
-            for evt_name, evt_model in getattr(s2c_events, 'items', lambda: [])():
-                if evt_name in all_s2c_events and verbose:
-                    print(f"⚠️  Duplicate S2C event '{evt_name}' found. Overriding previous definition.", file=sys.stderr)
-                if isinstance(evt_model, type) and issubclass(evt_model, BaseModel):
-                    all_models.add(evt_model)
-                    all_s2c_events[evt_name] = evt_model
+        with _profile_stage(profile, "static extraction" if static else "import modules"):
+            if static:
+                # 延迟导入，避免 gen_static 与本模块之间的循环导入
+                from .gen_static import iter_static_sources
+                sources = iter_static_sources(
+                    source_paths, project_root, registry_name, s2c_events_name, verbose=verbose
+                )
+            else:
+                sources = _iter_imported_sources(source_paths, project_root, registry_name, s2c_events_name)
+
+            # 收集各个模块中的 registry 与事件
+            for models, functions, s2c_events in sources:
+                # 模型
+                for model in models:
+                    if isinstance(model, type) and issubclass(model, BaseModel):
+                        all_models.add(model)
+
+                # RPC 方法（名称冲突后者覆盖并给出警告）
+                for func_name, func in functions.items():
+                    if func_name in all_functions and verbose:
+                        print(f"⚠️  Duplicate RPC method '{func_name}' found. Overriding previous definition.", file=sys.stderr)
+                    all_functions[func_name] = func
+
+                # 事件（名称冲突后者覆盖并给出警告）
+                for evt_name, evt_model in s2c_events.items():
+                    if evt_name in all_s2c_events and verbose:
+                        print(f"⚠️  Duplicate S2C event '{evt_name}' found. Overriding previous definition.", file=sys.stderr)
+                    if isinstance(evt_model, type) and issubclass(evt_model, BaseModel):
+                        all_models.add(evt_model)
+                        all_s2c_events[evt_name] = evt_model
     finally:
         # 恢复 sys.path
         try:
@@ -433,11 +666,21 @@ def generate_types(
         print(f"📝 Found {len(all_models)} models to process")
         print(f"🧩 Aggregated {len(all_functions)} RPC methods and {len(all_s2c_events)} S2C events")
 
-    schemas = {m.__name__: m.model_json_schema() for m in all_models}
-    combined_schema = flatten_schema_definitions(schemas)
-    combined_schema = remove_unwanted_titles(combined_schema)
-    
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix=".json") as tmp_file:
+    type_owners = None
+    if split:
+        from .gen_split import collect_type_owners
+
+        # 同名模型在 index.ts 中会相互遮蔽，在运行 json2ts 之前报错
+        try:
+            type_owners = collect_type_owners(all_models)
+        except ValueError:
+            emit_path.unlink(missing_ok=True)
+            raise
+
+    combined_schema = build_combined_schema(all_models, profile)
+
+    with _profile_stage(profile, "write schema"), \
+            tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix=".json") as tmp_file:
         json.dump(combined_schema, tmp_file, indent=2)
         tmp_schema_path = tmp_file.name
     
@@ -457,7 +700,7 @@ def generate_types(
             "--input",
             tmp_schema_path,
             "--output",
-            str(output_path),
+            str(emit_path),
             "--bannerComment",
             banner_comment,
             "--style.singleQuote",
@@ -465,10 +708,14 @@ def generate_types(
         ]
         if verbose:
             print(f"🚀 Running command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        with _profile_stage(profile, "json2ts"):
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         if verbose and result.stdout:
             print(f" STDOUT: {result.stdout}")
     except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        if split:
+            # 成功时临时 .ts 文件在拆分后删除，失败时在这里删除
+            emit_path.unlink(missing_ok=True)
         if isinstance(e, FileNotFoundError):
             raise RuntimeError(
                 "json-schema-to-typescript not found. Install it: `npm i -g json-schema-to-typescript`"
@@ -479,13 +726,31 @@ def generate_types(
         if verbose:
             print(f"🧹 Cleaned up temporary files")
 
-    with open(output_path, "a") as f:
-        f.write("\n\n" + generate_ts_interface("RPCMethods", all_functions, format_rpc_method))
-        if all_s2c_events:
-            f.write("\n\n" + generate_ts_interface("ServerToClientEvents", all_s2c_events, format_event))
-    
-    if verbose:
-        print(f"📄 Appended RPC methods and events interfaces")
+    if split:
+        from .gen_split import split_ts_output, write_split_output
+
+        with _profile_stage(profile, "RPCMethods"):
+            rpc_interfaces = generate_rpc_declarations(all_functions, all_s2c_events)
+        with _profile_stage(profile, "split output"):
+            try:
+                ts_source = emit_path.read_text(encoding="utf-8")
+            finally:
+                emit_path.unlink(missing_ok=True)
+            files = split_ts_output(ts_source, type_owners, rpc_interfaces)
+            written, removed = write_split_output(output_path, files)
+
+        if verbose:
+            print(f"📂 Split output into {len(files)} files ({len(written)} updated, {len(removed)} removed)")
+            for name in written:
+                print(f"   • updated {name}")
+            for name in removed:
+                print(f"   • removed {name}")
+    else:
+        with _profile_stage(profile, "append RPCMethods"), open(output_path, "a") as f:
+            f.write("\n\n" + generate_rpc_declarations(all_functions, all_s2c_events))
+
+        if verbose:
+            print(f"📄 Appended RPC methods and events interfaces")
     
     if warnings_occurred:
         if strict:
@@ -506,6 +771,9 @@ def main():
     parser.add_argument("--s2c-events-name", help="Name of the Server-to-Client events dictionary (optional, same name in each file).")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output.")
     parser.add_argument("--strict", "-s", action="store_true", help="Treat warnings as errors.")
+    parser.add_argument("--static", action="store_true", help="Extract the API by parsing source files instead of importing them.")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing and memory breakdown.")
+    parser.add_argument("--split", action="store_true", help="Write one file per Python module into the output directory.")
     parser.add_argument("--config", "-c", help="Path to a .py config file that instantiates TypsioGenConfig.")
     args = parser.parse_args()
 
@@ -539,6 +807,12 @@ def main():
             config_obj.verbose = True
         if args.strict:
             config_obj.strict = True
+        if args.static:
+            config_obj.static = True
+        if args.profile:
+            config_obj.profile = True
+        if args.split:
+            config_obj.split = True
 
         # 选择 source_files 优先，否则回退到单文件
         cfg_sources: Union[str, Path, List[Union[str, Path]]]
@@ -560,14 +834,24 @@ def main():
         if not config_obj.output:
             raise ValueError("Missing output path. Provide via --output or in config file.")
 
-        generate_types(
-            source_file=cfg_sources,
-            registry_name=config_obj.registry_name,
-            output=config_obj.output,
-            s2c_events_name=config_obj.s2c_events_name,
-            verbose=config_obj.verbose,
-            strict=config_obj.strict,
-        )
+        profile = GenerationProfile() if config_obj.profile else None
+        try:
+            generate_types(
+                source_file=cfg_sources,
+                registry_name=config_obj.registry_name,
+                output=config_obj.output,
+                s2c_events_name=config_obj.s2c_events_name,
+                verbose=config_obj.verbose,
+                strict=config_obj.strict,
+                static=config_obj.static,
+                profile=profile,
+                split=config_obj.split,
+            )
+        finally:
+            # 即使生成失败，也输出已完成阶段的数据
+            if profile is not None:
+                print("⏱️  Generation profile:")
+                print(profile.format())
     except Exception as e:
         print(f"❌ {e}", file=sys.stderr)
         traceback.print_exc()
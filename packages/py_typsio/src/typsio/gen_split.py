@@ -0,0 +1,205 @@
+# packages/py_typsio/src/typsio/gen_split.py
+"""
+Split the generated TypeScript into one file per Python module.
+
+json-schema-to-typescript emits every model into a single file. In split mode
+its output is cut into top-level declarations, each declaration is assigned to
+the file of the Python module that defines the model, and ``import type``
+statements are added for references across files. ``_rpc.ts`` holds
+``RPCMethods`` / ``ServerToClientEvents`` and ``index.ts`` re-exports
+everything, so consumers can keep importing from the output directory.
+
+Files are only rewritten when their content changes, which keeps incremental
+TypeScript builds and bundler caches warm.
+"""
+import re
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+
+GENERATED_MARKER = "This file was automatically generated by typsio-gen."
+INDEX_FILE = "index.ts"
+RPC_FILE = "_rpc.ts"
+SHARED_FILE = "_shared.ts"
+
+_DECL_RE = re.compile(r"^export (?:declare )?(?:interface|type|enum|const enum|const|class) ([A-Za-z_$][\w$]*)")
+_IDENT_RE = re.compile(r"[A-Za-z_$][\w$]*")
+_STRING_RE = re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"")
+_PROPERTY_KEY_RE = re.compile(r"^(\s*)[A-Za-z_$][\w$]*\??:", re.MULTILINE)
+_COMMENT_RE = re.compile(r"/\*.*?\*/|//[^\n]*", re.DOTALL)
+
+
+def ts_safe_name(name: str) -> str:
+    """Mirror json-schema-to-typescript's ``toSafeString`` used to name declarations."""
+    s = re.sub(r"(^\s*[^a-zA-Z_$])|([^a-zA-Z_$\d])", " ", name)
+    s = re.sub(r"^_[a-z]", lambda m: m.group().upper(), s)
+    s = re.sub(r"_[a-z]", lambda m: m.group()[1:].upper(), s)
+    s = re.sub(r"([\d$]+[a-zA-Z])", lambda m: m.group().upper(), s)
+    s = re.sub(r"\s+([a-zA-Z])", lambda m: m.group().strip().upper(), s)
+    s = re.sub(r"\s", "", s)
+    return s[:1].upper() + s[1:]
+
+
+def _iter_named_types(py_type: Any) -> Iterable[type]:
+    """Yield pydantic models and enums referenced by a type hint."""
+    if isinstance(py_type, type) and issubclass(py_type, (BaseModel, Enum)):
+        yield py_type
+        return
+    for arg in getattr(py_type, "__args__", None) or ():
+        yield from _iter_named_types(arg)
+
+
+def collect_type_owners(models: Iterable[Type[BaseModel]]) -> Dict[str, str]:
+    """
+    Map the TypeScript name of every model and enum reachable from ``models``
+    to the dotted name of the Python module that defines it.
+
+    :raises ValueError: if two different classes map to the same TypeScript name,
+        since ``index.ts`` re-exports every file and one would silently shadow the other.
+    """
+    owners: Dict[str, str] = {}
+    classes: Dict[str, type] = {}
+    pending = list(models)
+    seen: Set[type] = set()
+    while pending:
+        cls = pending.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        ts_name = ts_safe_name(cls.__name__)
+        other = classes.get(ts_name)
+        if other is not None:
+            raise ValueError(
+                f"'{other.__module__}.{other.__qualname__}' and '{cls.__module__}.{cls.__qualname__}' "
+                f"both map to the TypeScript name '{ts_name}'; rename one of them to use split output."
+            )
+        classes[ts_name] = cls
+        owners[ts_name] = cls.__module__
+        if issubclass(cls, BaseModel):
+            for field in cls.model_fields.values():
+                pending.extend(_iter_named_types(field.annotation))
+    return owners
+
+
+def split_ts_declarations(ts_source: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split json-schema-to-typescript output into its banner and ``(name, text)``
+    pairs of top-level declarations. A JSDoc block directly above a declaration
+    is kept with it.
+    """
+    lines = ts_source.splitlines()
+    header: Optional[List[str]] = None
+    decls: List[Tuple[str, str]] = []
+    current: Optional[Tuple[str, int]] = None
+    comment_start: Optional[int] = None
+    comment_end: Optional[int] = None
+
+    def close(end: int) -> None:
+        if current is not None:
+            name, begin = current
+            decls.append((name, "\n".join(lines[begin:end]).rstrip()))
+
+    for i, line in enumerate(lines):
+        if line.startswith("/**"):
+            comment_start = i
+        if comment_start is not None and line.rstrip().endswith("*/"):
+            comment_end = i
+        match = _DECL_RE.match(line)
+        if not match:
+            continue
+        begin = comment_start if comment_start is not None and comment_end == i - 1 else i
+        if current is None:
+            header = lines[:begin]
+        close(begin)
+        current = (match.group(1), begin)
+        comment_start = comment_end = None
+    close(len(lines))
+
+    return "\n".join(header if header is not None else lines).rstrip(), decls
+
+
+def _referenced_names(text: str, known: Iterable[str]) -> Set[str]:
+    # 去掉注释、字符串字面量与属性名，避免把它们误认为类型引用
+    text = _COMMENT_RE.sub(" ", text)
+    text = _STRING_RE.sub(" ", text)
+    text = _PROPERTY_KEY_RE.sub(r"\1", text)
+    return set(_IDENT_RE.findall(text)) & set(known)
+
+
+def _module_file(module: str) -> str:
+    return f"{module}.ts"
+
+
+def split_ts_output(ts_source: str, owners: Dict[str, str], rpc_interfaces: str) -> Dict[str, str]:
+    """
+    Build the per-module files for split output.
+
+    :param ts_source: Output of json-schema-to-typescript for the combined schema.
+    :param owners: TypeScript name -> defining Python module, see ``collect_type_owners``.
+    :param rpc_interfaces: The ``RPCMethods`` / ``ServerToClientEvents`` interfaces.
+    :return: File name -> content.
+    """
+    banner, decls = split_ts_declarations(ts_source)
+
+    # 声明名称 -> 输出文件；无法对应到 Python 模块的声明（例如 TypsioModels）放入共享文件
+    file_of: Dict[str, str] = {}
+    bodies: Dict[str, List[str]] = {}
+    for name, text in decls:
+        module = owners.get(name)
+        file_name = _module_file(module) if module else SHARED_FILE
+        file_of[name] = file_name
+        bodies.setdefault(file_name, []).append(text)
+
+    def render(file_name: str, blocks: List[str]) -> str:
+        body = "\n\n".join(blocks)
+        imports: Dict[str, Set[str]] = {}
+        for name in _referenced_names(body, file_of):
+            if file_of[name] != file_name:
+                imports.setdefault(file_of[name], set()).add(name)
+        import_lines = [
+            f"import type {{ {', '.join(sorted(names))} }} from './{target[:-len('.ts')]}';"
+            for target, names in sorted(imports.items())
+        ]
+        parts = [banner]
+        if import_lines:
+            parts.append("\n".join(import_lines))
+        parts.append(body)
+        return "\n\n".join(parts) + "\n"
+
+    files = {file_name: render(file_name, blocks) for file_name, blocks in bodies.items()}
+    files[RPC_FILE] = render(RPC_FILE, [rpc_interfaces])
+
+    exports = [f"export * from './{f[:-len('.ts')]}';" for f in sorted(files)]
+    files[INDEX_FILE] = f"{banner}\n\n" + "\n".join(exports) + "\n"
+    return files
+
+
+def write_split_output(output_dir: Path, files: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """
+    Write ``files`` into ``output_dir``, touching only files whose content changed,
+    and remove files generated by a previous run that are no longer produced.
+
+    :return: ``(written, removed)`` file names.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: List[str] = []
+    for file_name, content in sorted(files.items()):
+        path = output_dir / file_name
+        if path.is_file() and path.read_text(encoding="utf-8") == content:
+            continue
+        path.write_text(content, encoding="utf-8")
+        written.append(file_name)
+
+    removed: List[str] = []
+    for path in sorted(output_dir.glob("*.ts")):
+        if path.name in files:
+            continue
+        # 只删除由 typsio-gen 生成的文件
+        with open(path, encoding="utf-8") as f:
+            head = f.read(512)
+        if GENERATED_MARKER in head:
+            path.unlink()
+            removed.append(path.name)
+    return written, removed
@@ -0,0 +1,440 @@
+# packages/py_typsio/src/typsio/gen_static.py
+"""
+Static (AST based) API extraction for typsio-gen.
+
+Instead of executing every source file, the source files are parsed with
+``ast``: functions decorated with ``@<registry>.register`` and the S2C events
+dict are located syntactically, and annotations are resolved by following the
+imports of local modules. Only the modules that actually define the referenced
+classes (usually pydantic models) are imported; modules outside the project
+(``typing``, ``datetime``, ...) are imported normally when an annotation
+refers to them.
+
+Anything that cannot be resolved statically raises ``StaticExtractionError``
+instead of being silently mapped to ``any``.
+"""
+import ast
+import builtins
+import importlib
+import sys
+from inspect import Parameter, Signature
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .gen import CursorSignature, import_source_file, module_name_for_path
+from .rpc import RPCRegistry
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+
+class StaticExtractionError(Exception):
+    """Raised when the API cannot be extracted from source files statically."""
+
+
+class _ModuleRef:
+    """A reference to a local module that has not been imported."""
+    def __init__(self, name: str):
+        self.name = name
+
+
+class _ModuleInfo:
+    """Parsed source of one local module and its top-level bindings."""
+    def __init__(self, name: str, path: Path, is_package: bool):
+        self.name = name
+        self.path = path
+        self.is_package = is_package
+        self.source = path.read_text(encoding="utf-8")
+        self.tree = ast.parse(self.source, filename=str(path))
+        # name -> 绑定的 AST 节点（ClassDef / FunctionDef / Import / ImportFrom / 赋值表达式）
+        self.symbols: Dict[str, Tuple[str, Any]] = {}
+        self.star_imports: List[str] = []
+        self._collect_symbols(self.tree.body)
+
+    @property
+    def package(self) -> str:
+        return self.name if self.is_package else self.name.rpartition(".")[0]
+
+    def resolve_relative(self, module: Optional[str], level: int) -> str:
+        if level == 0:
+            return module or ""
+        parts = self.package.split(".") if self.package else []
+        if level - 1 > len(parts):
+            raise StaticExtractionError(f"{self.path}: relative import beyond top-level package")
+        base = parts[:len(parts) - (level - 1)]
+        if module:
+            base.append(module)
+        return ".".join(base)
+
+    def _collect_symbols(self, body: List[ast.stmt]) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                self.symbols[node.name] = ("class", node)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.symbols[node.name] = ("function", node)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        self.symbols[alias.asname] = ("module", alias.name)
+                    else:
+                        # `import a.b` 只绑定顶层包名 `a`
+                        top = alias.name.split(".")[0]
+                        self.symbols[top] = ("module", top)
+            elif isinstance(node, ast.ImportFrom):
+                module = self.resolve_relative(node.module, node.level)
+                for alias in node.names:
+                    if alias.name == "*":
+                        self.star_imports.append(module)
+                    else:
+                        self.symbols[alias.asname or alias.name] = ("from", (module, alias.name))
+            elif isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.symbols[target.id] = ("value", node.value)
+                    else:
+                        for name in ast.walk(target):
+                            if isinstance(name, ast.Name):
+                                self.symbols[name.id] = ("opaque", node)
+            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+                if node.value is not None:
+                    self.symbols[node.target.id] = ("value", node.value)
+            elif isinstance(node, ast.If):
+                # 同时收集 `if TYPE_CHECKING:` 等分支中的导入
+                self._collect_symbols(node.body)
+                self._collect_symbols(node.orelse)
+            elif isinstance(node, ast.Try):
+                self._collect_symbols(node.body)
+                for handler in node.handlers:
+                    self._collect_symbols(handler.body)
+                self._collect_symbols(node.orelse)
+                self._collect_symbols(node.finalbody)
+            elif type(node).__name__ == "TypeAlias":
+                # Python 3.12+: `type X = ...`
+                self.symbols[node.name.id] = ("value", node.value)  # type: ignore[attr-defined]
+
+    def where(self, node: ast.AST) -> str:
+        return f"{self.path}:{getattr(node, 'lineno', '?')}"
+
+    def text(self, node: ast.AST) -> str:
+        return ast.get_source_segment(self.source, node) or ast.dump(node)
+
+
+class _StaticExtractor:
+    """Resolves registry functions, S2C events and annotations without importing source files."""
+    def __init__(self, project_root: str, source_modules: Dict[str, Path], verbose: bool = False):
+        self._project_root = Path(project_root).resolve()
+        # 输入文件的模块名 -> 路径；这些模块需要通过文件路径导入
+        self._source_modules = source_modules
+        self._verbose = verbose
+        self._modules: Dict[str, Optional[_ModuleInfo]] = {}
+        self._resolving: Set[Tuple[str, str]] = set()
+
+    # --- 模块定位 ---
+
+    def _find_local_file(self, module_name: str) -> Optional[Tuple[Path, bool]]:
+        if module_name in self._source_modules:
+            return self._source_modules[module_name], False
+        rel = Path(*module_name.split("."))
+        search_roots = [self._project_root] + [Path(p) for p in sys.path if p]
+        for root in search_roots:
+            try:
+                root = root.resolve()
+            except OSError:
+                continue
+            for candidate, is_package in ((root / rel.with_suffix(".py"), False), (root / rel / "__init__.py", True)):
+                if candidate.is_file():
+                    # 只有项目目录下的模块才做静态解析，其余模块（标准库、site-packages）按常规导入
+                    if self._project_root in candidate.resolve().parents:
+                        return candidate, is_package
+                    return None
+        return None
+
+    def module(self, module_name: str) -> Optional[_ModuleInfo]:
+        """Return the parsed local module, or None if it is not part of the project."""
+        if module_name not in self._modules:
+            found = self._find_local_file(module_name)
+            self._modules[module_name] = _ModuleInfo(module_name, *found) if found else None
+        return self._modules[module_name]
+
+    def _import(self, module_name: str) -> Any:
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        if self._verbose:
+            print(f"📥 Importing module: {module_name}")
+        if module_name in self._source_modules:
+            return import_source_file(self._source_modules[module_name], module_name)
+        return importlib.import_module(module_name)
+
+    # --- 名称解析 ---
+
+    def lookup(self, mod: _ModuleInfo, name: str, node: ast.AST) -> Any:
+        """Resolve a top-level name of a local module to a Python object or a module reference."""
+        key = (mod.name, name)
+        if key in self._resolving:
+            raise StaticExtractionError(f"{mod.where(node)}: circular definition of '{name}'")
+        self._resolving.add(key)
+        try:
+            return self._lookup(mod, name, node)
+        finally:
+            self._resolving.discard(key)
+
+    def _lookup(self, mod: _ModuleInfo, name: str, node: ast.AST) -> Any:
+        symbol = mod.symbols.get(name)
+        if symbol is None:
+            for star_module in mod.star_imports:
+                found = self._lookup_attr(star_module, name, node, mod, missing_ok=True)
+                if found is not None:
+                    return found
+            if hasattr(builtins, name):
+                return getattr(builtins, name)
+            raise StaticExtractionError(f"{mod.where(node)}: name '{name}' is not defined in module '{mod.name}'")
+
+        kind, value = symbol
+        if kind == "class":
+            # 类（通常是 Pydantic 模型）必须通过导入其定义模块获得
+            return getattr(self._import(mod.name), name)
+        if kind == "module":
+            return self._module_ref(value)
+        if kind == "from":
+            module_name, attr = value
+            return self._lookup_attr(module_name, attr, node, mod)
+        if kind == "value":
+            # 类型别名，例如 `UserList = List[User]`
+            return self.resolve(mod, value)
+        raise StaticExtractionError(
+            f"{mod.where(node)}: '{name}' is bound by a {kind} statement and cannot be resolved statically"
+        )
+
+    def _module_ref(self, module_name: str) -> Any:
+        if self.module(module_name) is not None:
+            return _ModuleRef(module_name)
+        return self._import(module_name)
+
+    def _lookup_attr(self, module_name: str, attr: str, node: ast.AST, origin: _ModuleInfo, missing_ok: bool = False) -> Any:
+        target = self.module(module_name)
+        if target is None:
+            # 非本地模块：正常导入
+            try:
+                module = self._import(module_name)
+            except ImportError as e:
+                raise StaticExtractionError(f"{origin.where(node)}: cannot import module '{module_name}': {e}") from e
+            if hasattr(module, attr):
+                return getattr(module, attr)
+            if missing_ok:
+                return None
+            try:
+                return self._import(f"{module_name}.{attr}")
+            except ImportError:
+                raise StaticExtractionError(
+                    f"{origin.where(node)}: module '{module_name}' has no attribute '{attr}'"
+                ) from None
+
+        if attr in target.symbols or any(self.module(m) is None or attr in self.module(m).symbols for m in target.star_imports):
+            return self.lookup(target, attr, node)
+        # `from package import submodule`
+        submodule = f"{module_name}.{attr}"
+        if self.module(submodule) is not None:
+            return _ModuleRef(submodule)
+        if missing_ok:
+            return None
+        raise StaticExtractionError(f"{origin.where(node)}: cannot find '{attr}' in module '{module_name}'")
+
+    # --- 注解解析 ---
+
+    def resolve(self, mod: _ModuleInfo, node: ast.AST) -> Any:
+        """Resolve an annotation expression to the Python object it denotes."""
+        result = self._resolve(mod, node)
+        if isinstance(result, _ModuleRef):
+            raise StaticExtractionError(f"{mod.where(node)}: '{mod.text(node)}' refers to a module, not a type")
+        return result
+
+    def _resolve(self, mod: _ModuleInfo, node: ast.AST) -> Any:
+        if isinstance(node, ast.Name):
+            return self.lookup(mod, node.id, node)
+        if isinstance(node, ast.Attribute):
+            base = self._resolve(mod, node.value)
+            if isinstance(base, _ModuleRef):
+                return self._lookup_attr(base.name, node.attr, node, mod)
+            if not hasattr(base, node.attr):
+                raise StaticExtractionError(f"{mod.where(node)}: cannot resolve '{mod.text(node)}'")
+            return getattr(base, node.attr)
+        if isinstance(node, ast.Constant):
+            if node.value is None or node.value is Ellipsis:
+                return node.value
+            if isinstance(node.value, str):
+                # 字符串形式的前向引用
+                try:
+                    expr = ast.parse(node.value, mode="eval").body
+                except SyntaxError as e:
+                    raise StaticExtractionError(f"{mod.where(node)}: invalid forward reference {node.value!r}") from e
+                ast.increment_lineno(expr, node.lineno - 1)
+                return self._resolve_forward(mod, expr, node.value)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            # X | Y 语法，统一转换为 Union 以兼容旧版本 Python
+            return Union[self.resolve(mod, node.left), self.resolve(mod, node.right)]  # type: ignore[index]
+        if isinstance(node, ast.Subscript):
+            return self._resolve_subscript(mod, node)
+        raise StaticExtractionError(
+            f"{mod.where(node)}: unsupported annotation expression '{mod.text(node)}'"
+        )
+
+    def _resolve_forward(self, mod: _ModuleInfo, expr: ast.AST, text: str) -> Any:
+        try:
+            return self.resolve(mod, expr)
+        except StaticExtractionError as e:
+            raise StaticExtractionError(f"{e} (in forward reference {text!r})") from None
+
+    def _resolve_subscript(self, mod: _ModuleInfo, node: ast.Subscript) -> Any:
+        origin = self.resolve(mod, node.value)
+        slice_node = node.slice
+        # Python 3.8: Subscript.slice 为 ast.Index 包装
+        if type(slice_node).__name__ == "Index":
+            slice_node = slice_node.value  # type: ignore[attr-defined]
+        elements = slice_node.elts if isinstance(slice_node, ast.Tuple) else [slice_node]
+
+        if origin is Literal or getattr(origin, "_name", None) == "Literal":
+            args: List[Any] = []
+            for elt in elements:
+                if isinstance(elt, ast.Constant):
+                    args.append(elt.value)
+                else:
+                    args.append(self.resolve(mod, elt))
+        else:
+            args = [self.resolve(mod, elt) for elt in elements]
+
+        if getattr(origin, "_name", None) == "Annotated" or getattr(origin, "__name__", None) == "Annotated":
+            # 元数据（例如 Field(...)）不影响生成的 TypeScript 类型
+            return args[0]
+        try:
+            return origin[tuple(args) if len(args) > 1 else args[0]]
+        except TypeError as e:
+            raise StaticExtractionError(f"{mod.where(node)}: cannot construct '{mod.text(node)}': {e}") from e
+
+    # --- Registry 与事件 ---
+
+    def _is_register(self, node: ast.AST, registry_name: str, attr: str = "register") -> bool:
+        return (
+            isinstance(node, ast.Attribute)
+            and node.attr == attr
+            and isinstance(node.value, ast.Name)
+            and node.value.id == registry_name
+        )
+
+    def signature_of(self, mod: _ModuleInfo, func: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> Signature:
+        def annotation(arg: ast.arg) -> Any:
+            return Parameter.empty if arg.annotation is None else self.resolve(mod, arg.annotation)
+
+        params: List[Parameter] = []
+        args = func.args
+        for arg in getattr(args, "posonlyargs", []):
+            params.append(Parameter(arg.arg, Parameter.POSITIONAL_ONLY, annotation=annotation(arg)))
+        for arg in args.args:
+            params.append(Parameter(arg.arg, Parameter.POSITIONAL_OR_KEYWORD, annotation=annotation(arg)))
+        if args.vararg:
+            params.append(Parameter(args.vararg.arg, Parameter.VAR_POSITIONAL, annotation=annotation(args.vararg)))
+        for arg in args.kwonlyargs:
+            params.append(Parameter(arg.arg, Parameter.KEYWORD_ONLY, annotation=annotation(arg)))
+        if args.kwarg:
+            params.append(Parameter(args.kwarg.arg, Parameter.VAR_KEYWORD, annotation=annotation(args.kwarg)))
+
+        returns = Signature.empty if func.returns is None else self.resolve(mod, func.returns)
+        return Signature(params, return_annotation=returns)
+
+    def registered_functions(self, mod: _ModuleInfo, registry_name: str) -> Dict[str, Signature]:
+        if registry_name not in mod.symbols and not mod.star_imports:
+            raise StaticExtractionError(f"{mod.path}: registry '{registry_name}' is not defined or imported")
+
+        top_level = set(id(n) for n in mod.tree.body)
+        functions: Dict[str, Signature] = {}
+        for node in ast.walk(mod.tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for decorator in node.decorator_list:
+                    # @registry.register_cursor(...) 的参数只影响运行时分页，生成类型时无需求值
+                    is_cursor = isinstance(decorator, ast.Call) and self._is_register(decorator.func, registry_name, "register_cursor")
+                    if isinstance(decorator, ast.Call) and self._is_register(decorator.func, registry_name):
+                        raise StaticExtractionError(
+                            f"{mod.where(decorator)}: '{mod.text(decorator)}' is not supported in static mode"
+                        )
+                    if not is_cursor and not self._is_register(decorator, registry_name):
+                        continue
+                    if id(node) not in top_level:
+                        raise StaticExtractionError(
+                            f"{mod.where(node)}: '{node.name}' must be registered at module level in static mode"
+                        )
+                    sig = self.signature_of(mod, node)
+                    functions[node.name] = CursorSignature.of(sig) if is_cursor else sig
+            elif isinstance(node, ast.Call) and self._is_register(node.func, registry_name):
+                # 以函数调用方式注册（registry.register(func)）依赖运行时的值
+                raise StaticExtractionError(
+                    f"{mod.where(node)}: dynamic registration '{mod.text(node)}' cannot be extracted statically"
+                )
+        return functions
+
+    def s2c_events(self, mod: _ModuleInfo, events_name: str) -> Dict[str, Any]:
+        symbol = mod.symbols.get(events_name)
+        if symbol is None:
+            # 与导入模式一致：事件字典是可选的
+            return {}
+        kind, value = symbol
+        if kind == "from":
+            module_name, attr = value
+            target = self.module(module_name)
+            if target is None:
+                raise StaticExtractionError(
+                    f"{mod.path}: S2C events '{events_name}' are imported from non-local module '{module_name}'"
+                )
+            return self.s2c_events(target, attr)
+        if kind != "value":
+            raise StaticExtractionError(f"{mod.path}: S2C events '{events_name}' must be a dict literal")
+
+        if isinstance(value, ast.Dict):
+            pairs = list(zip(value.keys, value.values))
+        elif isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == "dict" and not value.args:
+            pairs = [(ast.Constant(kw.arg), kw.value) for kw in value.keywords]
+        else:
+            raise StaticExtractionError(
+                f"{mod.where(value)}: S2C events '{events_name}' must be a dict literal, got '{mod.text(value)}'"
+            )
+
+        events: Dict[str, Any] = {}
+        for key, val in pairs:
+            if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                raise StaticExtractionError(f"{mod.where(value)}: S2C event names must be string literals")
+            events[key.value] = self.resolve(mod, val)
+        return events
+
+
+def iter_static_sources(
+    source_paths: List[Path],
+    project_root: str,
+    registry_name: str,
+    s2c_events_name: Optional[str] = None,
+    *,
+    verbose: bool = False,
+) -> Iterator[Tuple[Set[Any], Dict[str, Signature], Dict[str, Any]]]:
+    """
+    Statically extract each source file, yielding its models, function signatures and S2C events.
+
+    Mirrors what importing the module and reading the registry would produce, except
+    that only functions decorated in the given files (``@<registry>.register`` or
+    ``@<registry>.register_cursor(...)`` at module level) are picked up.
+    """
+    source_modules = {module_name_for_path(p, project_root): p for p in source_paths}
+    extractor = _StaticExtractor(project_root, source_modules, verbose=verbose)
+
+    for module_name in source_modules:
+        mod = extractor.module(module_name)
+        assert mod is not None
+        functions = extractor.registered_functions(mod, registry_name)
+        events = extractor.s2c_events(mod, s2c_events_name) if s2c_events_name else {}
+
+        # 复用 RPCRegistry 的模型提取逻辑
+        collector = RPCRegistry()
+        for sig in functions.values():
+            collector._add_model_from_type(sig.return_annotation)
+            for param in sig.parameters.values():
+                collector._add_model_from_type(param.annotation)
+
+        yield collector.models, functions, events
@@ -0,0 +1,180 @@
+# packages/py_typsio/src/typsio/projection.py
+"""
+Client-selected field projection of RPC results.
+
+A call envelope may carry ``"projection": {"include": [...], "exclude": [...]}``
+with dotted field paths into the function's return type:
+
+    -> {"call_id": "c1", "function_name": "get_user", "args": [1],
+        "projection": {"include": ["id", "name", "team.name"]}}
+    <- {"call_id": "c1", "result": {"id": 1, "name": "Ann", "team": {"name": "Core"}}, "error": null}
+
+Paths are checked against the return annotation and compiled into the nested
+``include``/``exclude`` sets pydantic's serializer understands (lists, sets and
+dict values are traversed with ``"__all__"``), so unselected fields are never
+dumped. Paths below an ``Any`` or unannotated type are passed through unchecked.
+Compiled projections are cached per function, keyed on the normalized paths.
+"""
+import collections.abc
+from collections import OrderedDict
+from inspect import signature
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+try:
+    from typing import Annotated, get_args, get_origin, get_type_hints
+except ImportError:  # Python < 3.9：get_type_hints 不支持 include_extras
+    from typing_extensions import Annotated, get_args, get_origin, get_type_hints
+
+try:
+    from types import UnionType
+    _UNION_ORIGINS: Tuple[Any, ...] = (Union, UnionType)
+except ImportError:  # Python < 3.10
+    _UNION_ORIGINS = (Union,)
+
+# 序列化器接受的 include/exclude 参数
+IncEx = Dict[Union[str, int], Any]
+# (函数名, include 路径, exclude 路径)；未指定的一侧为 None
+ProjectionKey = Tuple[str, Optional[Tuple[str, ...]], Optional[Tuple[str, ...]]]
+
+_SEQUENCE_ORIGINS = (
+    list, set, frozenset, tuple,
+    # 游标函数返回的可迭代对象
+    collections.abc.Iterable, collections.abc.Iterator, collections.abc.Generator,
+    collections.abc.AsyncIterable, collections.abc.AsyncIterator, collections.abc.AsyncGenerator,
+    collections.abc.Sequence, collections.abc.Collection,
+)
+_MAPPING_ORIGINS = (dict,)
+
+
+class ProjectionError(ValueError):
+    """Raised when a projection is malformed or names a field the result does not have."""
+
+
+def _path_tree(paths: Any, kind: str) -> Dict[str, Any]:
+    if not isinstance(paths, list) or not all(isinstance(p, str) and p for p in paths):
+        raise ProjectionError(f"'{kind}' must be a list of dotted field paths.")
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        parts = path.split('.')
+        for i, part in enumerate(parts):
+            if not part:
+                raise ProjectionError(f"Invalid field path '{path}'.")
+            if node.get(part) is True:
+                # 已选择整个字段，更深的路径没有意义
+                break
+            if i == len(parts) - 1:
+                node[part] = True
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _compile(tree: Dict[str, Any], py_type: Any, path: str) -> IncEx:
+    """Map a tree of field names onto ``py_type``, inserting ``"__all__"`` for collections."""
+    if py_type is Any:
+        return tree
+    origin = get_origin(py_type)
+    if origin is Annotated:
+        return _compile(tree, get_args(py_type)[0], path)
+    if origin in _UNION_ORIGINS:
+        errors = []
+        for arg in get_args(py_type):
+            if arg is type(None):
+                continue
+            try:
+                return _compile(tree, arg, path)
+            except ProjectionError as e:
+                errors.append(e)
+        raise errors[0] if errors else ProjectionError(f"'{path}' has no fields.")
+    if origin in _SEQUENCE_ORIGINS:
+        args = [a for a in get_args(py_type) if a is not Ellipsis]
+        if origin is tuple:
+            # 定长元组的各项类型不同时不做检查
+            item = args[0] if len(set(args)) == 1 else Any
+        else:
+            # Generator[Y, S, R] 等只取产出的类型
+            item = args[0] if args else Any
+        return {"__all__": _compile(tree, item, path)}
+    if origin in _MAPPING_ORIGINS:
+        args = get_args(py_type)
+        return {"__all__": _compile(tree, args[1] if len(args) == 2 else Any, path)}
+    if isinstance(py_type, type) and issubclass(py_type, BaseModel):
+        compiled: IncEx = {}
+        for name, sub in tree.items():
+            field = py_type.model_fields.get(name)
+            if field is None:
+                raise ProjectionError(f"'{py_type.__name__}' has no field '{name}'" + (f" (at '{path}')." if path else "."))
+            sub_path = f"{path}.{name}" if path else name
+            compiled[name] = True if sub is True else _compile(sub, field.annotation, sub_path)
+        return compiled
+    raise ProjectionError(f"'{path or 'result'}' has no fields.")
+
+
+def _return_type(func: Callable) -> Any:
+    try:
+        annotation = get_type_hints(func, include_extras=True).get('return', Any)
+    except Exception:
+        # 无法解析的前向引用时不做检查
+        return Any
+    return Any if annotation is signature(func).empty else annotation
+
+
+class ProjectionCache:
+    """
+    Compiles and caches projections per function.
+
+    :param maxsize: Number of compiled projections kept, least recently used first out.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._return_types: Dict[Callable, Any] = {}
+        self._compiled: "OrderedDict[ProjectionKey, Dict[str, Optional[IncEx]]]" = OrderedDict()
+
+    @staticmethod
+    def key(function_name: str, projection: Any) -> ProjectionKey:
+        """
+        Normalized cache key of a projection: the same fields in a different
+        order or with duplicates give the same key. Anything caching projected
+        results must include this key.
+        """
+        if not isinstance(projection, dict) or set(projection) - {"include", "exclude"}:
+            raise ProjectionError("Projection must be an object with 'include' and/or 'exclude'.")
+        include, exclude = projection.get("include"), projection.get("exclude")
+        for kind, paths in (("include", include), ("exclude", exclude)):
+            if paths is not None and (not isinstance(paths, list) or not all(isinstance(p, str) for p in paths)):
+                raise ProjectionError(f"'{kind}' must be a list of dotted field paths.")
+        return (
+            function_name,
+            tuple(sorted(set(include))) if include is not None else None,
+            tuple(sorted(set(exclude))) if exclude is not None else None,
+        )
+
+    def get(self, function_name: str, func: Callable, projection: Any) -> Dict[str, Optional[IncEx]]:
+        """
+        Return the ``include``/``exclude`` keyword arguments for the serializer.
+
+        :raises ProjectionError: if the projection is malformed or names unknown fields.
+        """
+        key = self.key(function_name, projection)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._compiled.move_to_end(key)
+            return compiled
+
+        if func not in self._return_types:
+            self._return_types[func] = _return_type(func)
+        return_type = self._return_types[func]
+        compiled = {"include": None, "exclude": None}
+        if key[1] is not None:
+            compiled["include"] = _compile(_path_tree(list(key[1]), "include"), return_type, "")
+        if key[2] is not None:
+            compiled["exclude"] = _compile(_path_tree(list(key[2]), "exclude"), return_type, "")
+
+        self._compiled[key] = compiled
+        if len(self._compiled) > self.maxsize:
+            self._compiled.popitem(last=False)
+        return compiled
+
@@ -0,0 +1,263 @@
+# packages/py_typsio/src/typsio/replay.py
+"""
+Sequence-numbered server-to-client events with replay after reconnect.
+
+Events emitted through ``S2CReplayBuffer.emit`` are validated against the typed
+S2C mapping (the same dict passed to typsio-gen) and sent with a second argument
+``{"stream", "seq", "epoch"}``. The last ``capacity`` events of every stream are
+kept in a ring buffer. After every (re)connect the client sends the last sequence
+number it saw per stream and receives only the events it missed; if some of them
+were already evicted, or the server restarted in the meantime (different
+``epoch``), the stream is reported as needing a resync instead. The answer also
+carries the head of every stream the client can receive and a ``clock`` marking
+where all streams stood; the client sends the clock back as ``since`` on its next
+reconnect, and streams it does not report (it disconnected before their first
+event, or they did not exist yet) are replayed from that point.
+
+    replay = setup_replay(sio, SERVER_EVENTS, capacity=512)
+    await replay.emit("newNotification", Notification(...), to="team-1")
+
+Streams are per room (``scope="room"``; broadcasts go to the ``"*"`` stream) or
+per event name (``scope="event"``). Replayed events are filtered by the rooms the
+client is in when it asks, so join rooms in the ``connect`` handler. Events
+emitted to a single sid are sent without replay, since the client gets a new sid
+when it reconnects. Events emitted with ``skip_sid`` are not replayed to the
+skipped client, identified by the sid it had before reconnecting. At most
+``max_streams`` streams are kept; clients that had seen events of an evicted
+stream are asked to resync. The buffer lives in the server process; with
+several workers behind a message queue every worker keeps its own buffer and
+epoch.
+"""
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, List, Optional
+
+import socketio
+from pydantic import TypeAdapter
+
+BROADCAST_STREAM = "*"
+
+
+@dataclass
+class _Entry:
+    order: int
+    seq: int
+    event: str
+    payload: Any
+    room: Optional[str]
+    skip_sids: FrozenSet[str] = frozenset()
+
+
+class _Stream:
+    def __init__(self, capacity: int, start: int):
+        self.entries: Deque[_Entry] = deque(maxlen=capacity)
+        self.start = start
+        self.last_seq = start
+        # 最近被挤出缓冲区的事件的全局序号
+        self.evicted_order = 0
+
+    def append(self, entry: _Entry) -> None:
+        if len(self.entries) == self.entries.maxlen:
+            self.evicted_order = self.entries[0].order
+        self.entries.append(entry)
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained event (``last_seq + 1`` if empty)."""
+        return self.entries[0].seq if self.entries else self.last_seq + 1
+
+
+class S2CReplayBuffer:
+    """
+    Emits typed S2C events with sequence numbers and answers replay requests.
+
+    :param sio: The ``socketio.AsyncServer``.
+    :param events: The S2C mapping: event name -> payload type.
+    :param capacity: Number of events kept per stream.
+    :param scope: ``"room"`` for one stream per target room, ``"event"`` for one stream per event name.
+    :param replay_event_name: Event the client uses to request missed events, must match the client.
+    :param namespace: Socket.IO namespace the events are emitted on.
+    :param max_streams: Number of streams kept; the one emitted to least recently is dropped first.
+    """
+    def __init__(
+        self,
+        sio: socketio.AsyncServer,
+        events: Dict[str, Any],
+        *,
+        capacity: int = 1024,
+        scope: str = "room",
+        replay_event_name: str = "s2c_replay",
+        namespace: str = "/",
+        max_streams: int = 4096,
+    ):
+        if scope not in ("room", "event"):
+            raise ValueError(f"Unknown replay scope '{scope}', expected 'room' or 'event'.")
+        if capacity < 1 or max_streams < 1:
+            raise ValueError("Replay buffer capacity and max_streams must be at least 1.")
+        self._sio = sio
+        self._adapters = {name: TypeAdapter(py_type) for name, py_type in events.items()}
+        self.capacity = capacity
+        self.scope = scope
+        self.replay_event_name = replay_event_name
+        self.namespace = namespace
+        self.max_streams = max_streams
+        self.epoch = uuid.uuid4().hex
+        # 按最近写入排序，最久未写入的在最前
+        self._streams: "OrderedDict[str, _Stream]" = OrderedDict()
+        self._order = 0
+
+    def _stream_key(self, event: str, room: Optional[str]) -> str:
+        if self.scope == "event":
+            return event
+        return BROADCAST_STREAM if room is None else room
+
+    def record(self, event: str, payload: Any, room: Optional[str] = None, skip_sid: Any = None) -> Dict[str, Any]:
+        """
+        Validate and serialize ``payload``, append it to its stream and return
+        the metadata to send with it. ``emit`` does this; use it directly to
+        send the event through another channel. ``room`` must not be a sid.
+        """
+        return self._meta(self._record(event, self._validate(event, payload), room, skip_sid))
+
+    def _meta(self, entry: _Entry) -> Dict[str, Any]:
+        return {"stream": self._stream_key(entry.event, entry.room), "seq": entry.seq, "epoch": self.epoch}
+
+    def _validate(self, event: str, payload: Any) -> Any:
+        if event not in self._adapters:
+            raise KeyError(f"S2C event '{event}' is not in the event mapping.")
+        adapter = self._adapters[event]
+        return adapter.dump_python(adapter.validate_python(payload), mode='json')
+
+    def _record(self, event: str, payload: Any, room: Optional[str], skip_sid: Any) -> _Entry:
+        key = self._stream_key(event, room)
+        stream = self._streams.get(key)
+        if stream is None:
+            # 新流从全局计数开始编号：被淘汰后重建的流的序列号仍然递增，客户端可据此发现缺口
+            stream = self._streams[key] = _Stream(self.capacity, self._order)
+            if len(self._streams) > self.max_streams:
+                self._streams.popitem(last=False)
+        else:
+            self._streams.move_to_end(key)
+        self._order += 1
+        stream.last_seq += 1
+        if skip_sid is None:
+            skip_sids: FrozenSet[str] = frozenset()
+        else:
+            skip_sids = frozenset([skip_sid] if isinstance(skip_sid, str) else skip_sid)
+        entry = _Entry(self._order, stream.last_seq, event, payload, room, skip_sids)
+        stream.append(entry)
+        return entry
+
+    def _is_sid(self, to: str) -> bool:
+        manager = getattr(self._sio, "manager", None)
+        return manager is not None and manager.eio_sid_from_sid(to, self.namespace) is not None
+
+    async def emit(self, event: str, payload: Any, *, to: Optional[str] = None, skip_sid: Any = None) -> Optional[int]:
+        """
+        Emit an S2C event to ``to`` (a room or sid; everyone if None) and keep it for replay.
+
+        :return: The sequence number of the event within its stream, or None
+            for an event sent to a single sid, which is not kept.
+        """
+        payload = self._validate(event, payload)
+        if to is not None and self._is_sid(to):
+            # 客户端重连后 sid 会改变，发往单个 sid 的事件无法重放
+            await self._sio.emit(event, payload, to=to, skip_sid=skip_sid, namespace=self.namespace)
+            return None
+        entry = self._record(event, payload, to, skip_sid)
+        await self._sio.emit(event, (entry.payload, self._meta(entry)), to=to, skip_sid=skip_sid, namespace=self.namespace)
+        return entry.seq
+
+    def missed_events(
+        self,
+        rooms: List[str],
+        epoch: Optional[str],
+        streams: Dict[str, int],
+        previous_sid: Optional[str] = None,
+        since: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute the replay answer for a client.
+
+        :param rooms: Rooms the client is currently in.
+        :param epoch: Epoch of the sequence numbers the client saw.
+        :param streams: Stream -> last sequence number seen.
+        :param previous_sid: The sid the client had before reconnecting; events
+            emitted with ``skip_sid`` naming it are not replayed.
+        :param since: The ``clock`` of the client's previous replay answer, i.e.
+            where every stream stood when it last connected. Streams the client
+            can receive but does not report are treated as seen up to that point;
+            without it they are treated as seen up to their current head.
+        :return: ``{"epoch", "events": [{"event", "payload", "meta"}], "resync": [stream, ...],
+            "heads": {stream: seq}, "clock"}``
+        """
+        member_of = set(rooms)
+        if self.scope == "room":
+            keys = {BROADCAST_STREAM} | {room for room in member_of if room in self._streams or room in streams}
+        else:
+            keys = set(self._streams) | (set(streams) & set(self._adapters))
+        answer: Dict[str, Any] = {
+            "epoch": self.epoch,
+            "events": [],
+            "resync": [],
+            "heads": {key: self._streams[key].last_seq for key in sorted(keys) if key in self._streams},
+            "clock": self._order,
+        }
+        if epoch != self.epoch:
+            # 服务器已重启，旧的序列号没有意义
+            answer["resync"] = sorted(streams)
+            return answer
+
+        if not isinstance(since, int) or isinstance(since, bool):
+            since = None
+        resync: List[str] = []
+        missed: List[_Entry] = []
+        for key in keys:
+            stream = self._streams.get(key)
+            last_seen = streams.get(key)
+            if not isinstance(last_seen, int) or isinstance(last_seen, bool) or last_seen <= 0:
+                # 客户端没有见过该流的事件：视为已看到上次连接时的位置
+                if stream is None or since is None:
+                    continue
+                if stream.evicted_order > since:
+                    resync.append(key)
+                    continue
+                candidates = [entry for entry in stream.entries if entry.order > since]
+            elif stream is None or last_seen < stream.start:
+                # 客户端见过的流已被淘汰（可能已重建），无法判断错过了哪些事件
+                resync.append(key)
+                continue
+            elif last_seen + 1 < stream.first_seq:
+                resync.append(key)
+                continue
+            else:
+                candidates = [entry for entry in stream.entries if entry.seq > last_seen]
+            for entry in candidates:
+                if (entry.room is None or entry.room in member_of) and previous_sid not in entry.skip_sids:
+                    missed.append(entry)
+
+        missed.sort(key=lambda e: e.order)
+        answer["events"] = [{"event": e.event, "payload": e.payload, "meta": self._meta(e)} for e in missed]
+        answer["resync"] = sorted(resync)
+        return answer
+
+    async def _handle_replay(self, sid: str, data: Any = None) -> Dict[str, Any]:
+        data = data if isinstance(data, dict) else {}
+        streams = data.get("streams") if isinstance(data.get("streams"), dict) else {}
+        previous_sid = data.get("sid") if isinstance(data.get("sid"), str) else None
+        rooms = self._sio.rooms(sid, namespace=self.namespace)
+        return self.missed_events(rooms, data.get("epoch"), streams, previous_sid, data.get("since"))
+
+    def attach_to_server(self) -> None:
+        self._sio.on(self.replay_event_name, self._handle_replay, namespace=self.namespace)
+
+
+def setup_replay(sio: socketio.AsyncServer, events: Dict[str, Any], **kwargs: Any) -> S2CReplayBuffer:
+    """
+    Create an ``S2CReplayBuffer`` for the S2C mapping ``events`` and attach its
+    replay handler to the server. Keyword arguments go to ``S2CReplayBuffer``.
+    """
+    buffer = S2CReplayBuffer(sio, events, **kwargs)
+    buffer.attach_to_server()
+    return buffer
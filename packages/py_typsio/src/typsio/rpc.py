@@ -1,9 +1,28 @@
 # packages/py_typsio/src/typsio/rpc.py
 import asyncio
+import time
 from inspect import iscoroutinefunction, signature, Parameter
-from typing import Dict, Any, Callable, Type, Set
+from typing import Dict, Any, Callable, List, Tuple, Type, Set, Optional, Union
 import socketio
-from pydantic import BaseModel, ValidationError
+from socketio import packet as sio_packet
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, create_model
+from pydantic_core import to_json, to_jsonable_python
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+try:
+    from typing import Annotated, Literal
+except ImportError:
+    from typing_extensions import Annotated, Literal
+
+from .codec import JSONCodec, RawJSON, make_packet_class
+from .cursor import CursorError, CursorOptions, CursorTable
+from .projection import IncEx, ProjectionCache, ProjectionError
+from .tracing import CallTrace, RPCTracer, summarize_args
+from .upload import UploadError, UploadStore
+
+# 将函数结果转换为可发送的形式：(结果, 投影) -> 转换后的结果
+Serializer = Callable[[Any, Optional[Dict[str, Optional[IncEx]]]], Any]
+
 
 class RPCRegistry:
     """
@@ -13,6 +32,7 @@ class RPCRegistry:
     def __init__(self):
         self.functions: Dict[str, Callable] = {}
         self.models: Set[Type[BaseModel]] = set()
+        self.cursors: Dict[str, CursorOptions] = {}
 
     def _add_model_from_type(self, py_type: Any):
         """递归地从类型提示中提取并注册 Pydantic 模型。"""
@@ -42,66 +62,492 @@ class RPCRegistry:
             
         return func
 
-class _RPCHandler:
-    """内部 RPC 处理器，将注册表中的函数应用到 Socket.IO 服务器。"""
-    def __init__(self, sio: socketio.AsyncServer, registry: RPCRegistry, rpc_event_name: str, response_event_name: str):
-        self._sio = sio
+    def register_cursor(self, page_size: int = 100, *, max_page_size: int = 1000, snapshot: bool = False) -> Callable[[Callable], Callable]:
+        """
+        一个装饰器工厂，将返回可迭代对象（列表、生成器、异步生成器等）的函数注册为游标函数。
+        调用时只返回第一页与游标句柄，之后的页面通过调用游标获取，见 `typsio.cursor`。
+
+        :param page_size: 默认每页的项数。
+        :param max_page_size: 客户端可请求的每页最大项数。
+        :param snapshot: 是否在打开游标时物化全部结果，以支持任意方向的跳转并提供总数。
+        """
+        if page_size < 1 or max_page_size < page_size:
+            raise ValueError("page_size must be at least 1 and at most max_page_size.")
+        options = CursorOptions(page_size=page_size, max_page_size=max_page_size, snapshot=snapshot)
+
+        def decorator(func: Callable) -> Callable:
+            self.register(func)
+            self.cursors[func.__name__] = options
+            return func
+
+        return decorator
+
+class RPCDispatcher:
+    """
+    与传输层无关的 RPC 调度器：负责参数验证、调用函数以及序列化结果。
+
+    Socket.IO、进程内以及 Unix 域套接字等传输方式共享同一个调度器，
+    因此它们的验证与错误语义完全一致。
+
+    :param tracer: 可选的 `RPCTracer`，用于记录慢调用并按需采集 cProfile 数据。
+    :param codec: `handle_raw` 使用的 JSON 编解码器，默认为标准库 json。
+    :param uploads: 可选的 `UploadStore`，用于解析以分块上传方式发送参数的调用。
+    :param cursors: 保存游标函数打开的游标的 `CursorTable`，未指定时使用默认配置创建。
+
+    调用信封可以携带 ``"projection": {"include": [...], "exclude": [...]}``，
+    在序列化结果时只输出客户端选择的字段，见 `typsio.projection`。
+    """
+    def __init__(self, registry: RPCRegistry, tracer: Optional[RPCTracer] = None, codec: Optional[JSONCodec] = None, uploads: Optional[UploadStore] = None, cursors: Optional[CursorTable] = None):
         self._functions = registry.functions
-        self._rpc_event_name = rpc_event_name
-        self._response_event_name = response_event_name
+        self._cursor_options = registry.cursors
+        self.cursors = cursors if cursors is not None else CursorTable()
+        self.tracer = tracer
+        self.codec = codec or JSONCodec()
+        self.uploads = uploads
+        self.projections = ProjectionCache()
+        self._call_adapter: Optional[TypeAdapter] = None
+        self._call_adapter_functions: Optional[Tuple[str, ...]] = None
+        self._args_adapters: Dict[Callable, TypeAdapter] = {}
+
+    async def dispatch(self, sid: str, data: Dict[str, Any], *, serialize: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        处理一次调用，返回响应负载；调用信封无效时返回 None（不作响应）。
+
+        :param serialize: 是否将 Pydantic 结果转换为 JSON 兼容的数据。
+            进程内传输无需跨越序列化边界，可以直接返回模型实例。
+            携带投影的调用总是被序列化。
+        """
+        return await self._dispatch(sid, data, self._serialize if serialize else None)
+
+    async def _dispatch(self, sid: str, data: Dict[str, Any], serializer: Optional[Serializer], parse_seconds: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        `dispatch` 的实现。
 
-    async def _handle_rpc_call(self, sid: str, data: Dict[str, Any]):
+        :param serializer: 转换结果的函数，例如快速路径直接编码为 JSON 文本；None 时返回原始结果。
+        :param parse_seconds: 调用到达前解析与验证 JSON 文本所用的时间，计入 ``validate`` 阶段。
+        """
         call_id = data.get("call_id")
         function_name = data.get("function_name")
         args = data.get("args", [])
 
         if not all([call_id, function_name]):
-            return
+            return None
 
         if function_name not in self._functions:
-            await self._sio.emit(self._response_event_name, {"call_id": call_id, "error": f"RPC Error: Function '{function_name}' not found."}, to=sid)
-            return
+            return {"call_id": call_id, "error": f"RPC Error: Function '{function_name}' not found."}
+
+        try:
+            projection = self._resolve_projection(function_name, data.get("projection"))
+        except ProjectionError as e:
+            return {"call_id": call_id, "error": f"RPC Error: Invalid projection: {e}"}
+        if serializer is None and projection is not None:
+            serializer = self._serialize
+
+        if self.tracer is not None:
+            return await self._dispatch_traced(sid, call_id, function_name, args, serializer, projection, parse_seconds)
 
-        func = self._functions[function_name]
         try:
-            sig = signature(func)
-            bound_args = {}
-            func_params = list(sig.parameters.values())
-
-            # 自动 Pydantic 模型验证
-            for i, arg_val in enumerate(args):
-                if i < len(func_params):
-                    param = func_params[i]
-                    if isinstance(param.annotation, type) and issubclass(param.annotation, BaseModel):
-                        bound_args[param.name] = param.annotation.model_validate(arg_val)
-                    else:
-                        bound_args[param.name] = arg_val
+            result = await self._execute(sid, function_name, args, serializer, projection)
+        except Exception as e:
+            return self._failure(call_id, e)
+        return self._success(call_id, function_name, result)
+
+    async def _execute(
+        self,
+        sid: str,
+        function_name: str,
+        args: List[Any],
+        serializer: Optional[Serializer],
+        projection: Optional[Dict[str, Optional[IncEx]]],
+        next_phase: Callable[[str], None] = lambda name: None,
+    ) -> Any:
+        """绑定参数、执行函数并按需序列化结果；异常由调用方通过 `_failure` 转换为错误响应。"""
+        func = self._functions[function_name]
+        bound_args = self._bind_args(func, args)
+        next_phase("execute")
+        result = await func(**bound_args) if iscoroutinefunction(func) else func(**bound_args)
+        if function_name in self._cursor_options:
+            result = await self.cursors.open(sid, function_name, result, self._cursor_options[function_name])
+        if serializer is not None:
+            next_phase("serialize")
+            result = serializer(result, projection)
+        return result
+
+    @staticmethod
+    def _failure(call_id: Any, error: Exception) -> Dict[str, Any]:
+        if isinstance(error, (ValidationError, TypeError)):
+            return {"call_id": call_id, "error": f"Argument validation failed: {error}"}
+        return {"call_id": call_id, "error": f"RPC Execution Error: {error}"}
+
+    def _success(self, call_id: Any, function_name: str, result: Any) -> Dict[str, Any]:
+        response = {"call_id": call_id, "result": result, "error": None}
+        if function_name in self._cursor_options:
+            # 标记结果为游标页面，客户端据此包装为游标对象
+            response["cursor"] = True
+        return response
+
+    def _resolve_projection(self, function_name: str, projection: Any) -> Optional[Dict[str, Optional[IncEx]]]:
+        """将信封中的投影编译为序列化器的 include/exclude 参数；未指定投影时返回 None。"""
+        if projection is None:
+            return None
+        compiled = self.projections.get(function_name, self._functions[function_name], projection)
+        if function_name not in self._cursor_options:
+            return compiled
+        # 游标函数的结果是页面，投影作用于其中的每一项
+        include, exclude = compiled["include"], compiled["exclude"]
+        if include is not None:
+            include = {"items": include if "__all__" in include else {"__all__": include}, "cursor": True, "offset": True, "has_more": True, "total": True}
+        if exclude is not None:
+            exclude = {"items": exclude if "__all__" in exclude else {"__all__": exclude}}
+        return {"include": include, "exclude": exclude}
+
+    @staticmethod
+    def _serialize(result: Any, projection: Optional[Dict[str, Optional[IncEx]]]) -> Any:
+        # 同时处理嵌套在列表、字典中的模型，例如 List[MyModel]；未选择的字段不会被序列化
+        if projection is None:
+            return to_jsonable_python(result)
+        return to_jsonable_python(result, **projection)
+
+    @staticmethod
+    def _encode(result: Any, projection: Optional[Dict[str, Optional[IncEx]]]) -> str:
+        # 快速路径：结果直接编码为 JSON 文本，投影在编码时应用
+        return to_json(result, **(projection or {})).decode('utf-8')
+
+    @staticmethod
+    def _bind_args(func: Callable, args: List[Any]) -> Dict[str, Any]:
+        sig = signature(func)
+        bound_args = {}
+        func_params = list(sig.parameters.values())
+
+        # 自动 Pydantic 模型验证
+        for i, arg_val in enumerate(args):
+            if i < len(func_params):
+                param = func_params[i]
+                if isinstance(param.annotation, type) and issubclass(param.annotation, BaseModel):
+                    bound_args[param.name] = param.annotation.model_validate(arg_val)
                 else:
-                    # 处理 *args 的情况，虽然在此 RPC 设计中不常见
-                    pass
+                    bound_args[param.name] = arg_val
+            else:
+                # 处理 *args 的情况，虽然在此 RPC 设计中不常见
+                pass
+        return bound_args
 
-            result = await func(**bound_args) if iscoroutinefunction(func) else func(**bound_args)
-            
-            if isinstance(result, BaseModel):
-                result = result.model_dump(mode='json')
+    async def _dispatch_traced(
+        self,
+        sid: str,
+        call_id: Any,
+        function_name: str,
+        args: List[Any],
+        serializer: Optional[Serializer],
+        projection: Optional[Dict[str, Optional[IncEx]]] = None,
+        parse_seconds: float = 0.0,
+    ) -> Dict[str, Any]:
+        """与 `dispatch` 语义相同，但记录各阶段耗时，并在需要时启用 cProfile。"""
+        tracer = self.tracer
+        started_at = time.time() - parse_seconds
+        # 快速路径中 JSON 文本的解析与验证在分发之前完成
+        phases: Dict[str, float] = {"validate": parse_seconds}
+        error: Optional[BaseException] = None
+        profiler = tracer.start_profile(function_name)
+
+        phase, phase_start = "validate", time.perf_counter()
+
+        def next_phase(name: str) -> None:
+            nonlocal phase, phase_start
+            now = time.perf_counter()
+            phases[phase] = phases.get(phase, 0.0) + now - phase_start
+            phase, phase_start = name, now
+
+        try:
+            result = await self._execute(sid, function_name, args, serializer, projection, next_phase)
+            response = self._success(call_id, function_name, result)
+        except Exception as e:
+            error = e
+            response = self._failure(call_id, e)
+        finally:
+            # 结束当前阶段（包括失败的阶段）的计时
+            phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - phase_start
+            if profiler is not None:
+                tracer.finish_profile(function_name, profiler)
+
+        total = sum(phases.values())
+        if tracer.is_slow(function_name, total):
+            tracer.record(CallTrace(
+                function_name=function_name,
+                sid=sid,
+                call_id=call_id,
+                started_at=started_at,
+                total_seconds=total,
+                phases=phases,
+                args=summarize_args(args),
+                error=repr(error) if error is not None else None,
+            ))
+        return response
 
-            await self._sio.emit(self._response_event_name, {"call_id": call_id, "result": result, "error": None}, to=sid)
-        except (ValidationError, TypeError) as e:
-            await self._sio.emit(self._response_event_name, {"call_id": call_id, "error": f"Argument validation failed: {e}"}, to=sid)
+    def _get_call_adapter(self) -> TypeAdapter:
+        """
+        为注册表构建一个 TypeAdapter，一次性从 JSON 文本验证调用信封及其参数：
+        按 function_name 区分的联合类型，参数为对应函数的参数元组。
+        """
+        functions = tuple(self._functions)
+        if self._call_adapter is None or self._call_adapter_functions != functions:
+            envelopes = []
+            for name, func in self._functions.items():
+                envelopes.append(create_model(
+                    f"_{name}_call",
+                    call_id=(Any, ...),
+                    function_name=(Literal[name], ...),
+                    args=(self._args_type(func), ...),
+                    projection=(Any, None),
+                ))
+            if len(envelopes) > 1:
+                call_type: Any = Annotated[Union[tuple(envelopes)], Field(discriminator="function_name")]
+            elif envelopes:
+                call_type = envelopes[0]
+            else:
+                call_type = None
+            batch_type = create_model("_batch_call", batch=(List[call_type], ...)) if call_type else None
+            self._call_adapter = TypeAdapter(Union[call_type, batch_type] if call_type else None)
+            self._call_adapter_functions = functions
+        return self._call_adapter
+
+    @staticmethod
+    def _args_type(func: Callable) -> Any:
+        # 与 _bind_args 一致：仅验证 Pydantic 模型参数，其余参数原样传递
+        params = tuple(
+            p.annotation if isinstance(p.annotation, type) and issubclass(p.annotation, BaseModel) else Any
+            for p in signature(func).parameters.values()
+        )
+        return Tuple[params] if params else Tuple[()]
+
+    def _parse_uploaded_args(self, function_name: str, args_text: bytes) -> List[Any]:
+        """
+        从上传的 JSON 文本解析参数列表。
+
+        :raises ValueError: 文本不是单个 JSON 数组。
+        """
+        func = self._functions[function_name]
+        adapter = self._args_adapters.get(func)
+        if adapter is None:
+            adapter = self._args_adapters[func] = TypeAdapter(self._args_type(func))
+        try:
+            return list(adapter.validate_json(args_text))
+        except ValidationError:
+            # 参数不符合签名：按普通路径解码，由 dispatch 给出与其他调用一致的错误
+            pass
+        args = self.codec.loads(args_text)
+        if not isinstance(args, list):
+            raise ValueError("expected a JSON array")
+        return args
+
+    async def handle_raw(self, sid: str, raw: RawJSON, *, encode: bool = True) -> Union[RawJSON, Dict[str, Any], None]:
+        """
+        处理以 JSON 文本形式到达的调用信封或批量信封。
+
+        信封与参数在一次 ``validate_json`` 中完成解析与验证，响应直接由序列化后的结果拼接而成。
+        信封无法通过快速路径验证时（函数不存在、参数数量或类型不符等），
+        退回到 `handle`，因此错误语义与普通路径完全一致。
+
+        :param encode: 为 False 时以字典形式返回响应，供未安装编解码器的 Socket.IO 服务器发送。
+        """
+        parse_start = time.perf_counter()
+        try:
+            call = self._get_call_adapter().validate_json(raw.text)
+        except ValidationError:
+            call = None
+        parse_seconds = time.perf_counter() - parse_start
+        if call is None:
+            try:
+                data = self.codec.loads(raw.text)
+            except ValueError:
+                return None
+            return await self.handle(sid, data)
+
+        if hasattr(call, "batch"):
+            # 批量中的每个调用都等待了整个批量的解析
+            responses = await asyncio.gather(*(self._dispatch_validated(sid, c, encode, parse_seconds) for c in call.batch))
+            if not encode:
+                return {"responses": [r for r in responses if r is not None]}
+            return RawJSON('{"responses":[' + ",".join(r.text for r in responses if r is not None) + ']}')
+        return await self._dispatch_validated(sid, call, encode, parse_seconds)
+
+    async def _dispatch_validated(self, sid: str, call: BaseModel, encode: bool = True, parse_seconds: float = 0.0) -> Union[RawJSON, Dict[str, Any], None]:
+        # 参数已验证为模型实例，_bind_args 中的 model_validate 会直接复用它们
+        data = {"call_id": call.call_id, "function_name": call.function_name, "args": list(call.args)}
+        if call.projection is not None:
+            data["projection"] = call.projection
+        if not encode:
+            return await self._dispatch(sid, data, self._serialize, parse_seconds)
+        # 结果在 serialize 阶段直接编码为 JSON 文本，未选择的字段不会被序列化
+        response = await self._dispatch(sid, data, self._encode, parse_seconds)
+        if response is None:
+            return None
+        call_id = self.codec.dumps(call.call_id)
+        if response.get("error"):
+            return RawJSON(f'{{"call_id":{call_id},"error":{self.codec.dumps(response["error"])}}}')
+        cursor = ',"cursor":true' if response.get("cursor") else ''
+        return RawJSON(f'{{"call_id":{call_id},"result":{response["result"]},"error":null{cursor}}}')
+
+    async def handle(self, sid: str, data: Dict[str, Any], *, serialize: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        处理一个调用信封或批量信封 ``{"batch": [...]}``。
+
+        批量调用会并发执行，所有响应合并为一个 ``{"responses": [...]}`` 负载返回。
+        """
+        if isinstance(data, dict) and isinstance(data.get("batch"), list):
+            responses = await asyncio.gather(
+                *(self._handle_call(sid, call, serialize) for call in data["batch"] if isinstance(call, dict))
+            )
+            return {"responses": [r for r in responses if r is not None]}
+        if not isinstance(data, dict):
+            return None
+        return await self._handle_call(sid, data, serialize)
+
+    async def _handle_call(self, sid: str, data: Dict[str, Any], serialize: bool) -> Optional[Dict[str, Any]]:
+        if "upload_id" in data and "args" not in data:
+            return await self._handle_upload_call(sid, data)
+        if "cursor" in data and "args" not in data:
+            return await self._handle_cursor_call(sid, data, serialize)
+        return await self.dispatch(sid, data, serialize=serialize)
+
+    async def _handle_cursor_call(self, sid: str, data: Dict[str, Any], serialize: bool) -> Optional[Dict[str, Any]]:
+        """获取游标的下一页、跳转或关闭游标。"""
+        call_id = data.get("call_id")
+        function_name = data.get("function_name")
+        if not all([call_id, function_name]):
+            return None
+        if function_name not in self._functions:
+            return {"call_id": call_id, "error": f"RPC Error: Function '{function_name}' not found."}
+        if function_name not in self._cursor_options:
+            return {"call_id": call_id, "error": f"RPC Error: Function '{function_name}' does not return a cursor."}
+        try:
+            projection = self._resolve_projection(function_name, data.get("projection"))
+        except ProjectionError as e:
+            return {"call_id": call_id, "error": f"RPC Error: Invalid projection: {e}"}
+        try:
+            page = await self.cursors.fetch(sid, function_name, data["cursor"], self._cursor_options[function_name])
+        except CursorError as e:
+            return {"call_id": call_id, "error": f"RPC Error: {e}"}
         except Exception as e:
-            await self._sio.emit(self._response_event_name, {"call_id": call_id, "error": f"RPC Execution Error: {e}"}, to=sid)
+            return {"call_id": call_id, "error": f"RPC Execution Error: {e}"}
+        if page is not None and (serialize or projection is not None):
+            page = self._serialize(page, projection)
+        return self._success(call_id, function_name, page)
+
+    async def _handle_upload_call(self, sid: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """处理参数已通过分块上传发送的调用：直接从重组后的 JSON 文本验证参数。"""
+        call_id = data.get("call_id")
+        function_name = data.get("function_name")
+        if not all([call_id, function_name]):
+            return None
+        if self.uploads is None:
+            return {"call_id": call_id, "error": "RPC Error: Chunked uploads are not enabled."}
+        try:
+            args_text = self.uploads.take(sid, data["upload_id"], function_name, data.get("chunks"))
+        except UploadError as e:
+            return {"call_id": call_id, "error": f"RPC Error: {e}"}
+        if function_name not in self._functions:
+            return {"call_id": call_id, "error": f"RPC Error: Function '{function_name}' not found."}
+        try:
+            args = self._parse_uploaded_args(function_name, args_text)
+        except ValueError as e:
+            return {"call_id": call_id, "error": f"RPC Error: Uploaded arguments are not a JSON array: {e}"}
+        call = {"call_id": call_id, "function_name": function_name, "args": args}
+        if data.get("projection") is not None:
+            call["projection"] = data["projection"]
+        return await self.dispatch(sid, call)
+
+    def handle_upload_chunk(self, sid: str, data: Any) -> Dict[str, Any]:
+        """处理一个上传分块，返回作为 ack 的 ``{"ok": True}`` 或 ``{"error": ...}``。"""
+        if self.uploads is None:
+            return {"error": "RPC Error: Chunked uploads are not enabled."}
+        if not isinstance(data, dict) or not isinstance(data.get("upload_id"), str) or not isinstance(data.get("seq"), int):
+            return {"error": "RPC Error: Invalid upload chunk."}
+        function_name = data.get("function_name")
+        if data["seq"] == 0 and function_name is not None and function_name not in self._functions:
+            # 在接收数据之前拒绝调用不存在函数的上传
+            return {"error": f"RPC Error: Function '{function_name}' not found."}
+        try:
+            self.uploads.add_chunk(
+                sid, data["upload_id"], data["seq"], data.get("data"),
+                function_name=function_name, size=data.get("size"),
+            )
+        except UploadError as e:
+            return {"error": f"RPC Error: {e}"}
+        return {"ok": True}
+
+
+class _RPCHandler:
+    """内部 RPC 处理器，将注册表中的函数应用到 Socket.IO 服务器。"""
+    def __init__(self, sio: socketio.AsyncServer, registry: RPCRegistry, rpc_event_name: str, response_event_name: str, tracer: Optional[RPCTracer] = None, codec: Optional[JSONCodec] = None, uploads: Optional[UploadStore] = None, cursors: Optional[CursorTable] = None):
+        self._sio = sio
+        self._dispatcher = RPCDispatcher(registry, tracer, codec, uploads, cursors)
+        self._codec = codec
+        self._uploads = uploads
+        self._rpc_event_name = rpc_event_name
+        self._response_event_name = response_event_name
+        self._encode = True
+
+    async def _handle_rpc_call(self, sid: str, data: Union[Dict[str, Any], RawJSON], *extra: Any):
+        # 多余的事件参数被忽略，无论是否安装了编解码器
+        if isinstance(data, RawJSON):
+            response = await self._dispatcher.handle_raw(sid, data, encode=self._encode)
+            if response is None:
+                response = await self._handle_packed_args(sid, data)
+        else:
+            response = await self._dispatcher.handle(sid, data)
+        if response is not None:
+            await self._sio.emit(self._response_event_name, response, to=sid)
+
+    async def _handle_packed_args(self, sid: str, raw: RawJSON) -> Optional[Dict[str, Any]]:
+        """数据包带有多个参数时，RawJSON 中是逗号分隔的多个值；按普通方式解码并处理第一个参数。"""
+        try:
+            args = self._codec.loads(f"[{raw.text}]")
+        except ValueError:
+            return None
+        if len(args) < 2:
+            return None
+        return await self._dispatcher.handle(sid, args[0])
+
+    async def _handle_capabilities(self, sid: str, data: Any = None) -> Dict[str, Any]:
+        # 客户端通过 ack 查询服务器支持的可选功能
+        capabilities: Dict[str, Any] = {"batch": True}
+        if self._uploads is not None:
+            capabilities["upload"] = {"max_size": self._uploads.max_size}
+        return capabilities
+
+    async def _handle_upload_chunk(self, sid: str, data: Any = None) -> Dict[str, Any]:
+        return self._dispatcher.handle_upload_chunk(sid, data)
 
     def attach_to_server(self):
+        if self._codec is not None:
+            if not issubclass(self._sio.packet_class, sio_packet.Packet):
+                raise ValueError("A JSON codec can only be installed on servers using the JSON serializer.")
+            self._sio.packet_class = make_packet_class(self._sio.packet_class, self._codec, self._rpc_event_name)
+            # 发布/订阅管理器用自己的 json 模块在进程间转发数据包，无法编码 RawJSON，响应改以字典形式发送
+            self._encode = not isinstance(getattr(self._sio, "manager", None), AsyncPubSubManager)
         self._sio.on(self._rpc_event_name, self._handle_rpc_call)
+        self._sio.on(f"{self._rpc_event_name}_capabilities", self._handle_capabilities)
+        if self._uploads is not None:
+            self._sio.on(f"{self._rpc_event_name}_upload", self._handle_upload_chunk)
 
-def setup_rpc(sio: socketio.AsyncServer, registry: RPCRegistry, rpc_event_name: str = 'rpc_call') -> None:
+def setup_rpc(sio: socketio.AsyncServer, registry: RPCRegistry, rpc_event_name: str = 'rpc_call', *, tracer: Optional[RPCTracer] = None, codec: Optional[JSONCodec] = None, uploads: Optional[UploadStore] = None, cursors: Optional[CursorTable] = None) -> None:
     """
     将 RPCRegistry 中定义的所有函数附加到 Socket.IO 服务器。
 
     :param sio: `python-socketio` 的 AsyncServer 实例。
     :param registry: 包含已注册 RPC 函数的 `RPCRegistry` 实例。
     :param rpc_event_name: 用于 RPC 调用的事件名称，必须与客户端匹配。
+    :param tracer: 可选的 `RPCTracer`。保留其引用即可在运行时调整阈值、查询慢调用日志或开启 cProfile 采样。
+    :param codec: 可选的 `JSONCodec`（例如 `typsio.codec.default_codec()`）。指定后，服务器使用该编解码器处理数据包，
+        RPC 调用直接从原始 JSON 文本验证参数，响应由预先序列化的结果编码，避免对大型参数的二次解析与复制。
+        使用发布/订阅客户端管理器（如 `AsyncRedisManager`）时，响应仍以字典形式经由管理器转发。
+    :param uploads: 可选的 `UploadStore`。指定后，客户端可以将较大的参数分块上传，
+        避免单个数据包超过 `max_http_buffer_size` 并阻塞同一连接上的其他调用。
+        未完成的上传在空闲 `timeout` 秒后才会被清理；保留其引用并在 `disconnect` 处理函数中调用 `discard_sid` 可立即释放。
+    :param cursors: 可选的 `CursorTable`，用于调整游标函数打开的游标的数量上限与过期时间；
+        保留其引用即可在客户端断开连接时调用 `discard_sid` 立即释放其游标。
     """
     response_event_name = f"{rpc_event_name}_response"
-    handler = _RPCHandler(sio, registry, rpc_event_name, response_event_name)
+    handler = _RPCHandler(sio, registry, rpc_event_name, response_event_name, tracer, codec, uploads, cursors)
     handler.attach_to_server()
@@ -0,0 +1,216 @@
+# packages/py_typsio/src/typsio/tracing.py
+"""
+Slow-call tracing and on-demand profiling for RPC functions.
+
+Pass an ``RPCTracer`` to ``setup_rpc`` (or ``RPCDispatcher``) and keep a reference
+to it; thresholds, the slow-call log and profiling can then be changed and
+queried while the server is running:
+
+    tracer = RPCTracer(threshold=0.2)
+    setup_rpc(sio, registry, tracer=tracer)
+
+    tracer.set_threshold("export_report", 5.0)
+    tracer.slow_calls("get_user")                 # newest first
+    tracer.profile("get_user", calls=20, output_dir="profiles")
+"""
+import cProfile
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from pydantic_core import to_json
+
+
+@dataclass
+class ArgSummary:
+    """Size summary of one call argument."""
+    type: str
+    length: Optional[int] = None
+    """``len()`` of the argument, if it has one."""
+    json_bytes: Optional[int] = None
+    """Size of the argument encoded as JSON, if it can be encoded."""
+
+
+@dataclass
+class CallTrace:
+    """One entry of the slow-call log."""
+    function_name: str
+    sid: str
+    call_id: Any
+    started_at: float
+    """Wall clock time (``time.time()``) when the call was received."""
+    total_seconds: float
+    phases: Dict[str, float] = field(default_factory=dict)
+    """Seconds spent in each phase: ``validate``, ``execute`` and ``serialize``."""
+    args: List[ArgSummary] = field(default_factory=list)
+    error: Optional[str] = None
+    """``repr`` of the exception raised by the call, if any."""
+
+
+def summarize_args(args: Sequence[Any]) -> List[ArgSummary]:
+    summaries = []
+    for arg in args:
+        try:
+            length: Optional[int] = len(arg)
+        except TypeError:
+            length = None
+        try:
+            json_bytes: Optional[int] = len(to_json(arg))
+        except Exception:
+            json_bytes = None
+        summaries.append(ArgSummary(type(arg).__name__, length, json_bytes))
+    return summaries
+
+
+@dataclass
+class _ProfileRequest:
+    function_name: str
+    remaining: int
+    every: int
+    output_dir: str
+    seen: int = 0
+
+
+class RPCTracer:
+    """
+    Records slow RPC calls into a bounded ring buffer and captures ``cProfile``
+    data for selected functions.
+
+    :param threshold: Calls taking at least this many seconds are logged.
+        ``None`` disables logging except for functions with their own threshold.
+    :param thresholds: Per-function thresholds, overriding ``threshold``.
+    :param capacity: Maximum number of slow calls kept; the oldest are dropped first.
+    :param max_dumps: Maximum number of pstats file paths remembered by
+        ``dumped_profiles``; the oldest are forgotten first (the files are kept).
+    """
+    def __init__(
+        self,
+        threshold: Optional[float] = 1.0,
+        *,
+        thresholds: Optional[Dict[str, float]] = None,
+        capacity: int = 256,
+        max_dumps: int = 256,
+    ):
+        self.threshold = threshold
+        self._thresholds: Dict[str, Optional[float]] = dict(thresholds or {})
+        self._log: Deque[CallTrace] = deque(maxlen=capacity)
+        self._profiles: Dict[str, _ProfileRequest] = {}
+        self._profiling = False
+        # (函数名, pstats 路径)，与慢调用日志一样有界
+        self._dumps: Deque[Tuple[str, str]] = deque(maxlen=max_dumps)
+        self._dump_counter = itertools.count()
+        self._lock = threading.Lock()
+
+    # --- 慢调用日志 ---
+
+    def set_threshold(self, function_name: str, seconds: Optional[float]) -> None:
+        """Set the threshold of one function. ``None`` disables logging for it."""
+        self._thresholds[function_name] = seconds
+
+    def reset_threshold(self, function_name: str) -> None:
+        """Make a function use the default threshold again."""
+        self._thresholds.pop(function_name, None)
+
+    def threshold_for(self, function_name: str) -> Optional[float]:
+        return self._thresholds.get(function_name, self.threshold)
+
+    def set_capacity(self, capacity: int) -> None:
+        """Resize the ring buffer, keeping the newest entries."""
+        with self._lock:
+            self._log = deque(self._log, maxlen=capacity)
+
+    def slow_calls(self, function_name: Optional[str] = None, limit: Optional[int] = None) -> List[CallTrace]:
+        """Logged slow calls, newest first, optionally filtered by function."""
+        with self._lock:
+            entries = list(self._log)
+        entries.reverse()
+        if function_name is not None:
+            entries = [e for e in entries if e.function_name == function_name]
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._log.clear()
+
+    def is_slow(self, function_name: str, seconds: float) -> bool:
+        threshold = self.threshold_for(function_name)
+        return threshold is not None and seconds >= threshold
+
+    def record(self, trace: CallTrace) -> None:
+        with self._lock:
+            self._log.append(trace)
+
+    # --- cProfile ---
+
+    def profile(self, function_name: str, calls: int = 10, *, every: int = 1, output_dir: str = ".") -> None:
+        """
+        Profile the next ``calls`` sampled calls of ``function_name`` and dump one
+        ``pstats`` file per call into ``output_dir``.
+
+        :param every: Sample one out of every ``every`` calls.
+
+        The profiler is process-wide, so for coroutines it also sees other work
+        the event loop runs while the call is suspended. Only one call is profiled
+        at a time; calls arriving while another one is being profiled are not sampled.
+        """
+        if calls < 1 or every < 1:
+            raise ValueError("calls and every must be at least 1.")
+        with self._lock:
+            self._profiles[function_name] = _ProfileRequest(function_name, calls, every, output_dir)
+
+    def cancel_profile(self, function_name: str) -> None:
+        with self._lock:
+            self._profiles.pop(function_name, None)
+
+    def profiling(self) -> Dict[str, int]:
+        """Functions currently armed for profiling and the number of calls left."""
+        with self._lock:
+            return {name: req.remaining for name, req in self._profiles.items()}
+
+    def dumped_profiles(self, function_name: str) -> List[str]:
+        """Paths of the most recent pstats files written for ``function_name``, oldest first."""
+        with self._lock:
+            return [path for name, path in self._dumps if name == function_name]
+
+    def start_profile(self, function_name: str) -> Optional[cProfile.Profile]:
+        """Return an enabled profiler if this call of ``function_name`` is sampled."""
+        if function_name not in self._profiles:
+            return None
+        with self._lock:
+            req = self._profiles.get(function_name)
+            if req is None or self._profiling:
+                return None
+            req.seen += 1
+            if (req.seen - 1) % req.every:
+                return None
+            self._profiling = True
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 另一个性能分析器（例如外部的 cProfile）已在运行
+            with self._lock:
+                self._profiling = False
+            return None
+        return profiler
+
+    def finish_profile(self, function_name: str, profiler: cProfile.Profile) -> Optional[str]:
+        """Stop the profiler and dump its statistics. Returns the pstats file path."""
+        profiler.disable()
+        with self._lock:
+            self._profiling = False
+            req = self._profiles.get(function_name)
+            if req is None:
+                return None
+            req.remaining -= 1
+            if req.remaining <= 0:
+                del self._profiles[function_name]
+            path = os.path.join(req.output_dir, f"{function_name}-{int(time.time())}-{next(self._dump_counter)}.pstats")
+            self._dumps.append((function_name, path))
+        os.makedirs(req.output_dir, exist_ok=True)
+        profiler.dump_stats(path)
+        return path
@@ -0,0 +1,412 @@
+# packages/py_typsio/src/typsio/transport.py
+"""
+Transports connecting a Python typsio client to a registry.
+
+A transport only moves call envelopes (``{"call_id", "function_name", "args"}``)
+and response payloads; validation, invocation and error handling live in
+``RPCDispatcher`` and are identical for every transport.
+
+- ``SocketIOTransport``: a ``socketio.AsyncClient`` talking to a server set up with ``setup_rpc``.
+- ``InProcessTransport``: dispatches directly against a registry in the same process,
+  without Socket.IO framing or JSON encoding; results are shared with the server
+  unless ``copy_results`` is set.
+- ``UnixSocketTransport``: same-host calls over a Unix domain socket served by
+  ``start_unix_server``, using length-prefixed JSON frames.
+"""
+import abc
+import asyncio
+import copy
+import itertools
+import json
+import re
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import socketio
+
+from .codec import RawJSON
+from .rpc import RPCDispatcher, RPCRegistry
+from .tracing import RPCTracer
+
+ResponseCallback = Callable[[Dict[str, Any]], None]
+CloseCallback = Callable[[], None]
+
+_FRAME_HEADER_SIZE = 4
+# 从无法解析的帧中找回 call_id，以便返回错误响应
+_CALL_ID_RE = re.compile(r'"call_id"\s*:\s*("(?:\\.|[^"\\])*"|-?\d+)')
+
+
+class RPCTransport(abc.ABC):
+    """
+    Client side of a connection to a typsio registry.
+
+    Implementations call ``on_response`` for every response payload received and
+    ``on_close`` when the connection is lost, so pending calls can be failed.
+    """
+    serializes: bool = True
+    """Whether envelopes cross a serialization boundary and must be JSON compatible."""
+
+    @abc.abstractmethod
+    async def connect(self, on_response: ResponseCallback, on_close: CloseCallback) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def send(self, envelope: Dict[str, Any]) -> None:
+        ...
+
+    async def send_batch(self, envelopes: List[Dict[str, Any]]) -> None:
+        """Send several envelopes at once. Only used when ``capabilities()`` reports ``batch``."""
+        for envelope in envelopes:
+            await self.send(envelope)
+
+    async def capabilities(self) -> Dict[str, Any]:
+        """Optional features supported by the remote end, e.g. ``{"batch": True}``."""
+        return {}
+
+    @property
+    def connected(self) -> bool:
+        """Whether the connection is currently up. Transports that reconnect on their own report it again once they have."""
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    @staticmethod
+    def _deliver(payload: Any, on_response: ResponseCallback) -> None:
+        # 批量调用的响应合并在一个 {"responses": [...]} 负载中
+        if isinstance(payload, dict) and isinstance(payload.get("responses"), list):
+            for response in payload["responses"]:
+                on_response(response)
+        elif isinstance(payload, dict):
+            on_response(payload)
+
+
+class SocketIOTransport(RPCTransport):
+    """
+    Transport over ``python-socketio``'s ``AsyncClient``.
+
+    :param url: Server URL to connect to. Not needed if ``client`` is already connected.
+    :param client: An existing ``socketio.AsyncClient``. Note that the transport registers
+        the ``disconnect`` handler of the client.
+    :param rpc_event_name: Event name used for RPC calls, must match the server.
+    :param connect_kwargs: Extra arguments for ``AsyncClient.connect``.
+    :param capabilities_timeout: How long to wait for the server to answer the
+        capabilities query. Servers that do not answer are treated as having no
+        optional features.
+    :param upload_threshold: Calls whose JSON-encoded arguments are larger than this
+        many bytes (UTF-8) are sent as a chunked upload (see ``typsio.upload``); the
+        server must be set up with ``uploads``. ``None`` disables chunking.
+    :param chunk_size: Characters per upload chunk.
+    :param upload_timeout: How long to wait for the server to acknowledge each chunk.
+    """
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        *,
+        client: Optional[socketio.AsyncClient] = None,
+        rpc_event_name: str = 'rpc_call',
+        connect_kwargs: Optional[Dict[str, Any]] = None,
+        capabilities_timeout: float = 1.0,
+        upload_threshold: Optional[int] = None,
+        chunk_size: int = 256 * 1024,
+        upload_timeout: float = 30.0,
+    ):
+        self._url = url
+        self._sio = client or socketio.AsyncClient()
+        self._rpc_event_name = rpc_event_name
+        self._response_event_name = f"{rpc_event_name}_response"
+        self._connect_kwargs = connect_kwargs or {}
+        self._capabilities_timeout = capabilities_timeout
+        self._upload_threshold = upload_threshold
+        self._chunk_size = chunk_size
+        self._upload_timeout = upload_timeout
+        self._on_response: Optional[ResponseCallback] = None
+
+    @property
+    def client(self) -> socketio.AsyncClient:
+        return self._sio
+
+    @property
+    def connected(self) -> bool:
+        # AsyncClient 自动重连后 connected 恢复为 True
+        return self._sio.connected
+
+    async def connect(self, on_response: ResponseCallback, on_close: CloseCallback) -> None:
+        self._on_response = on_response
+        self._sio.on(self._response_event_name, lambda data: self._deliver(data, on_response))
+        self._sio.on('disconnect', on_close)
+        if not self._sio.connected:
+            if self._url is None:
+                raise ValueError("A server URL is required to connect the Socket.IO client.")
+            await self._sio.connect(self._url, **self._connect_kwargs)
+
+    def _needs_upload(self, envelope: Dict[str, Any]) -> Optional[str]:
+        """Return the JSON-encoded arguments if they should be uploaded in chunks."""
+        if self._upload_threshold is None:
+            return None
+        args_text = json.dumps(envelope.get("args", []), separators=(',', ':'))
+        # json.dumps 默认转义非 ASCII 字符，字符数即 UTF-8 字节数
+        return args_text if len(args_text) > self._upload_threshold else None
+
+    async def _upload(self, envelope: Dict[str, Any], args_text: str) -> Dict[str, Any]:
+        """Upload the arguments chunk by chunk and return the envelope referring to them."""
+        upload_id = uuid.uuid4().hex
+        chunks = range(0, len(args_text), self._chunk_size)
+        for seq, start in enumerate(chunks):
+            message: Dict[str, Any] = {"upload_id": upload_id, "seq": seq, "data": args_text[start:start + self._chunk_size]}
+            if seq == 0:
+                message["function_name"] = envelope["function_name"]
+                message["size"] = len(args_text.encode('utf-8'))
+            # 每个分块等待 ack：既提供背压，也让其他调用的数据包可以穿插发送
+            ack = await self._sio.call(f"{self._rpc_event_name}_upload", message, timeout=self._upload_timeout)
+            if not isinstance(ack, dict) or not ack.get("ok"):
+                error = ack.get("error") if isinstance(ack, dict) else None
+                raise ConnectionError(error or "Upload chunk was not acknowledged.")
+        upload_envelope = {
+            "call_id": envelope["call_id"],
+            "function_name": envelope["function_name"],
+            "upload_id": upload_id,
+            "chunks": len(chunks),
+        }
+        if envelope.get("projection") is not None:
+            upload_envelope["projection"] = envelope["projection"]
+        return upload_envelope
+
+    async def send(self, envelope: Dict[str, Any]) -> None:
+        args_text = self._needs_upload(envelope)
+        if args_text is not None:
+            envelope = await self._upload(envelope, args_text)
+        await self._sio.emit(self._rpc_event_name, envelope)
+
+    async def send_batch(self, envelopes: List[Dict[str, Any]]) -> None:
+        # 需要分块上传的调用单独发送，不阻塞同一批中的小调用
+        small = []
+        large = []
+        for envelope in envelopes:
+            args_text = self._needs_upload(envelope)
+            if args_text is None:
+                small.append(envelope)
+            else:
+                large.append((envelope, args_text))
+        if small:
+            await self._sio.emit(self._rpc_event_name, {"batch": small})
+        await asyncio.gather(*(self._send_large(envelope, args_text) for envelope, args_text in large))
+
+    async def _send_large(self, envelope: Dict[str, Any], args_text: str) -> None:
+        try:
+            upload_envelope = await self._upload(envelope, args_text)
+        except Exception as e:
+            # 上传失败只影响这一个调用，以错误响应的形式报告
+            if self._on_response is not None:
+                self._on_response({"call_id": envelope["call_id"], "error": f"RPC Error: Upload failed: {e}"})
+            return
+        await self._sio.emit(self._rpc_event_name, upload_envelope)
+
+    async def capabilities(self) -> Dict[str, Any]:
+        try:
+            caps = await self._sio.call(
+                f"{self._rpc_event_name}_capabilities", {}, timeout=self._capabilities_timeout
+            )
+        except socketio.exceptions.TimeoutError:
+            return {}
+        return caps if isinstance(caps, dict) else {}
+
+    async def close(self) -> None:
+        await self._sio.disconnect()
+
+
+class InProcessTransport(RPCTransport):
+    """
+    Dispatches calls directly against a registry living in the same process.
+
+    Arguments and results are passed as Python objects: pydantic models are
+    neither dumped nor re-parsed, while argument validation and error payloads
+    are produced by the same ``RPCDispatcher`` as for Socket.IO.
+
+    By default the caller receives the very objects the function returned, so
+    mutating a result also mutates any server-side state it came from (a cached
+    model, for instance). Pass ``copy_results=True`` to receive deep copies instead.
+
+    :param copy_results: Deep-copy every result before handing it to the caller.
+    """
+    serializes = False
+    _sid_counter = itertools.count()
+
+    def __init__(self, registry: RPCRegistry, *, tracer: Optional[RPCTracer] = None, copy_results: bool = False):
+        self._dispatcher = RPCDispatcher(registry, tracer)
+        self._copy_results = copy_results
+        self._sid = f"inproc-{next(self._sid_counter)}"
+        self._on_response: Optional[ResponseCallback] = None
+        self._tasks: "set[asyncio.Task]" = set()
+
+    async def connect(self, on_response: ResponseCallback, on_close: CloseCallback) -> None:
+        self._on_response = on_response
+
+    @property
+    def connected(self) -> bool:
+        return self._on_response is not None
+
+    async def send(self, envelope: Dict[str, Any]) -> None:
+        task = asyncio.ensure_future(self._dispatch(envelope))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, envelope: Dict[str, Any]) -> None:
+        response = await self._dispatcher.handle(self._sid, envelope, serialize=False)
+        if response is not None and self._on_response is not None:
+            if self._copy_results:
+                response = self._copy(response)
+            self._deliver(response, self._on_response)
+
+    @staticmethod
+    def _copy(response: Dict[str, Any]) -> Dict[str, Any]:
+        if isinstance(response.get("responses"), list):
+            return {"responses": [InProcessTransport._copy(r) for r in response["responses"]]}
+        if response.get("result") is None:
+            return response
+        return {**response, "result": copy.deepcopy(response["result"])}
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self._on_response = None
+        # 与 Socket.IO 断开连接时一样释放服务端游标
+        self._dispatcher.cursors.discard_sid(self._sid)
+
+
+# --- Unix 域套接字 ---
+
+async def _read_raw_frame(reader: asyncio.StreamReader) -> bytes:
+    header = await reader.readexactly(_FRAME_HEADER_SIZE)
+    return await reader.readexactly(int.from_bytes(header, 'big'))
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    return json.loads(await _read_raw_frame(reader))
+
+
+def _frame_error(payload: bytes, reason: str) -> Optional[Dict[str, Any]]:
+    """Error response for a frame that could not be decoded, if a call_id can be recovered from it."""
+    match = _CALL_ID_RE.search(payload.decode('utf-8', errors='replace'))
+    if match is None:
+        return None
+    try:
+        call_id = json.loads(match.group(1))
+    except ValueError:
+        return None
+    return {"call_id": call_id, "error": f"RPC Error: Malformed frame: {reason}"}
+
+
+def _encode_frame(obj: Any) -> bytes:
+    if isinstance(obj, RawJSON):
+        payload = obj.text.encode('utf-8')
+    else:
+        payload = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    return len(payload).to_bytes(_FRAME_HEADER_SIZE, 'big') + payload
+
+
+class UnixSocketTransport(RPCTransport):
+    """Transport over a Unix domain socket served by ``start_unix_server``."""
+    def __init__(self, path: str):
+        self._path = path
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    async def connect(self, on_response: ResponseCallback, on_close: CloseCallback) -> None:
+        reader, self._writer = await asyncio.open_unix_connection(self._path)
+        self._reader_task = asyncio.ensure_future(self._read_loop(reader, on_response, on_close))
+
+    @property
+    def connected(self) -> bool:
+        return self._reader_task is not None and not self._reader_task.done()
+
+    async def _read_loop(self, reader: asyncio.StreamReader, on_response: ResponseCallback, on_close: CloseCallback) -> None:
+        try:
+            while True:
+                self._deliver(await _read_frame(reader), on_response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            on_close()
+
+    async def _write(self, obj: Any) -> None:
+        if self._writer is None:
+            raise ConnectionError("Unix socket transport is not connected.")
+        async with self._write_lock:
+            self._writer.write(_encode_frame(obj))
+            await self._writer.drain()
+
+    async def send(self, envelope: Dict[str, Any]) -> None:
+        await self._write(envelope)
+
+    async def send_batch(self, envelopes: List[Dict[str, Any]]) -> None:
+        await self._write({"batch": envelopes})
+
+    async def capabilities(self) -> Dict[str, Any]:
+        return {"batch": True}
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+
+async def start_unix_server(registry: RPCRegistry, path: str, *, tracer: Optional[RPCTracer] = None, **kwargs: Any) -> asyncio.AbstractServer:
+    """
+    Serve the registry on a Unix domain socket for same-host callers.
+
+    Calls on one connection are dispatched concurrently; responses are written
+    as they complete. Frames are validated straight from their JSON text, see
+    ``RPCDispatcher.handle_raw``. Frames that are not valid UTF-8 JSON are answered
+    with an error response when their ``call_id`` can be recovered, and otherwise
+    dropped. ``tracer`` is used as in ``setup_rpc``; extra keyword arguments go to
+    ``asyncio.start_unix_server``.
+    """
+    dispatcher = RPCDispatcher(registry, tracer)
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sid = f"unix-{uuid.uuid4().hex}"
+        write_lock = asyncio.Lock()
+        tasks: "set[asyncio.Task]" = set()
+
+        async def respond(payload: bytes) -> None:
+            try:
+                text = payload.decode('utf-8')
+            except UnicodeDecodeError as e:
+                response = _frame_error(payload, f"invalid UTF-8 ({e.reason})")
+            else:
+                response = await dispatcher.handle_raw(sid, RawJSON(text))
+                if response is None:
+                    # handle_raw 对无法解析的 JSON 不作响应
+                    try:
+                        dispatcher.codec.loads(text)
+                    except ValueError as e:
+                        response = _frame_error(payload, f"invalid JSON ({e})")
+            if response is None:
+                return
+            try:
+                async with write_lock:
+                    writer.write(_encode_frame(response))
+                    await writer.drain()
+            except ConnectionError:
+                # 连接已断开，读取循环会负责清理
+                pass
+
+        try:
+            while True:
+                task = asyncio.ensure_future(respond(await _read_raw_frame(reader)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            dispatcher.cursors.discard_sid(sid)
+            writer.close()
+
+    return await asyncio.start_unix_server(handle_connection, path, **kwargs)
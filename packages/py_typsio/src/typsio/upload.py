@@ -0,0 +1,157 @@
+# packages/py_typsio/src/typsio/upload.py
+"""
+Chunked upload of large RPC arguments.
+
+A client whose serialized ``args`` exceed its upload threshold sends them as
+sequenced chunks on the ``{rpc_event_name}_upload`` event (each acknowledged, so
+other calls keep flowing between chunks), then emits the call envelope with
+``upload_id`` and ``chunks`` instead of ``args``:
+
+    -> rpc_call_upload {"upload_id": "u1", "seq": 0, "data": "[{\\"rows\\": [...", "function_name": "import_rows"}
+    <- ack {"ok": true}
+    -> rpc_call_upload {"upload_id": "u1", "seq": 1, "data": "...]}]"}
+    <- ack {"ok": true}
+    -> rpc_call {"call_id": "c1", "function_name": "import_rows", "upload_id": "u1", "chunks": 2}
+
+The server keeps each upload in a ``SpooledTemporaryFile``: in memory up to
+``spool_threshold`` bytes, on disk past it. Once the call envelope arrives the
+arguments are validated straight from the reassembled JSON text, which must be
+a single JSON array. Uploads that see no chunk for ``timeout`` seconds are
+discarded; call ``discard_sid`` from the server's ``disconnect`` handler to free
+a session's unfinished uploads right away.
+"""
+import asyncio
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, IO, Optional, Tuple
+
+
+class UploadError(Exception):
+    """Raised when a chunk or a completed upload is rejected."""
+
+
+@dataclass
+class _Upload:
+    function_name: Optional[str]
+    file: IO[bytes]
+    next_seq: int = 0
+    size: int = 0
+    last_activity: float = field(default_factory=time.monotonic)
+
+
+class UploadStore:
+    """
+    Reassembles chunked arguments per Socket.IO session.
+
+    :param max_size: Maximum size of one upload in bytes (UTF-8 encoded JSON).
+    :param spool_threshold: Uploads larger than this are spooled to a temporary file.
+    :param timeout: Seconds without a new chunk after which an upload is discarded.
+    :param max_uploads_per_sid: Maximum number of unfinished uploads per session.
+    """
+    def __init__(
+        self,
+        *,
+        max_size: int = 64 * 1024 * 1024,
+        spool_threshold: int = 1024 * 1024,
+        timeout: float = 60.0,
+        max_uploads_per_sid: int = 4,
+    ):
+        self.max_size = max_size
+        self.spool_threshold = spool_threshold
+        self.timeout = timeout
+        self.max_uploads_per_sid = max_uploads_per_sid
+        self._uploads: Dict[Tuple[str, str], _Upload] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._uploads)
+
+    def add_chunk(self, sid: str, upload_id: str, seq: int, data: str, *, function_name: Optional[str] = None, size: Optional[int] = None) -> None:
+        """
+        Append one chunk. The first chunk (``seq == 0``) starts the upload and
+        may announce the target function and the total size, so oversized
+        uploads are refused before their data is sent.
+        """
+        self.sweep()
+        key = (sid, upload_id)
+        upload = self._uploads.get(key)
+        if upload is None:
+            if seq != 0:
+                raise UploadError(f"Upload '{upload_id}' not found or expired.")
+            if size is not None and size > self.max_size:
+                raise UploadError(f"Upload of {size} bytes exceeds the limit of {self.max_size} bytes.")
+            if sum(1 for s, _ in self._uploads if s == sid) >= self.max_uploads_per_sid:
+                raise UploadError("Too many unfinished uploads.")
+            upload = _Upload(function_name, tempfile.SpooledTemporaryFile(max_size=self.spool_threshold))
+            self._uploads[key] = upload
+            self._ensure_reaper()
+        elif seq != upload.next_seq:
+            self.discard(sid, upload_id)
+            raise UploadError(f"Upload '{upload_id}' expected chunk {upload.next_seq}, got {seq}.")
+
+        try:
+            chunk = data.encode('utf-8')
+        except (AttributeError, UnicodeEncodeError):
+            self.discard(sid, upload_id)
+            raise UploadError(f"Upload '{upload_id}' chunk {seq} is not valid text.")
+        if upload.size + len(chunk) > self.max_size:
+            self.discard(sid, upload_id)
+            raise UploadError(f"Upload '{upload_id}' exceeds the limit of {self.max_size} bytes.")
+        upload.file.write(chunk)
+        upload.size += len(chunk)
+        upload.next_seq += 1
+        upload.last_activity = time.monotonic()
+
+    def take(self, sid: str, upload_id: Any, function_name: str, chunks: Any) -> bytes:
+        """
+        Remove a finished upload and return its UTF-8 encoded JSON text.
+
+        The text is returned as bytes so it can be validated without decoding
+        another copy; it is read into memory in one piece, since the validator
+        does not parse incrementally.
+        """
+        upload = self._uploads.pop((sid, upload_id), None) if isinstance(upload_id, str) else None
+        if upload is None:
+            raise UploadError(f"Upload '{upload_id}' not found or expired.")
+        try:
+            if upload.next_seq != chunks:
+                raise UploadError(f"Upload '{upload_id}' is incomplete: received {upload.next_seq} of {chunks} chunks.")
+            if upload.function_name is not None and upload.function_name != function_name:
+                raise UploadError(f"Upload '{upload_id}' was started for '{upload.function_name}'.")
+            upload.file.seek(0)
+            return upload.file.read()
+        finally:
+            upload.file.close()
+
+    def discard(self, sid: str, upload_id: str) -> None:
+        upload = self._uploads.pop((sid, upload_id), None)
+        if upload is not None:
+            upload.file.close()
+
+    def discard_sid(self, sid: str) -> None:
+        """Discard every unfinished upload of a session, e.g. when it disconnects."""
+        for key in [key for key in self._uploads if key[0] == sid]:
+            self.discard(*key)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Discard uploads idle for longer than ``timeout``. Returns how many were removed."""
+        now = time.monotonic() if now is None else now
+        expired = [key for key, upload in self._uploads.items() if now - upload.last_activity > self.timeout]
+        for key in expired:
+            self.discard(*key)
+        return len(expired)
+
+    def _ensure_reaper(self) -> None:
+        # 后台清理任务仅在存在未完成的上传时运行，上传清空后自行退出
+        if self._reaper is None or self._reaper.done():
+            try:
+                self._reaper = asyncio.get_running_loop().create_task(self._reap())
+            except RuntimeError:
+                # 不在事件循环中（例如同步调用），仅依赖 add_chunk 中的清理
+                pass
+
+    async def _reap(self) -> None:
+        while self._uploads:
+            await asyncio.sleep(self.timeout / 2)
+            self.sweep()
@@ -8,10 +8,138 @@ export interface DefaultServerEvents { [key: string]: (...args: any[]) => void;
 export interface TypsioClientOptions {
 	timeout?: number;
 	rpcEventName?: string;
+	/**
+	 * 重新连接后向服务器请求断线期间错过的 S2C 事件（需要服务器使用 `setup_replay`）。
+	 * 每次连接时都会询问服务器，应答前到达的事件会暂缓分发（服务器未应答时最多等待 `timeout`）。
+	 */
+	replay?: boolean;
+	replayEventName?: string;
+	/**
+	 * 错过的事件已被服务器丢弃（或服务器已重启）时调用，此时需要重新获取对应流的状态。
+	 * @param streams 需要重新同步的流（房间名或事件名）。
+	 */
+	onResyncRequired?: (streams: string[]) => void;
+	/**
+	 * 参数 JSON 的 UTF-8 字节数超过该值时分块上传（需要服务器在 `setup_rpc` 中启用 `uploads`）。
+	 * 默认不分块。
+	 */
+	uploadThreshold?: number;
+	/** 每个上传分块的字符数，默认 256K。 */
+	chunkSize?: number;
+}
+
+/** 服务器随每个 S2C 事件发送的序列信息。 */
+export interface EventMeta {
+	stream: string;
+	seq: number;
+	epoch: string;
+}
+
+interface ReplayResponse {
+	epoch: string;
+	events: { event: string; payload: any; meta: EventMeta }[];
+	resync: string[];
+	/** 客户端可以接收的各个流当前的序列号。 */
+	heads?: Record<string, number>;
+	/** 服务器当前的位置，下次重连时作为 `since` 发回。 */
+	clock?: number;
+}
+
+type Listener = (...args: any[]) => void;
+
+interface RPCResponse {
+	call_id: string;
+	result?: any;
+	error?: string;
+	/** 结果是游标函数返回的页面。 */
+	cursor?: boolean;
+}
+
+/** 游标函数返回的一页结果。 */
+interface CursorPage<T> {
+	items: T[];
+	cursor: string | null;
+	offset: number;
+	has_more: boolean;
+	total: number | null;
+}
+
+/**
+ * 以 `register_cursor` 注册的函数返回的游标，与生成的 `Cursor<T>` 结构相同。
+ * 可以用 `for await` 遍历从当前页到末尾的所有项，后续页面按需获取。
+ */
+export interface Cursor<T> extends AsyncIterable<T> {
+	/** 当前页的项。 */
+	readonly items: T[];
+	/** 当前页第一项的位置。 */
+	readonly offset: number;
+	/** 快照游标的总项数；实时迭代器为 null。 */
+	readonly total: number | null;
+	readonly hasMore: boolean;
+	/** 获取下一页。 */
+	next(limit?: number): Promise<T[]>;
+	/** 获取从 `offset` 开始的一页；实时迭代器只能向前跳转。 */
+	seek(offset: number, limit?: number): Promise<T[]>;
+	/** 释放服务器端的游标。 */
+	close(): Promise<void>;
+}
+
+// --- 结果字段投影的类型 ---
+type PrevDepth = [never, 0, 1, 2, 3, 4];
+type ElementOf<T> = T extends readonly (infer U)[] ? ElementOf<U> : T;
+type PathHead<P extends string> = P extends `${infer H}.${string}` ? H : P;
+type PathRest<P extends string, H extends string> = P extends `${H}.${infer R}` ? R : never;
+
+/**
+ * `T` 中以点分隔的字段路径，例如 `'id' | 'team' | 'team.name'`；列表字段按其元素展开。
+ * 嵌套深度限制为 `D` 层，以免递归模型展开成无限类型。
+ */
+export type FieldPath<T, D extends number = 4> = [D] extends [never]
+	? never
+	: ElementOf<NonNullable<T>> extends infer E
+		? E extends object
+			? { [K in keyof E & string]: K | `${K}.${FieldPath<E[K], PrevDepth[D]> & string}` }[keyof E & string]
+			: never
+		: never;
+
+/** 只保留路径 `P` 所选字段的 `T`，即逐层应用的 `Pick`。 */
+export type Projected<T, P extends string> = T extends null | undefined
+	? T
+	: T extends readonly (infer U)[]
+		? Projected<U, P>[]
+		: T extends object
+			? { [K in keyof T as K extends PathHead<P> ? K : never]: K extends P ? T[K] : Projected<T[K], PathRest<P, K & string>> }
+			: T;
+
+/** 去掉路径 `P` 所选字段的 `T`，即逐层应用的 `Omit`。 */
+export type Excluded<T, P extends string> = [P] extends [never]
+	? T
+	: T extends null | undefined
+		? T
+		: T extends readonly (infer U)[]
+			? Excluded<U, P>[]
+			: T extends object
+				? { [K in keyof T as K extends P ? never : K]: Excluded<T[K], PathRest<P, K & string>> }
+				: T;
+
+/** 对结果同时应用 include 与 exclude 投影后的类型。 */
+export type ProjectedResult<T, I extends string, E extends string> = Excluded<[I] extends [never] ? T : Projected<T, I>, E>;
+
+/** 投影路径所针对的类型：游标函数的投影作用于其中的每一项。 */
+type ProjectionTarget<R> = R extends Cursor<infer T> ? T[] : R;
+type ProjectedCall<R, I extends string, E extends string> = R extends Cursor<infer T> ? Cursor<ProjectedResult<T, I, E>> : ProjectedResult<R, I, E>;
+
+type RPCResultOf<ClientRPC, M extends keyof ClientRPC> = ClientRPC[M] extends (...args: any[]) => Promise<infer R> ? R : never;
+type RPCArgsOf<ClientRPC, M extends keyof ClientRPC> = ClientRPC[M] extends (...args: infer A) => any ? A : never;
+
+/** 调用信封中的字段投影。 */
+export interface Projection<I = string, E = string> {
+	include?: readonly I[];
+	exclude?: readonly E[];
 }
 
 interface PendingCall {
-	resolve: (value: any) => void;
+	resolve: (response: RPCResponse) => void;
 	reject: (reason?: any) => void;
 	timeoutTimer: NodeJS.Timeout;
 }
@@ -29,13 +157,19 @@ export function createTypsioClient<
 	const {
 		timeout = 10000,
 		rpcEventName = 'rpc_call',
+		replay = false,
+		replayEventName = 's2c_replay',
+		onResyncRequired,
+		uploadThreshold,
+		chunkSize = 256 * 1024,
 	} = options;
+	const uploadEventName = `${rpcEventName}_upload`;
 	const responseEventName = `${rpcEventName}_response`;
 
 	let callCounter = 0;
 	const pendingCalls = new Map<string, PendingCall>();
 
-	socket.on(responseEventName, (data: { call_id: string; result?: any; error?: string }) => {
+	socket.on(responseEventName, (data: RPCResponse) => {
 		const pending = pendingCalls.get(data.call_id);
 		if (!pending) return;
 
@@ -43,7 +177,7 @@ export function createTypsioClient<
 		if (data.error) {
 			pending.reject(new Error(data.error));
 		} else {
-			pending.resolve(data.result);
+			pending.resolve(data);
 		}
 		pendingCalls.delete(data.call_id);
 	});
@@ -56,40 +190,237 @@ export function createTypsioClient<
 		});
 	});
 
+	// --- S2C 事件序列号与重连后的重放 ---
+	let epoch: string | null = null;
+	const lastSeq = new Map<string, number>();
+	const listeners = new Map<string, Set<Listener>>();
+	const dispatchers = new Map<string, Listener>();
+	// 上次连接时服务器的位置与本客户端的 sid，用于补齐尚未收到过事件的流并跳过 skip_sid 事件
+	let since: number | null = null;
+	let previousSid: string | undefined;
+
+	/** 记录事件的序列号；已处理过的事件（例如重放与实时事件重叠）返回 false。 */
+	const accept = (meta: unknown): boolean => {
+		if (!replay || !meta || typeof (meta as EventMeta).seq !== 'number') return true;
+		const { stream, seq, epoch: eventEpoch } = meta as EventMeta;
+		if (eventEpoch !== epoch) {
+			epoch = eventEpoch;
+			lastSeq.clear();
+		}
+		if (seq <= (lastSeq.get(stream) ?? 0)) return false;
+		lastSeq.set(stream, seq);
+		return true;
+	};
+
+	/** 每个事件名在 socket 上只注册一个分发函数，保证每个事件只做一次去重。 */
+	const deliver = (event: string, payload: any, meta?: EventMeta) => {
+		if (!accept(meta)) return;
+		listeners.get(event)?.forEach((listener) => listener(payload));
+	};
+
+	// 等待重放结果期间到达的实时事件先暂存，避免较新的序列号使重放的事件被丢弃
+	let heldEvents: [string, any, EventMeta | undefined][] | null = null;
+	const receive = (event: string, payload: any, meta?: EventMeta) => {
+		if (heldEvents) heldEvents.push([event, payload, meta]);
+		else deliver(event, payload, meta);
+	};
+
+	const requestReplay = () => {
+		const held: [string, any, EventMeta | undefined][] = [];
+		heldEvents = held;
+		let done = false;
+		const finish = (response?: ReplayResponse) => {
+			if (done) return;
+			done = true;
+			clearTimeout(timer);
+			if (response) {
+				if (response.epoch !== epoch) {
+					epoch = response.epoch;
+					lastSeq.clear();
+				}
+				for (const { event, payload, meta } of response.events) {
+					deliver(event, payload, meta);
+				}
+				if (response.resync.length > 0) {
+					// 被丢弃的事件无法补齐，从当前位置继续
+					response.resync.forEach((stream) => lastSeq.delete(stream));
+					onResyncRequired?.(response.resync);
+				}
+				since = response.clock ?? null;
+			}
+			if (heldEvents === held) heldEvents = null;
+			held.forEach(([event, payload, meta]) => deliver(event, payload, meta));
+			// 实时事件分发后再记录各流的位置，否则应答前到达的事件会被当作重复丢弃
+			for (const [stream, head] of Object.entries(response?.heads ?? {})) {
+				if (head > (lastSeq.get(stream) ?? 0)) lastSeq.set(stream, head);
+			}
+		};
+		// 服务器未启用重放时不会应答，超时后照常继续
+		const timer = setTimeout(() => finish(), timeout);
+		const request = { epoch, streams: Object.fromEntries(lastSeq), since, sid: previousSid };
+		previousSid = socket.id;
+		socket.emit(replayEventName as any, request, finish);
+	};
+
+	if (replay) {
+		// 首次连接也需要询问：断线前未收到任何事件的流由 since 补齐
+		socket.on('connect', requestReplay);
+		if (socket.connected) requestReplay();
+	}
+
+	// --- 大参数分块上传 ---
+	let uploadCounter = 0;
+	const utf8 = new TextEncoder();
+
+	const emitWithAck = (event: string, data: any): Promise<any> => new Promise((resolve, reject) => {
+		const timer = setTimeout(() => reject(new Error(`No acknowledgement for '${event}' after ${timeout}ms`)), timeout);
+		socket.emit(event as any, data, (ack: any) => {
+			clearTimeout(timer);
+			resolve(ack);
+		});
+	});
+
+	/** 逐块上传参数 JSON，每块等待 ack，期间其他调用的数据包可以穿插发送。 */
+	const uploadArgs = async (functionName: string, argsText: string, size: number): Promise<{ upload_id: string; chunks: number }> => {
+		const uploadId = `${socket.id}-upload-${uploadCounter++}`;
+		let seq = 0;
+		for (let start = 0; start < argsText.length; seq++) {
+			let end = Math.min(start + chunkSize, argsText.length);
+			// 不要把 UTF-16 代理对拆到两个分块中
+			const last = argsText.charCodeAt(end - 1);
+			if (end < argsText.length && last >= 0xd800 && last <= 0xdbff) end--;
+			const message: Record<string, any> = { upload_id: uploadId, seq, data: argsText.slice(start, end) };
+			if (seq === 0) {
+				message.function_name = functionName;
+				// 服务器按 UTF-8 字节数限制上传大小
+				message.size = size;
+			}
+			const ack = await emitWithAck(uploadEventName, message);
+			if (!ack || !ack.ok) throw new Error(ack?.error ?? 'Upload chunk was not acknowledged.');
+			start = end;
+		}
+		return { upload_id: uploadId, chunks: seq };
+	};
+
+	/** 发送一个调用信封并等待成功的响应；`body` 为 Promise 时（分块上传）在其完成后发送。 */
+	const request = (prop: string, body: Record<string, any> | Promise<Record<string, any>>, projection?: Projection): Promise<RPCResponse> => {
+		return new Promise((resolve, reject) => {
+			if (!socket.connected) {
+				return reject(new Error("Socket is not connected."));
+			}
+			const callId = `${socket.id}-${callCounter++}`;
+
+			const send = (payload: Record<string, any>) => {
+				const timeoutTimer = setTimeout(() => {
+					pendingCalls.delete(callId);
+					reject(new Error(`RPC call '${prop}' timed out after ${timeout}ms`));
+				}, timeout);
+
+				pendingCalls.set(callId, { resolve, reject, timeoutTimer });
+
+				socket.emit(rpcEventName as any, {
+					call_id: callId,
+					function_name: prop,
+					...payload,
+					...(projection ? { projection } : {}),
+				});
+			};
+
+			if (body instanceof Promise) {
+				body.then(send, reject);
+			} else {
+				send(body);
+			}
+		});
+	};
+
+	const makeCursor = <T>(method: string, first: CursorPage<T>, projection?: Projection): Cursor<T> => {
+		let page = first;
+		const fetchPage = async (body: Record<string, any>): Promise<T[]> => {
+			if (page.cursor === null) throw new Error(`Cursor of '${method}' is closed.`);
+			page = (await request(method, { cursor: { id: page.cursor, ...body } }, projection)).result;
+			return page.items;
+		};
+		const cursor: Cursor<T> = {
+			get items() { return page.items; },
+			get offset() { return page.offset; },
+			get total() { return page.total; },
+			get hasMore() { return page.has_more; },
+			next: (limit?: number) => (page.has_more ? fetchPage(limit === undefined ? {} : { limit }) : Promise.resolve([])),
+			seek: (offset: number, limit?: number) => fetchPage(limit === undefined ? { offset } : { offset, limit }),
+			close: async () => {
+				if (page.cursor !== null) await request(method, { cursor: { id: page.cursor, close: true } }, projection);
+				page = { ...page, cursor: null, has_more: false };
+			},
+			async *[Symbol.asyncIterator]() {
+				while (true) {
+					yield* page.items;
+					if (!page.has_more) return;
+					await cursor.next();
+				}
+			},
+		};
+		return cursor;
+	};
+
+	const invoke = async (prop: string, args: any[], projection?: Projection): Promise<any> => {
+		if (!socket.connected) throw new Error("Socket is not connected.");
+		const argsText = uploadThreshold !== undefined ? JSON.stringify(args) : '';
+		const argsSize = uploadThreshold !== undefined ? utf8.encode(argsText).byteLength : 0;
+		const body = uploadThreshold !== undefined && argsSize > uploadThreshold
+			? uploadArgs(prop, argsText, argsSize).catch((e: Error) => { throw new Error(`RPC call '${prop}' upload failed: ${e.message}`); })
+			: { args };
+		const response = await request(prop, body, projection);
+		return response.cursor ? makeCursor(prop, response.result, projection) : response.result;
+	};
+
 	const remote = new Proxy({}, {
 		get: (target, prop) => {
 			if (typeof prop !== 'string') return undefined;
-			return (...args: any[]) => {
-				return new Promise((resolve, reject) => {
-					if (!socket.connected) {
-						return reject(new Error("Socket is not connected."));
-					}
-					const callId = `${socket.id}-${callCounter++}`;
-
-					const timeoutTimer = setTimeout(() => {
-						pendingCalls.delete(callId);
-						reject(new Error(`RPC call '${prop}' timed out after ${timeout}ms`));
-					}, timeout);
-
-					pendingCalls.set(callId, { resolve, reject, timeoutTimer });
-
-					socket.emit(rpcEventName as any, {
-						call_id: callId,
-						function_name: prop,
-						args,
-					});
-				});
-			};
+			return (...args: any[]) => invoke(prop, args);
 		},
 	}) as ClientRPC;
 
 	return {
 		remote,
+		/**
+		 * 以字段投影调用远程函数：服务器只序列化并发送所选的字段，返回类型按所选路径裁剪。
+		 * @example
+		 * const user = await client.project('get_user', { include: ['id', 'team.name'] })(1);
+		 * // user: { id: number; team: { name: string } } | null
+		 */
+		project<
+			M extends keyof ClientRPC & string,
+			I extends FieldPath<ProjectionTarget<RPCResultOf<ClientRPC, M>>> = never,
+			E extends FieldPath<ProjectionTarget<RPCResultOf<ClientRPC, M>>> = never
+		>(method: M, projection: Projection<I, E>) {
+			return (...args: RPCArgsOf<ClientRPC, M>): Promise<ProjectedCall<RPCResultOf<ClientRPC, M>, I & string, E & string>> =>
+				invoke(method, args as any[], projection as Projection);
+		},
 		on<E extends keyof ServerEvents>(event: E, listener: ServerEvents[E]): void {
-			socket.on(event as string, listener as unknown as (...args: any[]) => void);
+			const name = event as string;
+			if (!dispatchers.has(name)) {
+				const dispatcher: Listener = (payload: any, meta?: EventMeta) => receive(name, payload, meta);
+				dispatchers.set(name, dispatcher);
+				listeners.set(name, new Set());
+				socket.on(name, dispatcher);
+			}
+			listeners.get(name)!.add(listener as unknown as Listener);
 		},
 		off<E extends keyof ServerEvents>(event: E, listener?: ServerEvents[E]): void {
-			socket.off(event as string, listener as unknown as (...args: any[]) => void);
+			const name = event as string;
+			const registered = listeners.get(name);
+			if (!registered) return;
+			if (listener === undefined) {
+				registered.clear();
+			} else {
+				registered.delete(listener as unknown as Listener);
+			}
+			if (registered.size === 0) {
+				socket.off(name, dispatchers.get(name));
+				dispatchers.delete(name);
+				listeners.delete(name);
+			}
 		},
 		socket,
 	};
@@ -15,4 +15,7 @@ export interface BasicTypesModel {
 
 export interface RPCMethods {
   get_basic_types(): Promise<BasicTypesModel>;
-}
\ No newline at end of file
+}
+
+/** Result type of an RPC method, e.g. `Pick<NonNullable<RPCResult<'get_user'>>, 'id' | 'name'>` for a projected call. */
+export type RPCResult<M extends keyof RPCMethods> = Awaited<ReturnType<RPCMethods[M]>>;
\ No newline at end of file
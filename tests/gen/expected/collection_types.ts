@@ -14,4 +14,7 @@ export interface CollectionTypesModel {
 
 export interface RPCMethods {
   get_collections(): Promise<CollectionTypesModel>;
-}
\ No newline at end of file
+}
+
+/** Result type of an RPC method, e.g. `Pick<NonNullable<RPCResult<'get_user'>>, 'id' | 'name'>` for a projected call. */
+export type RPCResult<M extends keyof RPCMethods> = Awaited<ReturnType<RPCMethods[M]>>;
\ No newline at end of file
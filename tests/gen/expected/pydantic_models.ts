@@ -15,4 +15,7 @@ export interface TopLevelModel {
 
 export interface RPCMethods {
   get_model(): Promise<TopLevelModel>;
-}
\ No newline at end of file
+}
+
+/** Result type of an RPC method, e.g. `Pick<NonNullable<RPCResult<'get_user'>>, 'id' | 'name'>` for a projected call. */
+export type RPCResult<M extends keyof RPCMethods> = Awaited<ReturnType<RPCMethods[M]>>;
\ No newline at end of file
@@ -0,0 +1,20 @@
+# tests/gen/inputs/split_api.py
+from typing import List, Optional
+from typsio import RPCRegistry
+
+from .split_posts import SplitPost
+from .split_users import SplitUser
+
+registry = RPCRegistry()
+
+@registry.register
+async def get_post(post_id: int) -> Optional[SplitPost]:
+    return None
+
+@registry.register
+async def list_authors(post_ids: List[int]) -> List[SplitUser]:
+    return []
+
+S2C_EVENTS = {
+    "postPublished": SplitPost,
+}
@@ -0,0 +1,16 @@
+# tests/gen/inputs/split_posts.py
+from enum import Enum
+from typing import List
+from pydantic import BaseModel
+
+from .split_users import SplitUser
+
+class SplitStatus(str, Enum):
+    DRAFT = "draft"
+    PUBLISHED = "published"
+
+class SplitPost(BaseModel):
+    id: int
+    author: SplitUser
+    status: SplitStatus
+    tags: List[str]
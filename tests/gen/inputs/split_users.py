@@ -0,0 +1,6 @@
+# tests/gen/inputs/split_users.py
+from pydantic import BaseModel
+
+class SplitUser(BaseModel):
+    id: int
+    name: str
@@ -0,0 +1,33 @@
+# tests/gen/inputs/static_api.py
+from __future__ import annotations
+
+from typing import AsyncIterator, Dict, Literal, Optional
+
+# 静态模式下不会执行本文件，因此这里的导入不会失败
+import typsio_test_missing_dependency  # noqa: F401
+from typsio.rpc import RPCRegistry
+
+from . import static_models
+from .static_models import StaticEvent, StaticItem, StaticItemList
+
+registry = RPCRegistry()
+
+@registry.register
+async def get_item(item_id: int) -> Optional[StaticItem]:
+    ...
+
+@registry.register
+def list_items(kind: Literal["all", "recent"]) -> StaticItemList:
+    ...
+
+@registry.register
+def count_tags(items: "list[static_models.StaticItem]") -> Dict[str, int] | None:
+    ...
+
+@registry.register_cursor(page_size=50)
+async def stream_items(kind: Literal["all", "recent"]) -> AsyncIterator[StaticItem]:
+    ...
+
+S2C_EVENTS = {
+    "itemChanged": StaticEvent,
+}
@@ -0,0 +1,12 @@
+# tests/gen/inputs/static_models.py
+from typing import List
+from pydantic import BaseModel
+
+class StaticItem(BaseModel):
+    id: int
+    tags: List[str]
+
+class StaticEvent(BaseModel):
+    message: str
+
+StaticItemList = List[StaticItem]
@@ -0,0 +1,8 @@
+# tests/gen/inputs/static_unresolved_api.py
+from typsio.rpc import RPCRegistry
+
+registry = RPCRegistry()
+
+@registry.register
+def get_thing() -> UndefinedModel:  # noqa: F821
+    ...
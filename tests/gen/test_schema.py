@@ -0,0 +1,59 @@
+import unittest
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from typsio.gen import GenerationProfile, build_combined_schema, normalize_schema
+
+
+class Author(BaseModel):
+    name: str
+
+
+class Book(BaseModel):
+    title: str
+    author: Author
+
+
+class Shelf(BaseModel):
+    books: List[Book]
+    featured: Optional[Book] = None
+
+
+class TreeNode(BaseModel):
+    label: str
+    children: List["TreeNode"] = []
+
+
+class TestSchemaNormalization(unittest.TestCase):
+    def test_normalize_schema(self):
+        schema = normalize_schema(Book.model_json_schema())
+        self.assertNotIn("$defs", schema)
+        self.assertEqual(schema["title"], "Book")
+        # 名为 title 的字段不能被当作 schema 标题移除
+        self.assertEqual(schema["properties"]["title"], {"type": "string"})
+        self.assertEqual(schema["properties"]["author"], {"$ref": "#/definitions/Author"})
+
+    def test_shared_definitions(self):
+        schema = build_combined_schema([Shelf, Book, Author])
+        self.assertEqual(sorted(schema["definitions"]), ["Author", "Book", "Shelf"])
+        self.assertEqual(sorted(schema["properties"]), ["Author", "Book", "Shelf"])
+        for name in schema["properties"]:
+            self.assertIs(schema["properties"][name], schema["definitions"][name])
+
+    def test_recursive_model(self):
+        schema = build_combined_schema([TreeNode])
+        node = schema["definitions"]["TreeNode"]
+        self.assertIn("properties", node)
+        self.assertEqual(node["properties"]["children"]["items"], {"$ref": "#/definitions/TreeNode"})
+
+    def test_profile_stages(self):
+        profile = GenerationProfile(trace_memory=False)
+        build_combined_schema([Shelf], profile)
+        self.assertEqual([s.name for s in profile.stages], ["model_json_schema", "normalize"])
+        self.assertGreaterEqual(profile.total_seconds, 0)
+        self.assertIn("normalize", profile.format())
+
+
+if __name__ == "__main__":
+    unittest.main()
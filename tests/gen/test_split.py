@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from pydantic import create_model
+
+from typsio.gen_split import (
+    INDEX_FILE,
+    RPC_FILE,
+    SHARED_FILE,
+    collect_type_owners,
+    split_ts_declarations,
+    split_ts_output,
+    ts_safe_name,
+    write_split_output,
+)
+
+from .helper import ts_typecheck
+
+INPUTS = Path(__file__).parent / "inputs"
+PROJECT_ROOT = Path(__file__).parents[2]
+
+# json-schema-to-typescript 输出格式的样例
+JSON2TS_OUTPUT = """/* eslint-disable */
+/**
+ * This file was automatically generated by typsio-gen.
+ * DO NOT MODIFY IT BY HAND.
+ */
+
+export interface TypsioModels {
+  Post: Post;
+  User: User;
+}
+/**
+ * This interface was referenced by `TypsioModels`'s JSON-Schema
+ * via the `definition` "Post".
+ */
+export interface Post {
+  id: number;
+  author: User;
+  status: Status;
+  User?: string;
+}
+export interface User {
+  id: number;
+  name: string;
+}
+export type Status = 'draft' | 'published';
+"""
+
+OWNERS = {"Post": "app.posts", "Status": "app.posts", "User": "app.users"}
+
+RPC_INTERFACES = """export interface RPCMethods {
+  get_post(post_id: number): Promise<Post | null>;
+}"""
+
+
+class TestSplitOutput(unittest.TestCase):
+    def test_split_declarations(self):
+        banner, decls = split_ts_declarations(JSON2TS_OUTPUT)
+        self.assertTrue(banner.startswith("/* eslint-disable */"))
+        self.assertTrue(banner.endswith("*/"))
+        self.assertEqual([name for name, _ in decls], ["TypsioModels", "Post", "User", "Status"])
+        # JSDoc 跟随其声明
+        self.assertTrue(dict(decls)["Post"].startswith("/**"))
+        self.assertTrue(dict(decls)["User"].startswith("export interface User"))
+
+    def test_split_files(self):
+        files = split_ts_output(JSON2TS_OUTPUT, OWNERS, RPC_INTERFACES)
+        self.assertEqual(
+            sorted(files),
+            sorted(["app.posts.ts", "app.users.ts", SHARED_FILE, RPC_FILE, INDEX_FILE]),
+        )
+        posts = files["app.posts.ts"]
+        self.assertIn("import type { User } from './app.users';", posts)
+        self.assertIn("export type Status", posts)
+        self.assertNotIn("import", files["app.users.ts"])
+        self.assertIn("import type { Post } from './app.posts';", files[RPC_FILE])
+        self.assertIn("import type { Post } from './app.posts';", files[SHARED_FILE])
+        self.assertIn("import type { User } from './app.users';", files[SHARED_FILE])
+        self.assertIn("export * from './_rpc';", files[INDEX_FILE])
+        self.assertIn("export * from './app.users';", files[INDEX_FILE])
+
+    def test_write_only_changed(self):
+        files = split_ts_output(JSON2TS_OUTPUT, OWNERS, RPC_INTERFACES)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            (out / "stale.ts").write_text(files["app.users.ts"], encoding="utf-8")
+            (out / "handwritten.ts").write_text("export const x = 1;\n", encoding="utf-8")
+
+            written, removed = write_split_output(out, files)
+            self.assertEqual(sorted(written), sorted(files))
+            self.assertEqual(removed, ["stale.ts"])
+            self.assertTrue((out / "handwritten.ts").exists())
+
+            changed = dict(files)
+            changed[RPC_FILE] = split_ts_output(
+                JSON2TS_OUTPUT, OWNERS, RPC_INTERFACES.replace("post_id", "id")
+            )[RPC_FILE]
+            written, removed = write_split_output(out, changed)
+            self.assertEqual(written, [RPC_FILE])
+            self.assertEqual(removed, [])
+
+    def test_collect_type_owners(self):
+        from .inputs.split_posts import SplitPost, SplitStatus, SplitUser
+
+        self.assertEqual(collect_type_owners([SplitPost]), {
+            "SplitPost": SplitPost.__module__,
+            "SplitStatus": SplitStatus.__module__,
+            "SplitUser": SplitUser.__module__,
+        })
+
+    def test_same_name_in_two_modules_fails(self):
+        users = create_model("Item", __module__="app.users", id=(int, ...))
+        posts = create_model("Item", __module__="app.posts", id=(int, ...))
+        with self.assertRaisesRegex(ValueError, r"'app\.\w+\.Item' and 'app\.\w+\.Item' both map to the TypeScript name 'Item'"):
+            collect_type_owners([users, posts])
+
+    def test_generate_split(self):
+        output_dir = Path(__file__).parent / "generated" / "split"
+        cwd = os.getcwd()
+        os.chdir(PROJECT_ROOT)
+        try:
+            import typsio
+            typsio.generate_types(
+                source_file=str(INPUTS / "split_api.py"),
+                registry_name="registry",
+                output=str(output_dir),
+                s2c_events_name="S2C_EVENTS",
+                split=True,
+            )
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(sorted(p.name for p in output_dir.glob("*.ts")), sorted([
+            INDEX_FILE, RPC_FILE, SHARED_FILE,
+            "tests.gen.inputs.split_posts.ts", "tests.gen.inputs.split_users.ts",
+        ]))
+        ts_typecheck("split.validate.ts")
+
+    def test_generate_split_cleans_up_on_failure(self):
+        cwd, path, tempdir = os.getcwd(), os.environ.get("PATH", ""), tempfile.tempdir
+        with tempfile.TemporaryDirectory() as tmp:
+            # 空 PATH 使 json2ts 无法找到；临时文件都写入 tmp 以便检查
+            os.chdir(PROJECT_ROOT)
+            os.environ["PATH"] = tmp
+            tempfile.tempdir = tmp
+            try:
+                import typsio
+                with self.assertRaisesRegex(RuntimeError, "json-schema-to-typescript not found"):
+                    typsio.generate_types(
+                        source_file=str(INPUTS / "split_api.py"),
+                        registry_name="registry",
+                        output=str(Path(tmp) / "out"),
+                        s2c_events_name="S2C_EVENTS",
+                        split=True,
+                    )
+            finally:
+                os.chdir(cwd)
+                os.environ["PATH"] = path
+                tempfile.tempdir = tempdir
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["out"])
+
+    def test_ts_safe_name(self):
+        self.assertEqual(ts_safe_name("User"), "User")
+        self.assertEqual(ts_safe_name("Page[User]"), "PageUser")
+        self.assertEqual(ts_safe_name("my_model"), "MyModel")
+
+
+if __name__ == "__main__":
+    unittest.main()
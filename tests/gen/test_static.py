@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+from typsio.gen import CursorSignature, format_rpc_method, generate_rpc_declarations, generate_ts_interface
+from typsio.gen_static import StaticExtractionError, iter_static_sources
+
+from .helper import ts_typecheck
+
+INPUTS = Path(__file__).parent / "inputs"
+PROJECT_ROOT = Path(__file__).parents[2]
+
+
+def extract(filename: str, s2c_events_name=None):
+    return list(iter_static_sources(
+        [(INPUTS / filename).resolve()],
+        str(PROJECT_ROOT),
+        "registry",
+        s2c_events_name,
+    ))
+
+
+class TestStaticExtraction(unittest.TestCase):
+    def test_extract_without_importing_source(self):
+        [(models, functions, events)] = extract("static_api.py", "S2C_EVENTS")
+
+        self.assertEqual(sorted(m.__name__ for m in models), ["StaticItem"])
+        self.assertEqual(sorted(functions), ["count_tags", "get_item", "list_items", "stream_items"])
+        self.assertIsInstance(functions["stream_items"], CursorSignature)
+        self.assertNotIsInstance(functions["get_item"], CursorSignature)
+        self.assertEqual(sorted(events), ["itemChanged"])
+        self.assertEqual(events["itemChanged"].__name__, "StaticEvent")
+        # 只有定义模型的模块被导入
+        self.assertNotIn("tests.gen.inputs.static_api", sys.modules)
+        self.assertIn("tests.gen.inputs.static_models", sys.modules)
+
+        rpc = generate_ts_interface("RPCMethods", functions, format_rpc_method)
+        self.assertIn("get_item(item_id: number): Promise<StaticItem | null>;", rpc)
+        self.assertIn("list_items(kind: \"all\" | \"recent\"): Promise<StaticItem[]>;", rpc)
+        self.assertIn("count_tags(items: StaticItem[]): Promise<Record<string, number> | null>;", rpc)
+        self.assertIn("stream_items(kind: \"all\" | \"recent\"): Promise<Cursor<StaticItem>>;", rpc)
+        self.assertIn("export interface Cursor<T>", generate_rpc_declarations(functions, events))
+
+    def test_unresolved_name_fails(self):
+        with self.assertRaisesRegex(StaticExtractionError, "UndefinedModel"):
+            extract("static_unresolved_api.py")
+
+    def test_generate_static(self):
+        output_path = Path(__file__).parent / "generated" / "static.ts"
+        output_path.parent.mkdir(exist_ok=True)
+        cwd = os.getcwd()
+        os.chdir(PROJECT_ROOT)
+        try:
+            import typsio
+            typsio.generate_types(
+                source_file=str(INPUTS / "static_api.py"),
+                registry_name="registry",
+                output=str(output_path),
+                s2c_events_name="S2C_EVENTS",
+                static=True,
+            )
+        finally:
+            os.chdir(cwd)
+        ts_typecheck("static.validate.ts")
+
+
+if __name__ == "__main__":
+    (Path(__file__).parent / "generated").mkdir(exist_ok=True)
+    unittest.main()
@@ -1,9 +1,13 @@
 import { assertType } from './helper';
-import { NestedModel, TopLevelModel, RPCMethods } from '../generated/pydantic_models';
+import { NestedModel, TopLevelModel, RPCMethods, RPCResult } from '../generated/pydantic_models';
 
 type GetModelReturn = ReturnType<RPCMethods['get_model']>;
 
 const nested: NestedModel = { id: 1, name: '2233', detail: 'x' };
 const top: TopLevelModel = { id: 1, nested };
 
-assertType<TopLevelModel, Promise<TopLevelModel>>(top, null as unknown as GetModelReturn); 
\ No newline at end of file
+assertType<TopLevelModel, Promise<TopLevelModel>>(top, null as unknown as GetModelReturn); 
+
+// 投影后的结果可以用 Pick 描述
+const projected: Pick<RPCResult<'get_model'>, 'id'> = { id: top.id };
+assertType<Pick<TopLevelModel, 'id'>, Pick<RPCResult<'get_model'>, 'id'>>(projected, projected);
\ No newline at end of file
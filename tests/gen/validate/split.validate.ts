@@ -0,0 +1,19 @@
+import { assertType } from './helper';
+import { RPCMethods, ServerToClientEvents, SplitPost, SplitStatus, SplitUser } from '../generated/split';
+import type { RPCMethods as RPCMethodsFromRpc } from '../generated/split/_rpc';
+import type { SplitPost as SplitPostFromModule } from '../generated/split/tests.gen.inputs.split_posts';
+import type { SplitUser as SplitUserFromModule } from '../generated/split/tests.gen.inputs.split_users';
+import type { TypsioModels } from '../generated/split/_shared';
+
+type GetPostReturn = ReturnType<RPCMethods['get_post']>;
+type ListAuthorsReturn = ReturnType<RPCMethodsFromRpc['list_authors']>;
+type PostPublishedPayload = Parameters<ServerToClientEvents['postPublished']>[0];
+
+const user: SplitUser = { id: 1, name: 'Ann' };
+const status: SplitStatus = 'published' as SplitStatus;
+const post: SplitPostFromModule = { id: 1, author: user, status, tags: ['a'] };
+const models: Required<Pick<TypsioModels, 'SplitPost'>> = { SplitPost: post };
+
+assertType<SplitPost, Promise<SplitPost | null>>(post, null as unknown as GetPostReturn);
+assertType<SplitUserFromModule[], Promise<SplitUser[]>>([user], null as unknown as ListAuthorsReturn);
+assertType<SplitPost, PostPublishedPayload>(models.SplitPost, post);
@@ -0,0 +1,16 @@
+import { assertType } from './helper';
+import { Cursor, StaticItem, StaticEvent, RPCMethods, ServerToClientEvents } from '../generated/static';
+
+type GetItemReturn = ReturnType<RPCMethods['get_item']>;
+type StreamItemsReturn = ReturnType<RPCMethods['stream_items']>;
+type ListItemsParams = Parameters<RPCMethods['list_items']>;
+type ItemChangedPayload = Parameters<ServerToClientEvents['itemChanged']>[0];
+
+const item: StaticItem = { id: 1, tags: ['a'] };
+const event: StaticEvent = { message: 'changed' };
+const params: ListItemsParams = ['recent'];
+
+assertType<StaticItem, Promise<StaticItem | null>>(item, null as unknown as GetItemReturn);
+assertType<StaticEvent, ItemChangedPayload>(event, event);
+assertType<ListItemsParams, ListItemsParams>(params, params);
+assertType<Promise<Cursor<StaticItem>>, StreamItemsReturn>(null as unknown as StreamItemsReturn, null as unknown as StreamItemsReturn);
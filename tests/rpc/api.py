@@ -0,0 +1,79 @@
+import asyncio
+from typing import AsyncIterator, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from typsio.rpc import RPCRegistry
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+
+
+class Group(BaseModel):
+    name: str
+    owner: Optional[Item] = None
+    items: List[Item]
+
+
+rpc = RPCRegistry()
+
+
+@rpc.register
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@rpc.register
+async def get_item(item_id: int) -> Optional[Item]:
+    if item_id < 0:
+        return None
+    return Item(id=item_id, name=f"item-{item_id}")
+
+
+@rpc.register
+def rename(item: Item, name: str) -> Item:
+    return Item(id=item.id, name=name)
+
+
+@rpc.register
+def list_items(count: int) -> List[Item]:
+    return [Item(id=i, name=f"item-{i}") for i in range(count)]
+
+
+@rpc.register
+async def sleep(seconds: float) -> float:
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+@rpc.register
+def fail(message: str) -> None:
+    raise ValueError(message)
+
+
+@rpc.register
+def count_items(items: ItemList) -> int:
+    return len(items.items)
+
+
+@rpc.register
+def get_group(count: int) -> Group:
+    return Group(name="group", owner=Item(id=-1, name="owner"), items=list_items(count))
+
+
+@rpc.register_cursor(page_size=3, max_page_size=5)
+def iter_items(count: int) -> Iterator[Item]:
+    for i in range(count):
+        yield Item(id=i, name=f"item-{i}")
+
+
+@rpc.register_cursor(page_size=3, snapshot=True)
+async def stream_items(count: int) -> AsyncIterator[Item]:
+    for i in range(count):
+        yield Item(id=i, name=f"item-{i}")
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from typsio.client import RPCError, RPCTimeoutError, TypsioClient, TypsioClientPool
+from typsio.rpc import RPCRegistry, _RPCHandler
+from typsio.transport import InProcessTransport, UnixSocketTransport, _encode_frame, _read_frame, start_unix_server
+
+from .api import Item, rpc
+
+
+class TestInProcessClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = await TypsioClient(rpc, InProcessTransport(rpc), timeout=2).connect()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_calls(self):
+        self.assertEqual(await self.client.remote.add(1, 2), 3)
+        item = await self.client.remote.get_item(3)
+        self.assertEqual(item, Item(id=3, name="item-3"))
+        self.assertIsNone(await self.client.remote.get_item(-1))
+        renamed = await self.client.remote.rename(Item(id=1, name="a"), "b")
+        self.assertEqual(renamed, Item(id=1, name="b"))
+        self.assertEqual(await self.client.call("list_items", 2), [Item(id=0, name="item-0"), Item(id=1, name="item-1")])
+
+    async def test_errors(self):
+        with self.assertRaisesRegex(RPCError, "RPC Execution Error: boom"):
+            await self.client.remote.fail("boom")
+        with self.assertRaisesRegex(RPCError, "Argument validation failed"):
+            await self.client.call("rename", {"id": "x"}, "b")
+        with self.assertRaisesRegex(RPCError, "Function 'missing' not found"):
+            await self.client.call("missing")
+        with self.assertRaises(AttributeError):
+            self.client.remote.missing
+
+    async def test_pipelining_and_timeout(self):
+        results = await asyncio.gather(*(self.client.remote.add(i, i) for i in range(50)))
+        self.assertEqual(results, [2 * i for i in range(50)])
+
+        with self.assertRaises(RPCTimeoutError):
+            await self.client.proxy(timeout=0.01).sleep(1)
+        self.assertEqual(self.client.in_flight, 0)
+
+    async def test_close_rejects_pending(self):
+        call = asyncio.ensure_future(self.client.remote.sleep(1))
+        await asyncio.sleep(0.01)
+        await self.client.close()
+        with self.assertRaisesRegex(RPCError, "Transport closed"):
+            await call
+
+
+class TestInProcessCopies(unittest.IsolatedAsyncioTestCase):
+    async def test_copy_results(self):
+        registry = RPCRegistry()
+        cached = Item(id=1, name="cached")
+
+        @registry.register
+        async def get_cached() -> Item:
+            return cached
+
+        async with TypsioClient(registry, InProcessTransport(registry), timeout=2) as client:
+            self.assertIs(await client.remote.get_cached(), cached)
+        async with TypsioClient(registry, InProcessTransport(registry, copy_results=True), timeout=2) as client:
+            item = await client.remote.get_cached()
+            self.assertEqual(item, cached)
+            self.assertIsNot(item, cached)
+
+
+class TestClientPool(unittest.IsolatedAsyncioTestCase):
+    async def test_least_loaded_routing(self):
+        async with TypsioClientPool(rpc, lambda: InProcessTransport(rpc), size=3, timeout=2) as pool:
+            calls = [asyncio.ensure_future(pool.remote.sleep(0.05)) for _ in range(6)]
+            await asyncio.sleep(0.01)
+            self.assertEqual([c.in_flight for c in pool.clients], [2, 2, 2])
+            self.assertEqual(await asyncio.gather(*calls), [0.05] * 6)
+
+
+class TestUnixSocketTransport(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "typsio.sock")
+        self.server = await start_unix_server(rpc, self.path)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.tmpdir.cleanup()
+
+    async def test_round_trip_and_batch(self):
+        async with TypsioClient(rpc, UnixSocketTransport(self.path), timeout=2) as client:
+            self.assertTrue(client._batch)
+            item = await client.remote.rename(Item(id=1, name="a"), "b")
+            self.assertEqual(item, Item(id=1, name="b"))
+            results = await asyncio.gather(
+                client.remote.list_items(1),
+                client.remote.add(2, 3),
+                client.remote.fail("boom"),
+                return_exceptions=True,
+            )
+            self.assertEqual(results[0], [Item(id=0, name="item-0")])
+            self.assertEqual(results[1], 5)
+            self.assertIsInstance(results[2], RPCError)
+
+    async def test_close_cancels_flush(self):
+        client = await TypsioClient(rpc, UnixSocketTransport(self.path), timeout=2).connect()
+        call = asyncio.ensure_future(client.remote.add(1, 2))
+        await asyncio.sleep(0)
+        self.assertEqual(len(client._flush_tasks), 1)
+        await client.close()
+        with self.assertRaisesRegex(RPCError, "Transport closed"):
+            await call
+        self.assertEqual(client._flush_tasks, set())
+        self.assertFalse(client.connected)
+
+    async def test_malformed_frames(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        try:
+            for payload in (b'\xff{"call_id": "bad-utf8"', b'{"call_id": "bad-json", "args": [', b'not json at all'):
+                writer.write(len(payload).to_bytes(4, 'big') + payload)
+            writer.write(_encode_frame({"call_id": "ok", "function_name": "add", "args": [1, 2]}))
+            await writer.drain()
+            responses = [await asyncio.wait_for(_read_frame(reader), 2) for _ in range(3)]
+        finally:
+            writer.close()
+        by_id = {r["call_id"]: r for r in responses}
+        self.assertEqual(sorted(by_id), ["bad-json", "bad-utf8", "ok"])
+        self.assertRegex(by_id["bad-utf8"]["error"], r"^RPC Error: Malformed frame: invalid UTF-8")
+        self.assertRegex(by_id["bad-json"]["error"], r"^RPC Error: Malformed frame: invalid JSON")
+        self.assertEqual(by_id["ok"]["result"], 3)
+
+
+class _FakeServer:
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def emit(self, event, data, to=None):
+        self.emitted.append((event, data, to))
+
+
+class TestSocketIOHandler(unittest.IsolatedAsyncioTestCase):
+    async def test_single_and_batch(self):
+        sio = _FakeServer()
+        _RPCHandler(sio, rpc, "rpc_call", "rpc_call_response").attach_to_server()
+        self.assertEqual(await sio.handlers["rpc_call_capabilities"]("sid"), {"batch": True})
+
+        await sio.handlers["rpc_call"]("sid", {"call_id": "1", "function_name": "get_item", "args": [2]})
+        self.assertEqual(
+            sio.emitted.pop(),
+            ("rpc_call_response", {"call_id": "1", "result": {"id": 2, "name": "item-2"}, "error": None}, "sid"),
+        )
+
+        await sio.handlers["rpc_call"]("sid", {"batch": [
+            {"call_id": "2", "function_name": "add", "args": [1, 1]},
+            {"call_id": "3", "function_name": "missing", "args": []},
+        ]})
+        event, data, to = sio.emitted.pop()
+        self.assertEqual([r["call_id"] for r in data["responses"]], ["2", "3"])
+        self.assertEqual(data["responses"][0]["result"], 2)
+        self.assertIn("not found", data["responses"][1]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
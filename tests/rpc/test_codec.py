@@ -0,0 +1,132 @@
+import json
+import unittest
+
+from socketio import packet
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+from typsio.codec import JSONCodec, RawJSON, default_codec, make_packet_class
+from typsio.rpc import RPCDispatcher, _RPCHandler
+
+from .api import rpc
+
+CALLS = [
+    {"call_id": "1", "function_name": "add", "args": [1, 2]},
+    {"call_id": "2", "function_name": "rename", "args": [{"id": 1, "name": "a"}, "b"]},
+    {"call_id": "3", "function_name": "list_items", "args": [2]},
+    {"call_id": "4", "function_name": "get_item", "args": [-1]},
+    {"call_id": "5", "function_name": "missing", "args": []},
+    {"call_id": "6", "function_name": "rename", "args": [{"id": "x"}, "b"]},
+    {"call_id": "7", "function_name": "add", "args": [1]},
+    {"call_id": "8", "function_name": "fail", "args": ["boom"]},
+    {"call_id": "", "function_name": "add", "args": [1, 2]},
+    {"call_id": "9", "function_name": "add"},
+]
+
+
+def _decode(response):
+    if isinstance(response, RawJSON):
+        return json.loads(response.text)
+    return response
+
+
+class TestRawDispatch(unittest.IsolatedAsyncioTestCase):
+    async def test_same_responses_as_handle(self):
+        dispatcher = RPCDispatcher(rpc, codec=default_codec())
+        for call in CALLS:
+            expected = await dispatcher.handle("sid", call)
+            actual = _decode(await dispatcher.handle_raw("sid", RawJSON(json.dumps(call))))
+            self.assertEqual(actual, expected, call)
+
+        batch = {"batch": CALLS[:4]}
+        expected = await dispatcher.handle("sid", batch)
+        raw = await dispatcher.handle_raw("sid", RawJSON(json.dumps(batch)))
+        self.assertIsInstance(raw, RawJSON)
+        self.assertEqual(_decode(raw), expected)
+
+        # 批量中任一调用无法走快速路径时，整个批量退回普通路径
+        batch = {"batch": CALLS[3:6]}
+        self.assertEqual(_decode(await dispatcher.handle_raw("sid", RawJSON(json.dumps(batch)))), await dispatcher.handle("sid", batch))
+        self.assertIsNone(await dispatcher.handle_raw("sid", RawJSON("{not json")))
+
+
+class TestRawJSONPacket(unittest.TestCase):
+    def setUp(self):
+        self.packet_class = make_packet_class(packet.Packet, JSONCodec(), "rpc_call")
+
+    def test_decode(self):
+        pkt = self.packet_class(encoded_packet='2["rpc_call",{"call_id":"1","function_name":"add","args":[1,2]}]')
+        self.assertEqual(pkt.packet_type, packet.EVENT)
+        self.assertEqual(pkt.data[0], "rpc_call")
+        self.assertIsInstance(pkt.data[1], RawJSON)
+        self.assertEqual(json.loads(pkt.data[1].text)["args"], [1, 2])
+
+        pkt = self.packet_class(encoded_packet='2["other",{"a":1}]')
+        self.assertEqual(pkt.data, ["other", {"a": 1}])
+
+    def test_encode(self):
+        pkt = self.packet_class(packet.EVENT, data=["rpc_call_response", RawJSON('{"call_id":"1","result":3,"error":null}')])
+        self.assertEqual(pkt.encode(), '2["rpc_call_response",{"call_id":"1","result":3,"error":null}]')
+        pkt = self.packet_class(packet.EVENT, data=["other", {"a": 1}])
+        self.assertEqual(pkt.encode(), '2["other",{"a":1}]')
+
+
+class _FakeServer:
+    packet_class = packet.Packet
+
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def emit(self, event, data, to=None):
+        self.emitted.append(self.packet_class(packet.EVENT, data=[event, data]).encode())
+
+
+class _PubSubServer(_FakeServer):
+    # 发布/订阅管理器转发的是 emit 的原始数据，而不是编码后的数据包
+    manager = AsyncPubSubManager()
+
+    async def emit(self, event, data, to=None):
+        self.emitted.append(data)
+
+
+class TestHandlerWithCodec(unittest.IsolatedAsyncioTestCase):
+    async def test_round_trip(self):
+        sio = _FakeServer()
+        _RPCHandler(sio, rpc, "rpc_call", "rpc_call_response", codec=JSONCodec()).attach_to_server()
+        self.assertIsNot(sio.packet_class, packet.Packet)
+
+        pkt = sio.packet_class(encoded_packet='2["rpc_call",{"call_id":"1","function_name":"rename","args":[{"id":1,"name":"a"},"b"]}]')
+        await sio.handlers[pkt.data[0]]("sid", *pkt.data[1:])
+        self.assertEqual(
+            sio.emitted.pop(),
+            '2["rpc_call_response",{"call_id":"1","result":{"id":1,"name":"b"},"error":null}]',
+        )
+
+    async def test_extra_arguments(self):
+        sio = _FakeServer()
+        _RPCHandler(sio, rpc, "rpc_call", "rpc_call_response", codec=JSONCodec()).attach_to_server()
+
+        # 多余的参数与未安装编解码器时一样被忽略
+        pkt = sio.packet_class(encoded_packet='2["rpc_call",{"call_id":"1","function_name":"add","args":[1,2]},{"x":1}]')
+        await sio.handlers[pkt.data[0]]("sid", *pkt.data[1:])
+        self.assertEqual(sio.emitted.pop(), '2["rpc_call_response",{"call_id":"1","result":3,"error":null}]')
+
+        pkt = sio.packet_class(encoded_packet='2["rpc_call",{"call_id":"2","function_name":"add","args":[1,2]},"x"]')
+        self.assertEqual(pkt.data[2], "x")
+        await sio.handlers[pkt.data[0]]("sid", *pkt.data[1:])
+        self.assertEqual(sio.emitted.pop(), '2["rpc_call_response",{"call_id":"2","result":3,"error":null}]')
+
+    async def test_pubsub_manager_gets_dicts(self):
+        sio = _PubSubServer()
+        _RPCHandler(sio, rpc, "rpc_call", "rpc_call_response", codec=JSONCodec()).attach_to_server()
+
+        pkt = sio.packet_class(encoded_packet='2["rpc_call",{"call_id":"1","function_name":"add","args":[1,2]}]')
+        await sio.handlers[pkt.data[0]]("sid", *pkt.data[1:])
+        self.assertEqual(sio.emitted.pop(), {"call_id": "1", "result": 3, "error": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import unittest
+
+from typsio.client import RPCError, TypsioClient
+from typsio.codec import RawJSON, default_codec
+from typsio.cursor import CursorOptions, CursorTable, _Cursor
+from typsio.rpc import RPCDispatcher
+from typsio.transport import InProcessTransport
+
+from .api import Item, rpc
+
+
+def _ids(page):
+    return [item["id"] for item in page["items"]]
+
+
+class TestCursorDispatch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.dispatcher = RPCDispatcher(rpc, codec=default_codec(), cursors=CursorTable(max_cursors_per_sid=2))
+
+    async def call(self, function_name, sid="sid", **envelope):
+        response = await self.dispatcher.handle(sid, {"call_id": "1", "function_name": function_name, **envelope})
+        if response.get("error"):
+            raise RPCError(response["error"])
+        self.assertTrue(response["cursor"])
+        return response["result"]
+
+    async def test_live_cursor(self):
+        page = await self.call("iter_items", args=[8])
+        self.assertEqual(_ids(page), [0, 1, 2])
+        self.assertEqual((page["offset"], page["has_more"], page["total"]), (0, True, None))
+
+        cursor = {"id": page["cursor"]}
+        page = await self.call("iter_items", cursor={**cursor, "limit": 100})
+        self.assertEqual(_ids(page), [3, 4, 5, 6, 7])  # limit 被限制为 max_page_size
+        self.assertEqual(page["offset"], 3)
+        with self.assertRaisesRegex(RPCError, "not found or expired"):
+            # 迭代器耗尽后游标被关闭
+            await self.call("iter_items", cursor=cursor)
+
+        page = await self.call("iter_items", args=[10])
+        cursor = {"id": page["cursor"]}
+        page = await self.call("iter_items", cursor={**cursor, "offset": 6, "limit": 2})
+        self.assertEqual((_ids(page), page["offset"]), ([6, 7], 6))
+        with self.assertRaisesRegex(RPCError, "cannot seek back"):
+            await self.call("iter_items", cursor={**cursor, "offset": 0})
+        with self.assertRaisesRegex(RPCError, "cannot skip more than 5 items"):
+            await self.call("iter_items", cursor={**cursor, "offset": 14})
+        with self.assertRaisesRegex(RPCError, "not found or expired"):
+            await self.call("iter_items", sid="other", cursor=cursor)
+        self.assertIsNone(await self.call("iter_items", cursor={**cursor, "close": True}))
+        self.assertEqual(len(self.dispatcher.cursors), 0)
+
+    async def test_snapshot_cursor(self):
+        page = await self.call("stream_items", args=[7])
+        self.assertEqual((_ids(page), page["total"]), ([0, 1, 2], 7))
+        cursor = {"id": page["cursor"]}
+        page = await self.call("stream_items", cursor={**cursor, "offset": 5})
+        self.assertEqual((_ids(page), page["has_more"], page["cursor"]), ([5, 6], False, cursor["id"]))
+        # 快照支持向后跳转，读到末尾后仍然保留
+        page = await self.call("stream_items", cursor={**cursor, "offset": 1, "limit": 1})
+        self.assertEqual((_ids(page), page["has_more"]), ([1], True))
+
+        # 第一页即包含全部结果时不创建游标
+        page = await self.call("stream_items", args=[2])
+        self.assertEqual((_ids(page), page["cursor"], page["has_more"]), ([0, 1], None, False))
+
+    async def test_table_is_bounded_and_expires(self):
+        first, second, third = [(await self.call("iter_items", args=[10]))["cursor"] for _ in range(3)]
+        with self.assertRaisesRegex(RPCError, "not found or expired"):
+            await self.call("iter_items", cursor={"id": first})
+        await self.call("iter_items", cursor={"id": second})
+        self.assertEqual(len(self.dispatcher.cursors), 2)
+        self.assertEqual(self.dispatcher.cursors.sweep(now=float("inf")), 2)
+        with self.assertRaisesRegex(RPCError, "not found or expired"):
+            await self.call("iter_items", cursor={"id": third})
+
+    async def test_errors_and_projection(self):
+        with self.assertRaisesRegex(RPCError, "'add' does not return a cursor"):
+            await self.call("add", cursor={"id": "x"})
+        with self.assertRaisesRegex(RPCError, "'limit' must be a positive integer"):
+            await self.call("iter_items", cursor={"id": "x", "limit": 0})
+
+        call = {"call_id": "1", "function_name": "iter_items", "args": [4], "projection": {"include": ["name"]}}
+        raw = json.loads((await self.dispatcher.handle_raw("sid", RawJSON(json.dumps(call)))).text)
+        self.assertTrue(raw["cursor"])
+        self.assertEqual(raw["result"]["items"], [{"name": "item-0"}, {"name": "item-1"}, {"name": "item-2"}])
+        page = await self.call("iter_items", cursor={"id": raw["result"]["cursor"]}, projection={"exclude": ["name"]})
+        self.assertEqual(page["items"], [{"id": 3}])
+
+
+class _FailingIterator:
+    def __init__(self):
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise RuntimeError("query failed")
+
+    async def aclose(self):
+        self.closed = True
+
+
+class _SlowIterator(_FailingIterator):
+    async def __anext__(self):
+        return 1
+
+    async def aclose(self):
+        await asyncio.sleep(0.01)
+        self.closed = True
+
+
+class TestCursorCleanup(unittest.IsolatedAsyncioTestCase):
+    async def test_iterator_closed_when_first_read_fails(self):
+        table = CursorTable()
+        iterator = _FailingIterator()
+        with self.assertRaisesRegex(RuntimeError, "query failed"):
+            await table.open("sid", "f", iterator, CursorOptions())
+        await asyncio.sleep(0)
+        self.assertTrue(iterator.closed)
+        self.assertEqual(len(table), 0)
+
+    async def test_close_keeps_aclose_task(self):
+        table = CursorTable()
+        iterator = _SlowIterator()
+        page = await table.open("sid", "f", iterator, CursorOptions(page_size=2))
+        table.discard_sid("sid")
+        # 关闭任务在完成前一直被引用
+        self.assertEqual(len(_Cursor._closing), 1)
+        await asyncio.gather(*_Cursor._closing)
+        self.assertTrue(iterator.closed)
+        self.assertEqual(len(_Cursor._closing), 0)
+        self.assertEqual(page["items"], [1, 1])
+
+
+class TestRemoteCursor(unittest.IsolatedAsyncioTestCase):
+    async def test_client(self):
+        async with TypsioClient(rpc, InProcessTransport(rpc), timeout=2) as client:
+            cursor = await client.remote.iter_items(7)
+            self.assertEqual(cursor.items, [Item(id=i, name=f"item-{i}") for i in range(3)])
+            self.assertEqual([item.id async for item in cursor], list(range(7)))
+            self.assertFalse(cursor.has_more)
+            self.assertIsNone(cursor.id)
+
+            cursor = await client.remote.stream_items(10)
+            self.assertEqual([item.id for item in await cursor.seek(8)], [8, 9])
+            self.assertEqual([item.id for item in await cursor.seek(0, 2)], [0, 1])
+            self.assertEqual([item.id for item in await cursor.next()], [2, 3, 4])
+            await cursor.close()
+            with self.assertRaisesRegex(RPCError, "closed"):
+                await cursor.seek(0)
+
+            cursor = await client.call("iter_items", 4, include=["id"])
+            self.assertEqual([item async for item in cursor], [{"id": i} for i in range(4)])
+
+    async def test_close_releases_cursors(self):
+        transport = InProcessTransport(rpc)
+        async with TypsioClient(rpc, transport, timeout=2) as client:
+            await client.remote.iter_items(7)
+            self.assertEqual(len(transport._dispatcher.cursors), 1)
+        self.assertEqual(len(transport._dispatcher.cursors), 0)
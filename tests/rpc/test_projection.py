@@ -0,0 +1,74 @@
+import json
+import unittest
+
+from typsio.client import RPCError, TypsioClient
+from typsio.codec import RawJSON, default_codec
+from typsio.projection import ProjectionCache, ProjectionError
+from typsio.rpc import RPCDispatcher
+from typsio.transport import InProcessTransport
+
+from .api import get_group, rpc
+
+PROJECTED_CALLS = [
+    ({"function_name": "get_group", "args": [2], "projection": {"include": ["name", "items.id"]}},
+     {"name": "group", "items": [{"id": 0}, {"id": 1}]}),
+    ({"function_name": "get_group", "args": [1], "projection": {"exclude": ["items", "owner.name"]}},
+     {"name": "group", "owner": {"id": -1}}),
+    ({"function_name": "get_group", "args": [1], "projection": {"include": ["owner", "owner.name"], "exclude": ["owner.id"]}},
+     {"owner": {"name": "owner"}}),
+    ({"function_name": "list_items", "args": [2], "projection": {"include": ["name"]}},
+     [{"name": "item-0"}, {"name": "item-1"}]),
+    ({"function_name": "get_item", "args": [-1], "projection": {"include": ["id"]}}, None),
+]
+
+
+class TestProjection(unittest.IsolatedAsyncioTestCase):
+    async def test_projected_results(self):
+        dispatcher = RPCDispatcher(rpc, codec=default_codec())
+        for call, expected in PROJECTED_CALLS:
+            call = {"call_id": "1", **call}
+            self.assertEqual(await dispatcher.handle("sid", call), {"call_id": "1", "result": expected, "error": None})
+            raw = await dispatcher.handle_raw("sid", RawJSON(json.dumps(call)))
+            self.assertIsInstance(raw, RawJSON)
+            self.assertEqual(json.loads(raw.text), {"call_id": "1", "result": expected, "error": None})
+
+    async def test_invalid_projection(self):
+        dispatcher = RPCDispatcher(rpc, codec=default_codec())
+        for projection, message in [
+            ({"include": ["bogus"]}, "'Group' has no field 'bogus'"),
+            ({"include": ["items.bogus"]}, "'Item' has no field 'bogus' \\(at 'items'\\)"),
+            ({"include": ["name.length"]}, "'name' has no fields"),
+            ({"include": "name"}, "'include' must be a list"),
+            ({"fields": ["name"]}, "Projection must be an object"),
+        ]:
+            call = {"call_id": "1", "function_name": "get_group", "args": [1], "projection": projection}
+            for response in (
+                await dispatcher.handle("sid", call),
+                json.loads((await dispatcher.handle_raw("sid", RawJSON(json.dumps(call)))).text),
+            ):
+                self.assertRegex(response["error"], "^RPC Error: Invalid projection: " + message, projection)
+
+    def test_cache_key_is_normalized(self):
+        cache = ProjectionCache(maxsize=2)
+        self.assertEqual(
+            cache.key("get_group", {"include": ["name", "items.id", "name"]}),
+            cache.key("get_group", {"include": ["items.id", "name"]}),
+        )
+        self.assertNotEqual(cache.key("get_group", {"include": []}), cache.key("get_group", {}))
+        self.assertNotEqual(cache.key("get_group", {"include": ["name"]}), cache.key("list_items", {"include": ["name"]}))
+
+        first = cache.get("get_group", get_group, {"include": ["name"]})
+        self.assertIs(cache.get("get_group", get_group, {"include": ["name", "name"]}), first)
+        cache.get("get_group", get_group, {"include": ["owner"]})
+        cache.get("get_group", get_group, {"include": ["items"]})
+        self.assertIsNot(cache.get("get_group", get_group, {"include": ["name"]}), first)
+        with self.assertRaises(ProjectionError):
+            cache.get("get_group", get_group, {"exclude": ["items..id"]})
+
+    async def test_client(self):
+        async with TypsioClient(rpc, InProcessTransport(rpc), timeout=2) as client:
+            self.assertEqual(await client.call("get_group", 1, include=["items.name"]), {"items": [{"name": "item-0"}]})
+            with self.assertRaisesRegex(RPCError, "Invalid projection"):
+                await client.call("add", 1, 2, include=["x"])
+            # 未指定投影时结果仍验证为返回类型
+            self.assertEqual((await client.remote.get_group(1)).owner.name, "owner")
@@ -0,0 +1,149 @@
+import unittest
+
+from pydantic import ValidationError
+
+from typsio.replay import BROADCAST_STREAM, setup_replay
+
+from .api import Item
+
+
+class _FakeManager:
+    def __init__(self):
+        self.sids = set()
+
+    def eio_sid_from_sid(self, sid, namespace):
+        return sid if sid in self.sids else None
+
+
+class _FakeServer:
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+        self.client_rooms = {}
+        self.manager = _FakeManager()
+
+    def on(self, event, handler, namespace=None):
+        self.handlers[event] = handler
+
+    async def emit(self, event, data, to=None, skip_sid=None, namespace=None):
+        self.emitted.append((event, data, to))
+
+    def connect(self, sid, rooms=()):
+        self.manager.sids.add(sid)
+        self.client_rooms[sid] = list(rooms)
+
+    def rooms(self, sid, namespace=None):
+        return [sid] + self.client_rooms.get(sid, [])
+
+
+EVENTS = {"itemChanged": Item, "itemRemoved": int}
+
+
+class TestReplayBuffer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sio = _FakeServer()
+        self.replay = setup_replay(self.sio, EVENTS, capacity=3)
+
+    async def request(self, client_sid, streams, epoch=None, **kwargs):
+        data = {"epoch": epoch or self.replay.epoch, "streams": streams, **kwargs}
+        return await self.sio.handlers["s2c_replay"](client_sid, data)
+
+    async def test_emit_tags_events(self):
+        seq = await self.replay.emit("itemChanged", Item(id=1, name="a"), to="team")
+        self.assertEqual(seq, 1)
+        event, (payload, meta), to = self.sio.emitted[-1]
+        self.assertEqual((event, payload, to), ("itemChanged", {"id": 1, "name": "a"}, "team"))
+        self.assertEqual(meta, {"stream": "team", "seq": 1, "epoch": self.replay.epoch})
+
+        await self.replay.emit("itemRemoved", 1)
+        self.assertEqual(self.sio.emitted[-1][1][1]["stream"], BROADCAST_STREAM)
+        with self.assertRaises(ValidationError):
+            await self.replay.emit("itemChanged", {"id": "x"})
+        with self.assertRaises(KeyError):
+            await self.replay.emit("unknown", 1)
+
+    async def test_replay_missed_events(self):
+        self.sio.connect("new-sid", ["team"])
+        for i in range(1, 4):
+            await self.replay.emit("itemChanged", {"id": i, "name": str(i)}, to="team")
+        await self.replay.emit("itemRemoved", 7, to="other-team")
+        await self.replay.emit("itemRemoved", 8)
+
+        # 客户端离开的房间不再重放
+        response = await self.request("new-sid", {"team": 1, BROADCAST_STREAM: 4, "other-team": 3})
+        self.assertEqual(response["resync"], [])
+        self.assertEqual(
+            [(e["event"], e["payload"], e["meta"]["seq"]) for e in response["events"]],
+            [("itemChanged", {"id": 2, "name": "2"}, 2), ("itemChanged", {"id": 3, "name": "3"}, 3), ("itemRemoved", 8, 5)],
+        )
+        self.assertEqual(response["heads"], {BROADCAST_STREAM: 5, "team": 3})
+
+        response = await self.request("new-sid", {"team": 3, BROADCAST_STREAM: 5})
+        self.assertEqual(response["events"], [])
+
+    async def test_reconnect_without_prior_events(self):
+        self.sio.connect("sid-1", ["team"])
+        await self.replay.emit("itemRemoved", 1, to="team")
+        # 首次连接：客户端尚未收到任何事件，得到当前的 epoch、各流位置与时钟
+        hello = await self.sio.handlers["s2c_replay"]("sid-1", {"epoch": None, "streams": {}})
+        self.assertEqual((hello["epoch"], hello["events"], hello["resync"]), (self.replay.epoch, [], []))
+        self.assertEqual(hello["heads"], {"team": 1})
+
+        # 断线期间：已有的房间流、新建的房间流与广播流都有事件，其中一个跳过了该客户端
+        await self.replay.emit("itemRemoved", 2, to="team")
+        await self.replay.emit("itemRemoved", 3, to="team", skip_sid="sid-1")
+        await self.replay.emit("itemRemoved", 4)
+        await self.replay.emit("itemChanged", {"id": 5, "name": "5"}, to="new-room")
+        self.sio.connect("sid-2", ["team", "new-room"])
+        response = await self.request("sid-2", {"team": 1}, since=hello["clock"], sid="sid-1")
+        self.assertEqual(response["resync"], [])
+        self.assertEqual([e["payload"] for e in response["events"]], [2, 4, {"id": 5, "name": "5"}])
+
+        # 未带 since 的旧客户端：未报告的流视为已看到最新位置
+        response = await self.request("sid-2", {"team": 1}, sid="sid-1")
+        self.assertEqual([e["payload"] for e in response["events"]], [2])
+
+    async def test_sid_targets_and_stream_limit(self):
+        self.sio.connect("sid")
+        self.assertIsNone(await self.replay.emit("itemRemoved", 1, to="sid"))
+        self.assertEqual(self.sio.emitted[-1], ("itemRemoved", 1, "sid"))
+        self.assertEqual(dict(self.replay._streams), {})
+
+        replay = setup_replay(self.sio, EVENTS, max_streams=2)
+        self.sio.connect("late", ["a", "b", "c"])
+        for room in ("a", "b", "c"):
+            await replay.emit("itemRemoved", 1, to=room)
+        self.assertEqual(list(replay._streams), ["b", "c"])
+        # 客户端见过的流已被淘汰：重建后序列号仍然递增，客户端需要重新同步
+        await replay.emit("itemRemoved", 2, to="a")
+        self.assertEqual(list(replay._streams), ["c", "a"])
+        response = replay.missed_events(["late", "a", "b"], replay.epoch, {"a": 1, "b": 2})
+        self.assertEqual(response["resync"], ["a", "b"])
+        self.assertEqual(response["heads"], {"a": 4})
+
+    async def test_resync_when_evicted(self):
+        for i in range(1, 6):
+            await self.replay.emit("itemRemoved", i)
+        response = await self.request("sid", {BROADCAST_STREAM: 1})
+        self.assertEqual(response["resync"], [BROADCAST_STREAM])
+        self.assertEqual(response["events"], [])
+
+        # 缺口恰好从最早保留的事件开始时仍可补齐
+        response = await self.request("sid", {BROADCAST_STREAM: 2})
+        self.assertEqual([e["payload"] for e in response["events"]], [3, 4, 5])
+
+        response = await self.request("sid", {BROADCAST_STREAM: 2}, epoch="restarted")
+        self.assertEqual(response["resync"], [BROADCAST_STREAM])
+        self.assertEqual(response["epoch"], self.replay.epoch)
+
+    async def test_event_scope(self):
+        replay = setup_replay(self.sio, EVENTS, scope="event")
+        await replay.emit("itemRemoved", 1, to="team")
+        await replay.emit("itemRemoved", 2)
+        response = replay.missed_events(["sid"], replay.epoch, {}, since=0)
+        # 客户端不在 team 房间中，只能收到广播事件
+        self.assertEqual([(e["payload"], e["meta"]["seq"]) for e in response["events"]], [(2, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+
+from typsio.codec import RawJSON, default_codec
+from typsio.rpc import RPCDispatcher
+from typsio.tracing import RPCTracer
+
+from .api import rpc
+
+
+class TestRPCTracer(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_call_log(self):
+        tracer = RPCTracer(threshold=None, thresholds={"sleep": 0.01}, capacity=2)
+        dispatcher = RPCDispatcher(rpc, tracer)
+
+        await dispatcher.dispatch("sid", {"call_id": "1", "function_name": "add", "args": [1, 2]})
+        await dispatcher.dispatch("sid", {"call_id": "2", "function_name": "sleep", "args": [0.001]})
+        self.assertEqual(tracer.slow_calls(), [])
+
+        for call_id in ("3", "4", "5"):
+            await dispatcher.dispatch("sid", {"call_id": call_id, "function_name": "sleep", "args": [0.02]})
+        entries = tracer.slow_calls()
+        self.assertEqual([e.call_id for e in entries], ["5", "4"])
+        self.assertEqual(entries[0].function_name, "sleep")
+        self.assertEqual(entries[0].sid, "sid")
+        self.assertEqual(set(entries[0].phases), {"validate", "execute", "serialize"})
+        self.assertGreaterEqual(entries[0].phases["execute"], 0.02)
+        self.assertEqual(entries[0].args[0].type, "float")
+
+        # 运行时调整阈值
+        tracer.set_threshold("fail", 0)
+        response = await dispatcher.dispatch("sid", {"call_id": "6", "function_name": "fail", "args": ["boom"]})
+        self.assertEqual(response["error"], "RPC Execution Error: boom")
+        entry = tracer.slow_calls("fail")[0]
+        self.assertIn("ValueError('boom')", entry.error)
+        self.assertNotIn("serialize", entry.phases)
+
+    async def test_raw_path_phases(self):
+        tracer = RPCTracer(threshold=0)
+        dispatcher = RPCDispatcher(rpc, tracer, codec=default_codec())
+        call = {"call_id": "1", "function_name": "get_group", "args": [500], "projection": {"include": ["items.name"]}}
+        response = await dispatcher.handle_raw("sid", RawJSON(json.dumps(call)))
+        self.assertIsInstance(response, RawJSON)
+        self.assertEqual(len(json.loads(response.text)["result"]["items"]), 500)
+
+        [entry] = tracer.slow_calls()
+        self.assertEqual(set(entry.phases), {"validate", "execute", "serialize"})
+        # 解析 JSON 文本与编码结果都计入总耗时
+        self.assertGreater(entry.phases["validate"], 0)
+        self.assertGreater(entry.phases["serialize"], 0)
+        self.assertAlmostEqual(entry.total_seconds, sum(entry.phases.values()))
+
+        batch = {"batch": [dict(call, call_id="2"), {"call_id": "3", "function_name": "add", "args": [1, 2]}]}
+        await dispatcher.handle_raw("sid", RawJSON(json.dumps(batch)))
+        self.assertEqual(sorted(e.call_id for e in tracer.slow_calls()[:2]), ["2", "3"])
+        self.assertTrue(all("serialize" in e.phases for e in tracer.slow_calls()[:2]))
+
+    async def test_profile(self):
+        tracer = RPCTracer(threshold=None)
+        dispatcher = RPCDispatcher(rpc, tracer)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracer.profile("list_items", calls=2, every=2, output_dir=tmpdir)
+            for i in range(5):
+                await dispatcher.dispatch("sid", {"call_id": str(i), "function_name": "list_items", "args": [3]})
+            dumps = tracer.dumped_profiles("list_items")
+            self.assertEqual(len(dumps), 2)
+            self.assertEqual(tracer.profiling(), {})
+            for path in dumps:
+                self.assertTrue(os.path.isfile(path))
+                stats = pstats.Stats(path)
+                self.assertTrue(any(func[2] == "list_items" for func in stats.stats))
+
+    async def test_dumped_profiles_bounded(self):
+        tracer = RPCTracer(threshold=None, max_dumps=2)
+        dispatcher = RPCDispatcher(rpc, tracer)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracer.profile("add", calls=3, output_dir=tmpdir)
+            for i in range(3):
+                await dispatcher.dispatch("sid", {"call_id": str(i), "function_name": "add", "args": [1, i]})
+            dumps = tracer.dumped_profiles("add")
+            self.assertEqual(len(dumps), 2)
+            self.assertEqual(len(os.listdir(tmpdir)), 3)
+            self.assertTrue(dumps[-1].endswith("-2.pstats"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import unittest
+
+from typsio.client import RPCError, TypsioClient
+from typsio.rpc import RPCDispatcher, _RPCHandler
+from typsio.transport import SocketIOTransport
+from typsio.upload import UploadError, UploadStore
+
+from .api import rpc
+
+ITEMS = {"items": [{"id": i, "name": f"item-{i}"} for i in range(2000)]}
+
+
+class TestUploadStore(unittest.TestCase):
+    def test_reassemble_and_spool(self):
+        store = UploadStore(spool_threshold=16)
+        store.add_chunk("sid", "u", 0, '[{"a":', function_name="f", size=20)
+        store.add_chunk("sid", "u", 1, '"0123456789"}]')
+        self.assertEqual(store.take("sid", "u", "f", 2), b'[{"a":"0123456789"}]')
+        self.assertEqual(len(store), 0)
+
+    def test_rejections(self):
+        store = UploadStore(max_size=10)
+        with self.assertRaises(UploadError):
+            store.add_chunk("sid", "u", 0, "[1]", size=100)
+        store.add_chunk("sid", "u", 0, "[1,")
+        with self.assertRaisesRegex(UploadError, "expected chunk 1, got 2"):
+            store.add_chunk("sid", "u", 2, "2]")
+        self.assertEqual(len(store), 0)
+
+        store.add_chunk("sid", "u", 0, "[1,")
+        with self.assertRaisesRegex(UploadError, "exceeds the limit"):
+            store.add_chunk("sid", "u", 1, "2,3,4,5,6]")
+
+        store.add_chunk("sid", "u", 0, "[1]")
+        with self.assertRaisesRegex(UploadError, "incomplete"):
+            store.take("sid", "u", "f", 2)
+        with self.assertRaisesRegex(UploadError, "not found"):
+            store.take("other-sid", "u", "f", 1)
+
+    def test_sweep(self):
+        store = UploadStore(timeout=5)
+        store.add_chunk("sid", "u", 0, "[")
+        self.assertEqual(store.sweep(), 0)
+        self.assertEqual(store.sweep(now=float("inf")), 1)
+        with self.assertRaisesRegex(UploadError, "not found"):
+            store.add_chunk("sid", "u", 1, "]")
+
+
+class TestUploadDispatch(unittest.IsolatedAsyncioTestCase):
+    async def test_upload_call(self):
+        dispatcher = RPCDispatcher(rpc, uploads=UploadStore())
+        text = json.dumps([ITEMS])
+        for seq, start in enumerate(range(0, len(text), 1000)):
+            ack = dispatcher.handle_upload_chunk("sid", {
+                "upload_id": "u", "seq": seq, "data": text[start:start + 1000], "function_name": "count_items",
+            })
+            self.assertEqual(ack, {"ok": True})
+        response = await dispatcher.handle("sid", {"call_id": "1", "function_name": "count_items", "upload_id": "u", "chunks": seq + 1})
+        self.assertEqual(response, {"call_id": "1", "result": 2000, "error": None})
+
+        ack = dispatcher.handle_upload_chunk("sid", {"upload_id": "v", "seq": 0, "data": "[", "function_name": "missing"})
+        self.assertIn("not found", ack["error"])
+        response = await dispatcher.handle("sid", {"call_id": "2", "function_name": "count_items", "upload_id": "v", "chunks": 1})
+        self.assertIn("not found or expired", response["error"])
+
+    async def test_upload_must_be_one_array(self):
+        dispatcher = RPCDispatcher(rpc, uploads=UploadStore())
+        for i, text in enumerate(['[1]}', '[1],"batch":[{"call_id":"x","function_name":"add","args":[1,2]}]', '{"a":1}', '[1,']):
+            upload_id = f"u{i}"
+            self.assertEqual(dispatcher.handle_upload_chunk("sid", {"upload_id": upload_id, "seq": 0, "data": text}), {"ok": True})
+            response = await dispatcher.handle("sid", {"call_id": str(i), "function_name": "add", "upload_id": upload_id, "chunks": 1})
+            self.assertEqual(response["call_id"], str(i), text)
+            self.assertRegex(response["error"], r"^RPC Error: Uploaded arguments are not a JSON array", text)
+
+        # 参数数量或类型不符时与普通调用的错误一致
+        dispatcher.handle_upload_chunk("sid", {"upload_id": "w", "seq": 0, "data": '[{"id":"x"},"b"]'})
+        response = await dispatcher.handle("sid", {"call_id": "w", "function_name": "rename", "upload_id": "w", "chunks": 1})
+        expected = await dispatcher.handle("sid", {"call_id": "w", "function_name": "rename", "args": [{"id": "x"}, "b"]})
+        self.assertEqual(response, expected)
+
+
+class _FakeSocketIO:
+    """Connects a SocketIOTransport client to an _RPCHandler without a network."""
+    def __init__(self):
+        self.connected = True
+        self.client_handlers = {}
+        self.server_handlers = {}
+        self.chunks = 0
+
+    # 客户端接口
+    def on(self, event, handler):
+        self.client_handlers[event] = handler
+
+    async def emit(self, event, data, to=None):
+        if to is not None:
+            # 服务器发往客户端
+            self.client_handlers[event](data)
+        else:
+            asyncio.ensure_future(self.server_handlers[event]("sid", data))
+
+    async def call(self, event, data, timeout=None):
+        await asyncio.sleep(0.001)
+        if event.endswith("_upload"):
+            self.chunks += 1
+        return await self.server_handlers[event]("sid", data)
+
+    async def disconnect(self):
+        self.connected = False
+
+
+class _FakeServer:
+    def __init__(self, sio):
+        self.sio = sio
+
+    def on(self, event, handler):
+        self.sio.server_handlers[event] = handler
+
+    async def emit(self, event, data, to=None):
+        await self.sio.emit(event, data, to=to)
+
+
+class TestChunkedClient(unittest.IsolatedAsyncioTestCase):
+    async def test_interleaved_upload(self):
+        sio = _FakeSocketIO()
+        _RPCHandler(_FakeServer(sio), rpc, "rpc_call", "rpc_call_response", uploads=UploadStore()).attach_to_server()
+        transport = SocketIOTransport(client=sio, upload_threshold=10_000, chunk_size=5_000)
+        async with TypsioClient(rpc, transport, timeout=5) as client:
+            order = []
+
+            async def tracked(name, coro):
+                result = await coro
+                order.append(name)
+                return result
+
+            big, small = await asyncio.gather(
+                tracked("big", client.remote.count_items(ITEMS)),
+                tracked("small", client.remote.add(1, 2)),
+            )
+            self.assertEqual((big, small), (2000, 3))
+            self.assertGreater(sio.chunks, 5)
+            # 小调用不需要等待上传完成
+            self.assertEqual(order, ["small", "big"])
+
+    async def test_projected_upload(self):
+        sio = _FakeSocketIO()
+        _RPCHandler(_FakeServer(sio), rpc, "rpc_call", "rpc_call_response", uploads=UploadStore()).attach_to_server()
+        transport = SocketIOTransport(client=sio, upload_threshold=1)
+        async with TypsioClient(rpc, transport, timeout=5) as client:
+            self.assertEqual(await client.call("get_group", 2, include=["name"]), {"name": "group"})
+            self.assertGreater(sio.chunks, 0)
+
+    async def test_upload_rejected(self):
+        sio = _FakeSocketIO()
+        _RPCHandler(_FakeServer(sio), rpc, "rpc_call", "rpc_call_response", uploads=UploadStore(max_size=1000)).attach_to_server()
+        transport = SocketIOTransport(client=sio, upload_threshold=100)
+        async with TypsioClient(rpc, transport, timeout=5) as client:
+            with self.assertRaisesRegex(RPCError, "exceeds the limit"):
+                await client.remote.count_items(ITEMS)
+
+
+class TestSocketIOReconnect(unittest.IsolatedAsyncioTestCase):
+    async def test_usable_after_reconnect(self):
+        sio = _FakeSocketIO()
+        _RPCHandler(_FakeServer(sio), rpc, "rpc_call", "rpc_call_response").attach_to_server()
+        async with TypsioClient(rpc, SocketIOTransport(client=sio), timeout=5) as client:
+            self.assertEqual(await client.remote.add(1, 2), 3)
+            # 模拟连接断开：AsyncClient 先调用 disconnect 处理函数，随后自动重连
+            sio.connected = False
+            sio.client_handlers["disconnect"]()
+            self.assertFalse(client.connected)
+            with self.assertRaisesRegex(RPCError, "not connected"):
+                await client.remote.add(1, 2)
+            sio.connected = True
+            self.assertTrue(client.connected)
+            self.assertEqual(await client.remote.add(2, 3), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()